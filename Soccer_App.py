@@ -1,25 +1,12 @@
 import streamlit as st
-import pandas as pd
-import matplotlib.pyplot as plt
-import matplotlib.patches as patches
-import seaborn as sns
-from soccerdata import Understat
-import requests
-import io
-from mplsoccer import Pitch
-
-# ------------------------ Patch requests to avoid Understat errors ------------------------
-original_get = requests.get
-def patched_get(*args, **kwargs):
-    headers = kwargs.pop("headers", {})
-    headers["User-Agent"] = (
-        "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) "
-        "AppleWebKit/537.36 (KHTML, like Gecko) "
-        "Chrome/114.0.0.0 Safari/537.36"
-    )
-    kwargs["headers"] = headers
-    return original_get(*args, **kwargs)
-requests.get = patched_get
+from soccer_stats.sources import get_source
+from soccer_stats import pipeline
+from soccer_stats.workers import get_pool
+from soccer_stats import tiles
+from soccer_stats import positions
+from soccer_stats import aggregates
+from soccer_stats import percentiles
+from soccer_stats.render import figure_png
 
 # ------------------------ Streamlit Page Setup ------------------------
 st.set_page_config(layout="wide", page_title="Football Shot Visualizer")
@@ -27,106 +14,154 @@ st.title("Premier League Shot Visualizer (Understat)")
 
 # ------------------------ UI Controls ------------------------
 season = st.selectbox("Select season", ["2023", "2024", "2025"], index=1)
-plot_type = st.selectbox("Choose plot type", ["Heat Map", "Shot Map", "Positional Map"])
+plot_type = st.selectbox("Choose plot type", ["Heat Map", "Shot Map", "Positional Map", "Percentile Profile"])
 pitch_theme = st.selectbox("Pitch Theme", ["Grass", "Light", "Dark"], index=0)
 show_xg = st.checkbox("Show xG values on Shot Map", value=False)
 show_names = st.checkbox("Show player names on Shot Map", value=False)
 use_plotly = st.checkbox("Use interactive Plotly map", value=False)
 
 # ------------------------ Load Data ------------------------
-@st.cache_data(show_spinner=True)
-def load_data(season):
-    us = Understat(leagues="ENG-Premier League", seasons=int(season))
-    return us, us.read_shot_events().reset_index(), us.read_team_match_stats().reset_index(), us.read_player_match_stats().reset_index()
-
-us, shots, matches, player_stats = load_data(season)
-
-teams = sorted(shots["team"].unique())
-team = st.selectbox("Select team", teams)
-
-team_shots = shots[shots["team"] == team].copy()
-players = sorted(team_shots["player"].dropna().unique())
-players = ["(All Players)"] + players
-player = st.selectbox("Select player", players)
-
-if player != "(All Players)":
-    team_shots = team_shots[team_shots["player"] == player].copy()
+@st.cache_resource(show_spinner=True, max_entries=4)
+def load_data(season, version):
+    # Local store first; Understat is only hit when the season is missing.
+    # Shared (not copied) between reruns, so treat as read-only. Every stage
+    # takes the season's data ``version``, so an ingest refreshes all of them.
+    source = get_source()
+    return source.read("shots", season), source.read("team_matches", season), source.read("player_matches", season)
+
+# ------------------------ Cached Stages ------------------------
+# season -> team -> player -> match -> outcome filter -> render. Each stage is
+# keyed only on its own inputs, so e.g. toggling show_xg or pitch_theme only
+# reruns render_stage and changing player skips the team-level work.
+@st.cache_data
+def season_teams(season, version):
+    return sorted(load_data(season, version)[0]["team"].unique())
+
+@st.cache_data
+def team_stage(season, team, version):
+    return pipeline.team_slice(load_data(season, version)[0], team)
+
+@st.cache_data
+def match_table_stage(season, team, version):
+    return pipeline.match_table(load_data(season, version)[1], team)
+
+@st.cache_data
+def player_stage(season, team, player, version):
+    return pipeline.player_slice(team_stage(season, team, version), player)
+
+@st.cache_data
+def player_options_stage(season, team, player, version):
+    player_shots = player_stage(season, team, player, version)
+    outcomes = sorted(player_shots["result"].dropna().unique())
+    options = pipeline.match_options(match_table_stage(season, team, version), player_shots["game_id"].unique())
+    return outcomes, options
+
+@st.cache_data
+def shots_stage(season, team, player, match_id, outcomes, version):
+    match_shots = pipeline.match_slice(player_stage(season, team, player, version), match_id)
+    return pipeline.outcome_filter(match_shots, list(outcomes))
+
+@st.cache_resource
+def compute_pool():
+    # One worker pool per server process, shared by every session
+    return get_pool()
+
+@st.cache_data(max_entries=256)
+def render_stage(season, team, player, match_id, outcomes, plot_type, show_xg, show_names, pitch_theme, version):
+    # Rendered in a worker process; the PNG comes back through the render cache.
+    # ``version`` (the season's data version) moves the cache on after an ingest
+    return compute_pool().render_shots(season=season, team=team, player=player, match_id=match_id,
+                                       outcomes=outcomes, plot_type=plot_type, show_xg=show_xg,
+                                       show_names=show_names, theme=pitch_theme)
+
+@st.cache_data
+def tile_stage(season, team, player, match_id, outcomes, viewport, version):
+    # Aggregated server-side: the browser only gets the density grid and decimated shots
+    return tiles.build_tile(shots_stage(season, team, player, match_id, outcomes, version), viewport)
+
+@st.cache_data
+def usage_stage(season, team, version):
+    # Minutes per player and position are kept up to date by ingest; ``version`` refreshes the cache
+    minutes = aggregates.table("player_position", int(season))
+    return positions.usage_table(minutes[minutes["team"] == team])
+
+@st.cache_data
+def position_stage(season, team, player, version):
+    usage = usage_stage(season, team, version)
+    return usage.loc[usage["player"] == player, ["position", "minutes"]].to_dict("records")
+
+@st.cache_data
+def squad_stage(season, team, version):
+    return figure_png(positions.render_squad(usage_stage(season, team, version), team))
+
+@st.cache_resource(max_entries=2)
+def season_percentiles(season, version):
+    # Sorted per-90 distributions per position group; a profile is a few searchsorted lookups.
+    # ``version`` drops the table (and its .npz) once ingest changes the season.
+    return percentiles.load_season(int(season))
+
+@st.cache_data
+def profile_stage(season, team, player, version):
+    try:
+        profile = season_percentiles(season, version).profile(player, team)
+    except KeyError:
+        return None
+    return figure_png(percentiles.plot_profile(profile))
+
+@st.cache_data
+def profile_sheet_stage(season, team, version):
+    profiles = season_percentiles(season, version).team_profiles(team)
+    return figure_png(percentiles.render_sheet(profiles, f"Percentile Profiles – {team}"))
+
+# Changes after every ingest of the season
+data_version = aggregates.version(int(season))
+team = st.selectbox("Select team", season_teams(season, data_version))
+player = st.selectbox("Select player", pipeline.team_players(team_stage(season, team, data_version)))
+
+shot_outcomes, match_options = player_options_stage(season, team, player, data_version)
 
 # ------------------------ Shot Outcome Filter ------------------------
-shot_outcomes = sorted(team_shots["result"].dropna().unique())
-selected_outcomes = st.multiselect("Filter by shot result", shot_outcomes, default=shot_outcomes)
+selected_outcomes = tuple(st.multiselect("Filter by shot result", shot_outcomes, default=shot_outcomes))
 
 # ------------------------ Match Dropdown ------------------------
-match_ids = team_shots["game_id"].unique()
-team_matches = matches[(matches["home_team"] == team) | (matches["away_team"] == team)].copy()
-team_matches["date"] = pd.to_datetime(team_matches["date"])
-
-# Annotate opponent and home/away
-def get_opponent(row):
-    return row["away_team_code"] if row["home_team"] == team else row["home_team_code"]
-def get_home_away(row):
-    return "Home" if row["home_team"] == team else "Away"
-
-team_matches["opponent"] = team_matches.apply(get_opponent, axis=1)
-team_matches["home_away"] = team_matches.apply(get_home_away, axis=1)
-match_titles = team_matches.set_index("game_id")[["date", "opponent", "home_away"]].to_dict("index")
-
-match_options = {
-    f"{v['date'].strftime('%d %b %Y')} – vs {v['opponent']} ({v['home_away']})": gid
-    for gid, v in match_titles.items()
-    if gid in match_ids
-}
-match_options = {"All Matches": "all"} | match_options
 match_label = st.selectbox("Select match", list(match_options.keys()))
 match_id = match_options[match_label]
 
 # ------------------------ Plot: Positional Map ------------------------
 def plot_player_position_usage_streamlit(position_minutes, player_name="Player"):
-    pos_coords = {
-        "GK": (6, 40),
-        "LB": (20, 10), "LCB": (30, 25), "CCB": (30, 40), "RCB": (30, 55), "RB": (20, 70),
-        "LWB": (35, 10), "RWB": (35, 70),
-        "LM": (50, 10), "CM": (50, 40), "RM": (50, 70),
-        "LAM": (60, 20), "AM": (60, 40), "RAM": (60, 60),
-        "LW": (80, 10), "SS": (80, 30), "CF": (80, 40), "RW": (80, 70)
-    }
-
-    total_minutes = sum([p["minutes"] for p in position_minutes])
-    primary_position = max(position_minutes, key=lambda x: x["minutes"])["position"]
-
-    pitch = Pitch(pitch_type='statsbomb', line_zorder=2, pitch_color='white')
-    fig, ax = pitch.draw(figsize=(10, 6))
-    pitch.annotate(player_name, (60, 5), ax=ax, ha='center', fontsize=14, fontweight='bold')
-
-    for p in position_minutes:
-        pos = p["position"]
-        minutes = p["minutes"]
-        pct = minutes / total_minutes * 100
-        if pos not in pos_coords:
-            continue
-        x, y = pos_coords[pos]
-        if pos == primary_position:
-            ax.add_patch(plt.Circle((x, y), 3.5, color='black', zorder=3))
-        pitch.scatter(x, y, ax=ax, color='blue', s=150, zorder=4)
-        pitch.annotate(f"{pct:.0f}%", (x, y + 3), ax=ax, ha='center', fontsize=10)
-
-    ax.set_title(f"Positional Usage – {player_name}", fontsize=16)
-    st.pyplot(fig)
+    st.pyplot(positions.plot_player_position_usage(position_minutes, player_name))
 
 # ------------------------ Show Positional Map ------------------------
 if plot_type == "Positional Map":
     if player == "(All Players)":
-        st.warning("Please select an individual player to view positional usage.")
+        # Whole squad in one sheet
+        st.image(squad_stage(season, team, data_version), use_container_width=True)
     else:
-        player_data = player_stats[(player_stats["player"] == player) & (player_stats["team"] == team)]
-        if player_data.empty:
+        position_minutes = position_stage(season, team, player, data_version)
+        if not position_minutes:
             st.info("No position data available for this player.")
         else:
-            position_minutes = (
-                player_data.groupby("position")["time"]
-                .sum()
-                .reset_index()
-                .rename(columns={"time": "minutes"})
-                .to_dict("records")
-            )
             plot_player_position_usage_streamlit(position_minutes, player_name=player)
+
+# ------------------------ Show Percentile Profile ------------------------
+elif plot_type == "Percentile Profile":
+    if player == "(All Players)":
+        st.image(profile_sheet_stage(season, team, data_version), use_container_width=True)
+    else:
+        profile_png = profile_stage(season, team, player, data_version)
+        if profile_png is None:
+            st.info(f"Percentiles need at least {percentiles.MIN_MINUTES} minutes for {team} this season.")
+        else:
+            st.image(profile_png, use_container_width=True)
+
+# ------------------------ Show Heat Map / Shot Map ------------------------
+elif use_plotly:
+    viewport = st.selectbox("Zoom", list(tiles.VIEWPORTS))
+    tile = tile_stage(season, team, player, match_id, selected_outcomes, viewport, data_version)
+    title = pipeline.match_title(match_table_stage(season, team, data_version), team, match_id)
+    st.plotly_chart(tiles.plotly_figure(tile, title, pitch_theme), use_container_width=True)
+    st.caption(f"Map payload: {tiles.payload_bytes(tile) / 1024:.1f} KB")
+else:
+    plot_png = render_stage(season, team, player, match_id, selected_outcomes, plot_type,
+                            show_xg, show_names, pitch_theme, data_version)
+    st.image(plot_png, use_container_width=True)
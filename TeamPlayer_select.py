@@ -1,251 +1,7 @@
-import pandas as pd
-import matplotlib.pyplot as plt
-import seaborn as sns
-from matplotlib.animation import FuncAnimation
-import matplotlib.patches as patches
-import tkinter as tk
-from tkinter import ttk
-from tkinter import messagebox
-from soccerdata import Understat
-import requests
+# Season / team / player animated heatmap (same as `soccer-stats animate`)
+import sys
 
-import requests
+from soccer_stats.cli import main
 
-# Patch the requests.get method globally to add a browser user-agent
-original_get = requests.get
-
-def patched_get(*args, **kwargs):
-    headers = kwargs.pop("headers", {})
-    headers["User-Agent"] = (
-        "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) "
-        "AppleWebKit/537.36 (KHTML, like Gecko) "
-        "Chrome/114.0.0.0 Safari/537.36"
-    )
-    kwargs["headers"] = headers
-    return original_get(*args, **kwargs)
-
-requests.get = patched_get
-
-# Global placeholders
-season_choice = None
-team_choice = None
-player_choice = None
-
-# Get all Premier League seasons
-season_range = list(range(2023, 2025 + 1))  # up to 2025
-season_strings = [f"{s}" for s in season_range]
-
-# Main selection function
-def on_submit():
-    global season_choice, team_choice, player_choice
-    season_choice = season_var.get()
-    team_choice = team_var.get()
-    player_choice = player_var.get()
-    root.destroy()
-
-# Update teams based on season
-def update_teams(event=None):
-    season_selected = season_var.get()
-    season_selected = season_var.get()
-    if not season_selected:
-        return
-    try:
-        us_temp = Understat(leagues="ENG-Premier League", seasons=int(season_selected))
-        all_shots = us_temp.read_shot_events().reset_index()
-        teams = sorted(all_shots["team"].unique().tolist())
-        team_combo['values'] = teams
-        if teams:
-            team_combo.set(teams[0])
-        update_players()
-    except Exception as e:
-        team_combo['values'] = []
-        player_combo['values'] = []
-        messagebox.showerror("Data Load Error", f"Could not load data for {season_selected}. Please try a different season.")
-        return
-    teams = sorted(all_shots["team"].unique().tolist())
-    team_combo['values'] = teams
-    if teams:
-        team_combo.set(teams[0])
-    update_players()
-
-# Update players based on selected team
-def update_players(event=None):
-    season_selected = season_var.get()
-    team_selected = team_var.get()
-    if not (season_selected and team_selected):
-        return
-    us_temp = Understat(leagues="ENG-Premier League", seasons=int(season_selected))
-    all_shots = us_temp.read_shot_events().reset_index()
-    team_shots = all_shots[all_shots["team"] == team_selected]
-    players = sorted(team_shots["player"].dropna().unique().tolist())
-    players = ["(All Players)"] + players
-    player_combo['values'] = players
-    player_combo.set("(All Players)")
-
-# Build the Tkinter window
-root = tk.Tk()
-root.title("Select Season, Team, and Player")
-
-# Season dropdown
-tk.Label(root, text="Select a season:").grid(row=0, column=0, padx=10, pady=10, sticky="w")
-season_var = tk.StringVar()
-season_combo = ttk.Combobox(root, textvariable=season_var, values=season_strings, state="readonly")
-season_combo.grid(row=0, column=1, padx=10, pady=10)
-season_combo.set("2024")
-season_combo.bind("<<ComboboxSelected>>", update_teams)
-
-# Team dropdown
-tk.Label(root, text="Select a team:").grid(row=1, column=0, padx=10, pady=10, sticky="w")
-team_var = tk.StringVar()
-team_combo = ttk.Combobox(root, textvariable=team_var, state="readonly")
-team_combo.grid(row=1, column=1, padx=10, pady=10)
-team_combo.bind("<<ComboboxSelected>>", update_players)
-
-# Player dropdown
-tk.Label(root, text="Select a player (or all):").grid(row=2, column=0, padx=10, pady=10, sticky="w")
-player_var = tk.StringVar()
-player_combo = ttk.Combobox(root, textvariable=player_var, state="readonly")
-player_combo.grid(row=2, column=1, padx=10, pady=10)
-
-# Submit button
-submit_btn = ttk.Button(root, text="Generate Heatmap", command=on_submit)
-submit_btn.grid(row=3, column=0, columnspan=2, pady=20)
-
-# Trigger team/player load for default season
-update_teams()
-
-root.mainloop()
-
-us = Understat(leagues="ENG-Premier League", seasons=int(season_choice))
-shots = us.read_shot_events().reset_index()
-
-# Filter team
-shot_data = shots[shots["team"] == team_choice].copy()
-
-# Filter player if selected
-if player_choice != "(All Players)":
-    shot_data = shot_data[shot_data["player"] == player_choice].copy()
-
-# Scale coordinates
-shot_data["x"] = shot_data["location_x"] * 120
-shot_data["y"] = (1 - shot_data["location_y"]) * 80
-
-# Group by match
-matches = sorted(shot_data["game_id"].unique().tolist())
-matches.sort()
-
-match_info = us.read_team_match_stats()
-match_info = match_info.reset_index()
-
-# # Filter team matches only
-team_matches = match_info[(match_info["home_team"] == team_choice) | (match_info["away_team"] == team_choice)].copy()
-
-# Determine opponent and home/away
-def get_opponent(row):
-    if row["home_team"] == team_choice:
-        return row["away_team_code"]
-    else:
-        return row["home_team_code"]
-
-def get_home_away(row):
-    return "Home" if row["home_team"] == team_choice else "Away"
-
-team_matches["opponent"] = team_matches.apply(get_opponent, axis=1)
-team_matches["home_away"] = team_matches.apply(get_home_away, axis=1)
-
-# # Create lookup dict
-match_titles = team_matches.set_index("game_id")[["date", "opponent", "home_away"]].to_dict("index")
-
-
-# Setup figure
-fig, ax = plt.subplots(figsize=(12, 8))
-pitch_outline = plt.plot([0, 0, 120, 120, 0], [0, 80, 80, 0, 0], color="black")
-plt.xlim(0, 120)
-plt.ylim(0, 80)
-ax.set_facecolor("green")
-title = ax.set_title("")
-
-def draw_pitch(ax):
-    # Pitch Outline & Centre Line
-    ax.plot([0, 0], [0, 80], color="black")
-    ax.plot([120, 120], [0, 80], color="black")
-    ax.plot([0, 120], [0, 0], color="black")
-    ax.plot([0, 120], [80, 80], color="black")
-    ax.plot([60, 60], [0, 80], color="black")  # Halfway line
-
-    # Center circle
-    center_circle = patches.Circle((60, 40), 10, edgecolor="black", facecolor="none")
-    ax.add_patch(center_circle)
-    ax.plot(60, 40, 'ko')  # Center spot
-
-    # Left penalty area
-    ax.plot([0, 18], [62, 62], color="black")
-    ax.plot([0, 18], [18, 18], color="black")
-    ax.plot([18, 18], [18, 62], color="black")
-
-    # Right penalty area
-    ax.plot([120, 102], [62, 62], color="black")
-    ax.plot([120, 102], [18, 18], color="black")
-    ax.plot([102, 102], [18, 62], color="black")
-
-    # 6-yard boxes
-    ax.plot([0, 6], [48, 48], color="black")
-    ax.plot([0, 6], [32, 32], color="black")
-    ax.plot([6, 6], [32, 48], color="black")
-
-    ax.plot([120, 114], [48, 48], color="black")
-    ax.plot([120, 114], [32, 32], color="black")
-    ax.plot([114, 114], [32, 48], color="black")
-
-    # Penalty spots
-    ax.plot(12, 40, 'ko')
-    ax.plot(108, 40, 'ko')
-
-    # Remove axes
-    ax.set_xticks([])
-    ax.set_yticks([])
-
-fade_frames = 5  # Number of fade transition frames between games
-frame_pairs = []
-
-# Build frame list: (prev_match_id, next_match_id, fade_step)
-for i in range(len(matches) - 1):
-    for step in range(fade_frames + 1):
-        frame_pairs.append((matches[i], matches[i+1], step / fade_frames))
-
-# player_name = 7322
-# player_shots = shot_data[shot_data["player_id"] == player_name].copy()
-
-# Function to update frame
-def update(frame):
-    ax.clear()
-    match_id_a, match_id_b, alpha_b = frame
-    alpha_a = 1.0 - alpha_b
-
-    data_a = shot_data[shot_data["game_id"] == match_id_a]
-    data_b = shot_data[shot_data["game_id"] == match_id_b]
-
-    # data_a = player_shots[player_shots["game_id"] == match_id_a]
-    # data_b = player_shots[player_shots["game_id"] == match_id_b]
-
-    draw_pitch(ax)
-    ax.set_xlim(0, 120)
-    ax.set_ylim(0, 80)
-    ax.set_facecolor("green")
-
-    # Blend KDE plots
-    if not data_a.empty and alpha_a > 0:
-        sns.kdeplot(data=data_a, x="x", y="y", fill=True, cmap="Reds", alpha=alpha_a, ax=ax, thresh=0.05)
-    if not data_b.empty and alpha_b > 0:
-        sns.kdeplot(data=data_b, x="x", y="y", fill=True, cmap="Reds", alpha=alpha_b, ax=ax, thresh=0.05)
-
-    # Label based on the dominant game
-    info = match_titles.get(match_id_b if alpha_b >= 0.5 else match_id_a, {})
-    ax.set_title(f"{info.get('date', 'Unknown')} – vs {info.get('opponent', '?')} ({info.get('home_away', '?')})")
-    # ax.text(60, -5, f"{player_name}", ha="center", fontsize=12, color="black")
-
-
-# Animate
-anim = FuncAnimation(fig, update, frames=frame_pairs, interval=1200)
-plt.show()
-# anim.save("team_heatmap.gif", writer="pillow", fps=1)
\ No newline at end of file
+if __name__ == "__main__":
+    main(["animate"] + sys.argv[1:])
@@ -3,21 +3,7 @@ import pandas as pd
 import seaborn as sns
 import matplotlib.pyplot as plt
 import matplotlib.patches as patches
-from soccerdata import Understat
-import requests
-
-# Patch requests with User-Agent for Understat scraping
-original_get = requests.get
-def patched_get(*args, **kwargs):
-    headers = kwargs.pop("headers", {})
-    headers["User-Agent"] = (
-        "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) "
-        "AppleWebKit/537.36 (KHTML, like Gecko) "
-        "Chrome/114.0.0.0 Safari/537.36"
-    )
-    kwargs["headers"] = headers
-    return original_get(*args, **kwargs)
-requests.get = patched_get
+from soccer_stats.sources import get_source
 
 st.set_page_config(layout="wide", page_title="Football Shot Heatmap")
 
@@ -28,9 +14,10 @@ season = st.selectbox("Select season", ["2023", "2024", "2025"], index=1)
 # Load data
 @st.cache_data(show_spinner=True)
 def load_data(season):
-    us = Understat(leagues="ENG-Premier League", seasons=int(season))
-    shots = us.read_shot_events().reset_index()
-    matches = us.read_team_match_stats().reset_index()
+    # Local store first; Understat is only hit when the season is missing
+    source = get_source()
+    shots = source.read("shots", season)
+    matches = source.read("team_matches", season)
     return shots, matches
 
 shots, matches = load_data(season)
@@ -38,14 +25,14 @@ teams = sorted(shots["team"].unique())
 team = st.selectbox("Select team", teams)
 
 # Filter shots for selected team
-team_shots = shots[shots["team"] == team].copy()
+team_shots = shots[shots["team"] == team]
 players = sorted(team_shots["player"].dropna().unique())
 players = ["(All Players)"] + players
 player = st.selectbox("Select player", players)
 
 # Filter by player
 if player != "(All Players)":
-    team_shots = team_shots[team_shots["player"] == player].copy()
+    team_shots = team_shots[team_shots["player"] == player]
 
 # Get matches for dropdown
 match_ids = team_shots["game_id"].unique()
@@ -71,9 +58,8 @@ match_label = st.selectbox("Select match", list(match_options.keys()))
 match_id = match_options[match_label]
 
 # Final shot filtering
-match_shots = team_shots[team_shots["game_id"] == match_id].copy()
-match_shots["x"] = match_shots["location_x"] * 120
-match_shots["y"] = (1 - match_shots["location_y"]) * 80
+# x/y pitch coordinates are added at ingestion
+match_shots = team_shots[team_shots["game_id"] == match_id]
 
 # Draw pitch function
 def draw_pitch(ax):
@@ -1,24 +1,15 @@
 import streamlit as st
-import pandas as pd
-import matplotlib.pyplot as plt
-import matplotlib.patches as patches
-import seaborn as sns
-from soccerdata import Understat
-import requests
-import io
-
-# Patch requests with User-Agent for Understat scraping
-original_get = requests.get
-def patched_get(*args, **kwargs):
-    headers = kwargs.pop("headers", {})
-    headers["User-Agent"] = (
-        "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) "
-        "AppleWebKit/537.36 (KHTML, like Gecko) "
-        "Chrome/114.0.0.0 Safari/537.36"
-    )
-    kwargs["headers"] = headers
-    return original_get(*args, **kwargs)
-requests.get = patched_get
+from soccer_stats.sources import get_source, stored_seasons
+from soccer_stats.fixtures import FixtureIndex
+from soccer_stats import pipeline
+from soccer_stats.workers import get_pool
+from soccer_stats.export import EXPORT_FORMATS, export_to_tempfile
+from soccer_stats.styles import DEFAULT_PATH as STYLES_PATH, load_styles
+from soccer_stats import zones
+from soccer_stats import aggregates
+from soccer_stats import timeline
+from soccer_stats import bootstrap
+from soccer_stats.render import figure_png
 
 st.set_page_config(layout="wide", page_title="Football Shot Visualizer")
 
@@ -27,133 +18,164 @@ season = st.selectbox("Select season", ["2023", "2024", "2025"], index=1)
 plot_type = st.selectbox("Choose plot type", ["Heat Map", "Shot Map"])
 show_xg = st.checkbox("Show xg values on shot map", value=False)
 show_names = st.checkbox("Show player names on shot map", value=False)
-
-@st.cache_data(show_spinner=True)
-def load_data(season):
-    us = Understat(leagues="ENG-Premier League", seasons=int(season))
-    shots = us.read_shot_events().reset_index()
-    matches = us.read_team_match_stats().reset_index()
+show_zones = st.checkbox("Overlay league zone conversion", value=False)
+
+# ------------------------ Cached stages ------------------------
+# Each stage is keyed only on its own inputs and pulls the previous stage from
+# the cache, so a widget change reruns just the stages downstream of it.
+@st.cache_resource(show_spinner=True, max_entries=4)
+def load_data(season, version):
+    # Local store first; Understat is only hit when the season is missing.
+    # Shared (not copied) between reruns, so treat as read-only. Every stage
+    # takes the season's data ``version``, so an ingest refreshes all of them.
+    source = get_source()
+    shots = source.read("shots", season)
+    matches = source.read("team_matches", season)
     return shots, matches
 
-shots, matches = load_data(season)
-teams = sorted(shots["team"].unique())
-team = st.selectbox("Select team", teams)
-
-team_shots = shots[shots["team"] == team].copy()
-players = sorted(team_shots["player"].dropna().unique())
-players = ["(All Players)"] + players
-player = st.selectbox("Select player", players)
-
-if player != "(All Players)":
-    team_shots = team_shots[team_shots["player"] == player].copy()
+@st.cache_data
+def season_teams(season, version):
+    return sorted(load_data(season, version)[0]["team"].unique())
+
+@st.cache_data
+def team_stage(season, team, version):
+    return pipeline.team_slice(load_data(season, version)[0], team)
+
+@st.cache_data
+def match_table_stage(season, team, version):
+    return pipeline.match_table(load_data(season, version)[1], team)
+
+@st.cache_data
+def player_stage(season, team, player, version):
+    return pipeline.player_slice(team_stage(season, team, version), player)
+
+@st.cache_data
+def player_options_stage(season, team, player, version):
+    player_shots = player_stage(season, team, player, version)
+    outcomes = sorted(player_shots["result"].dropna().unique())
+    options = pipeline.match_options(match_table_stage(season, team, version), player_shots["game_id"].unique())
+    return outcomes, options
+
+@st.cache_data
+def shots_stage(season, team, player, match_id, outcomes, version):
+    match_shots = pipeline.match_slice(player_stage(season, team, player, version), match_id)
+    return pipeline.outcome_filter(match_shots, list(outcomes))
+
+@st.cache_data(max_entries=4)
+def zones_stage(season, version):
+    # Whole-season zone model, cached on disk per data version
+    return zones.load_season(int(season))
+
+@st.cache_resource
+def compute_pool():
+    # One worker pool per server process, shared by every session
+    return get_pool()
+
+@st.cache_data(max_entries=256)
+def render_stage(season, team, player, match_id, outcomes, plot_type, show_xg, show_names, show_zones, version):
+    # Rendered in a worker process; the PNG comes back through the render cache.
+    # ``version`` (the season's data version) moves the cache on after an ingest
+    return compute_pool().render_shots(season=season, team=team, player=player, match_id=match_id,
+                                       outcomes=outcomes, plot_type=plot_type, show_xg=show_xg,
+                                       show_names=show_names, show_zones=show_zones)
+
+@st.cache_resource(max_entries=2)
+def fixture_index(seasons, versions):
+    # Every season already on disk, so head-to-heads span seasons without network calls.
+    # Only fixtures are read: the other seasons' shots are never needed here
+    source = get_source()
+    return FixtureIndex([source.read("team_matches", s) for s in seasons])
+
+@st.cache_data
+def totals_stage(season, version):
+    # Season totals maintained by ingest; ``version`` changes after each refresh
+    return aggregates.table("team", int(season)), aggregates.table("player", int(season))
+
+@st.cache_resource(max_entries=2)
+def season_intervals(season, version):
+    # Bootstrap intervals, cached on disk per data version
+    return bootstrap.load_season(int(season))
+
+@st.cache_resource(max_entries=2)
+def season_timelines(season, version):
+    # Every fixture's xG timeline; one match is an array slice
+    return timeline.load_season(int(season))
+
+@st.cache_data
+def race_stage(season, match_id, version):
+    try:
+        match = season_timelines(season, version).match(match_id)
+    except KeyError:
+        # Fixture without a timeline (e.g. no result stored yet)
+        return None
+    return figure_png(timeline.plot_race(match))
 
-# Shot outcome filter
-shot_outcomes = sorted(team_shots["result"].dropna().unique())
-selected_outcomes = st.multiselect("Filter by shot result", shot_outcomes, default=shot_outcomes)
+@st.cache_resource(max_entries=1)
+def _team_styles(mtime):
+    return load_styles()
 
-match_ids = team_shots["game_id"].unique()
-team_matches = matches[(matches["home_team"] == team) | (matches["away_team"] == team)].copy()
+def load_team_styles():
+    # Written by `soccer-stats styles`; None until that has been run, re-read when it is rewritten
+    return _team_styles(STYLES_PATH.stat().st_mtime_ns) if STYLES_PATH.exists() else None
 
-def get_opponent(row):
-    return row["away_team_code"] if row["home_team"] == team else row["home_team_code"]
+# ------------------------ Selections ------------------------
+# Changes after every ingest of the season
+data_version = aggregates.version(int(season))
+team = st.selectbox("Select team", season_teams(season, data_version))
+player = st.selectbox("Select player", pipeline.team_players(team_stage(season, team, data_version)))
 
-def get_home_away(row):
-    return "Home" if row["home_team"] == team else "Away"
+shot_outcomes, match_options = player_options_stage(season, team, player, data_version)
 
-team_matches["opponent"] = team_matches.apply(get_opponent, axis=1)
-team_matches["home_away"] = team_matches.apply(get_home_away, axis=1)
-team_matches["date"] = pd.to_datetime(team_matches["date"])
-match_titles = team_matches.set_index("game_id")[["date", "opponent", "home_away"]].to_dict("index")
+# Shot outcome filter
+selected_outcomes = tuple(st.multiselect("Filter by shot result", shot_outcomes, default=shot_outcomes))
 
-match_options = {
-    f"{v['date']} vs {v['opponent']} ({v['home_away']})": gid
-    for gid, v in match_titles.items()
-    if gid in match_ids
-}
-match_options = {"All Matches": "all"} | match_options
 match_label = st.selectbox("Select match", list(match_options.keys()))
 match_id = match_options[match_label]
 
-# Filter shots for match(es)
-if match_id == "all":
-    match_shots = team_shots.copy()
-    title = f"All Matches – {team}"
-else:
-    match_shots = team_shots[team_shots["game_id"] == match_id].copy()
-    info = match_titles.get(match_id, {})
-    try:
-        match_date = info.get("date").strftime("%d %b %Y")
-    except:
-        match_date = "Unknown"
-    title = f"{match_date} – vs {info.get('opponent', '?')} ({info.get('home_away', '?')})"
-
-# Apply outcome filter
-match_shots = match_shots[match_shots["result"].isin(selected_outcomes)].copy()
-
-# Normalize coordinates
-match_shots["x"] = match_shots["location_x"] * 120
-match_shots["y"] = (1 - match_shots["location_y"]) * 80
-
-# Draw pitch
-def draw_pitch(ax):
-    ax.plot([0, 0, 120, 120, 0], [0, 80, 80, 0, 0], color="black")
-    ax.plot([60, 60], [0, 80], color="black")
-    ax.add_patch(patches.Circle((60, 40), 10, edgecolor="black", facecolor="none"))
-    ax.plot(60, 40, 'ko')
-    ax.plot([0, 18], [62, 62], color="black")
-    ax.plot([0, 18], [18, 18], color="black")
-    ax.plot([18, 18], [18, 62], color="black")
-    ax.plot([120, 102], [62, 62], color="black")
-    ax.plot([120, 102], [18, 18], color="black")
-    ax.plot([102, 102], [18, 62], color="black")
-    ax.plot([0, 6], [48, 48], color="black")
-    ax.plot([0, 6], [32, 32], color="black")
-    ax.plot([6, 6], [32, 48], color="black")
-    ax.plot([120, 114], [48, 48], color="black")
-    ax.plot([120, 114], [32, 32], color="black")
-    ax.plot([114, 114], [32, 48], color="black")
-    ax.plot(12, 40, 'ko')
-    ax.plot(108, 40, 'ko')
-    ax.set_xticks([])
-    ax.set_yticks([])
-    ax.set_xlim(0, 120)
-    ax.set_ylim(0, 80)
-    ax.set_facecolor("green")
-
 # Plot
-fig, ax = plt.subplots(figsize=(12, 8))
-draw_pitch(ax)
-
-if not match_shots.empty:
-    if plot_type == "Heat Map":
-        sns.kdeplot(
-            data=match_shots, x="x", y="y", fill=True,
-            cmap="Reds", alpha=0.8, ax=ax, thresh=0.05
-        )
-    else:
-        for _, row in match_shots.iterrows():
-            symbol = "O" if row["result"] == "Goal" else "X"
-            color = "lime" if row["result"] == "Goal" else "red"
-            ax.text(row["x"], row["y"], symbol, color=color, fontsize=12,
-                    ha='center', va='center', fontweight='bold')
-
-            if show_xg and "xg" in row:
-                try:
-                    ax.text(row["x"], row["y"] + 2, f"xg: {float(row['xg']):.2f}", fontsize=8,
-                            color="white", ha='center', va='center', bbox=dict(facecolor='black', alpha=0.5, pad=1))
-                except:
-                    pass
-
-            if show_names and "player" in row:
-                ax.text(row["x"], row["y"] - 2, row["player"], fontsize=8,
-                        color="white", ha='center', va='center', bbox=dict(facecolor='black', alpha=0.5, pad=1))
-
-# Plot title
-ax.set_title(title)
-st.pyplot(fig)
+plot_png = render_stage(season, team, player, match_id, selected_outcomes, plot_type, show_xg, show_names, show_zones,
+                        data_version)
+st.image(plot_png, use_container_width=True)
+
+# Season totals
+team_totals, player_totals = totals_stage(season, data_version)
+if player == "(All Players)":
+    totals_row = team_totals[team_totals["team"] == team]
+    if not totals_row.empty:
+        t = totals_row.iloc[0]
+        st.caption(f"Season: {t['matches']} played, {t['points']} pts, goals {t['goals_for']}-{t['goals_against']}, "
+                   f"xG {t['xg_for']:.1f}-{t['xg_against']:.1f}")
+    intervals = season_intervals(season, data_version)["teams"]
+    interval_row = intervals[intervals["team"] == team]
+else:
+    totals_row = player_totals[(player_totals["player"] == player) & (player_totals["team"] == team)]
+    if not totals_row.empty:
+        t = totals_row.iloc[0]
+        st.caption(f"Season: {t['minutes']} min in {t['matches']} matches, {t['goals']} goals, "
+                   f"{t['assists']} assists, xG {t['xg']:.1f}, xA {t['xa']:.1f}")
+    intervals = season_intervals(season, data_version)["players"]
+    interval_row = intervals[(intervals["player"] == player) & (intervals["team"] == team)]
+if not interval_row.empty:
+    b = interval_row.iloc[0]
+    st.caption(f"{bootstrap.CI:.0%} bootstrap intervals: goals − xG {b['goals_minus_xg']:+.1f} "
+               f"[{b['goals_minus_xg_lo']:+.1f}, {b['goals_minus_xg_hi']:+.1f}], "
+               f"conversion {b['conversion']:.1%} [{b['conversion_lo']:.1%}, {b['conversion_hi']:.1%}], "
+               f"goals/90 {b['goals_90']:.2f} [{b['goals_90_lo']:.2f}, {b['goals_90_hi']:.2f}]")
+
+# Finishing against the league zone baseline
+zone_perf = zones_stage(season, data_version)
+perf_by, perf_key = ("team", team) if player == "(All Players)" else ("player", player)
+perf_table = zone_perf[f"{perf_by}s"]
+perf_row = perf_table[perf_table[perf_by] == perf_key]
+if not perf_row.empty:
+    perf = perf_row.iloc[0]
+    st.caption(f"{perf_key}: {perf['goals']:.0f} goals from {perf['shots']:.0f} shots, "
+               f"{perf['goals_vs_zone']:+.1f} vs league conversion for those zones "
+               f"(xG {perf['xg_vs_zone']:+.1f} vs zone average)")
 
 # Match stats table (if one match selected)
 if match_id != "all":
+    team_matches = match_table_stage(season, team, data_version)
     match_row = team_matches[team_matches["game_id"] == match_id]
     if not match_row.empty:
         st.subheader("Match Stats")
@@ -162,13 +184,39 @@ if match_id != "all":
         stat_table.columns = ["Value"]
         st.dataframe(stat_table)
 
+        st.subheader("xG Race")
+        race_png = race_stage(season, match_id, data_version)
+        if race_png is None:
+            st.info("No xG timeline for this match yet.")
+        else:
+            st.image(race_png, use_container_width=True)
+
+        opponent = match_row.iloc[0]["away_team"] if match_row.iloc[0]["home_team"] == team else match_row.iloc[0]["home_team"]
+        seasons = tuple(sorted({str(s) for s in stored_seasons("team_matches")} | {season}))
+        versions = tuple(aggregates.version(int(s)) for s in seasons)
+        h2h, h2h_summary = fixture_index(seasons, versions).head_to_head(team, opponent)
+        st.subheader(f"Head-to-head vs {opponent}")
+        st.caption(f"{h2h_summary['played']} played: {h2h_summary['wins']}W {h2h_summary['draws']}D "
+                   f"{h2h_summary['losses']}L, goals {h2h_summary['goals_for']}-{h2h_summary['goals_against']}, "
+                   f"xG {h2h_summary['xg_for']:.1f}-{h2h_summary['xg_against']:.1f}")
+        st.dataframe(h2h[["date", "is_home", "goals_for", "goals_against", "xg_for", "xg_against", "points"]],
+                     hide_index=True)
+
+    team_styles = load_team_styles()
+    if team_styles is not None:
+        style_row = team_styles[(team_styles["game_id"] == match_id) & (team_styles["team"] == team)]
+        if not style_row.empty:
+            st.caption(f"Playing style (rolling {team} profile): {style_row.iloc[0]['style']}")
+
 # Download buttons
-csv_buffer = io.StringIO()
-match_shots.to_csv(csv_buffer, index=False)
-st.download_button("Download shot data as CSV", data=csv_buffer.getvalue(),
-                   file_name="shot_data.csv", mime="text/csv")
-
-img_buffer = io.BytesIO()
-fig.savefig(img_buffer, format='png', bbox_inches='tight')
-st.download_button("Download plot as PNG", data=img_buffer.getvalue(),
+# Shot data is only serialized when an export is requested, in chunks to disk
+export_format = st.selectbox("Shot data export format", list(EXPORT_FORMATS))
+if st.button("Prepare shot data export"):
+    ext, mime = EXPORT_FORMATS[export_format]
+    match_shots = shots_stage(season, team, player, match_id, selected_outcomes, data_version)
+    with export_to_tempfile(match_shots, export_format) as export_file:
+        st.download_button(f"Download shot data as {export_format}", data=export_file,
+                           file_name=f"shot_data.{ext}", mime=mime)
+
+st.download_button("Download plot as PNG", data=plot_png,
                    file_name="shot_plot.png", mime="image/png")
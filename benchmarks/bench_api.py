@@ -0,0 +1,153 @@
+"""Load test for the stats HTTP API (``soccer-stats api``).
+
+Opens ``-c`` keep-alive connections that each issue requests from a fixed
+mix of endpoints until ``-n`` requests have been made in total, then reports
+throughput, latency percentiles and status counts. With ``--etag`` clients
+revalidate with If-None-Match, as a polling dashboard would.
+
+Starts a server on a free port unless ``--url`` points at a running one.
+Run from the repository root:  python benchmarks/bench_api.py [-n 2000] [-c 32]
+"""
+import argparse
+import asyncio
+import json
+import signal
+import socket
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+from urllib.parse import quote, urlsplit
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def request_mix(season, teams):
+    paths = [f"/seasons/{season}/teams", f"/seasons/{season}/leaderboard?stat=xg&n=20",
+             f"/seasons/{season}/leaderboard?stat=goals&n=50"]
+    for team in teams:
+        t = quote(team)
+        paths += [f"/seasons/{season}/teams/{t}/players", f"/seasons/{season}/teams/{t}/matches",
+                  f"/seasons/{season}/shots?team={t}", f"/seasons/{season}/heatmap.png?team={t}"]
+    return paths
+
+
+async def fetch(reader, writer, host, path, etag=None):
+    head = f"GET {path} HTTP/1.1\r\nHost: {host}\r\n"
+    if etag:
+        head += f"If-None-Match: {etag}\r\n"
+    writer.write((head + "\r\n").encode("latin-1"))
+    await writer.drain()
+    status = int((await reader.readline()).split()[1])
+    headers = {}
+    while (line := await reader.readline()) not in (b"\r\n", b""):
+        name, _, value = line.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+    body = await reader.readexactly(int(headers.get("content-length", 0)))
+    return status, headers.get("etag"), body
+
+
+async def client(host, port, paths, queue, latencies, statuses, use_etag):
+    reader, writer = await asyncio.open_connection(host, port)
+    etags = {}
+    try:
+        while True:
+            try:
+                i = queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            path = paths[i % len(paths)]
+            start = time.perf_counter()
+            status, etag, _ = await fetch(reader, writer, host, path, etags.get(path) if use_etag else None)
+            latencies.append(time.perf_counter() - start)
+            statuses[status] = statuses.get(status, 0) + 1
+            if etag:
+                etags[path] = etag
+    finally:
+        writer.close()
+
+
+async def load(host, port, paths, n, concurrency, use_etag):
+    queue = asyncio.Queue()
+    for i in range(n):
+        queue.put_nowait(i)
+    latencies, statuses = [], {}
+    start = time.perf_counter()
+    await asyncio.gather(*(client(host, port, paths, queue, latencies, statuses, use_etag)
+                           for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+    ms = sorted(x * 1000 for x in latencies)
+    return {
+        "requests": len(ms),
+        "seconds": elapsed,
+        "requests_per_s": len(ms) / elapsed,
+        "latency_ms": {"p50": statistics.median(ms), "p95": ms[int(len(ms) * 0.95)],
+                       "p99": ms[int(len(ms) * 0.99)], "max": ms[-1]},
+        "statuses": statuses,
+    }
+
+
+async def warm_up(host, port, paths):
+    """One pass over every path, so renders are in the cache before timing."""
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        for path in paths:
+            await fetch(reader, writer, host, path)
+        _, _, body = await fetch(reader, writer, host, paths[0])
+        return json.loads(body)
+    finally:
+        writer.close()
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def wait_for(host, port, timeout=30):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            socket.create_connection((host, port), timeout=1).close()
+            return
+        except OSError:
+            time.sleep(0.1)
+    raise SystemExit(f"API did not come up on {host}:{port}")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("-n", type=int, default=2000, help="total requests")
+    parser.add_argument("-c", type=int, default=32, help="concurrent connections")
+    parser.add_argument("--season", type=int, default=2024)
+    parser.add_argument("--teams", type=int, default=4, help="teams in the request mix")
+    parser.add_argument("--etag", action="store_true", help="revalidate with If-None-Match")
+    parser.add_argument("--url", help="existing server, e.g. http://127.0.0.1:8000")
+    args = parser.parse_args()
+
+    server = None
+    if args.url:
+        url = urlsplit(args.url)
+        host, port = url.hostname, url.port or 80
+    else:
+        host, port = "127.0.0.1", free_port()
+        server = subprocess.Popen([sys.executable, "-m", "soccer_stats", "api", "--port", str(port)], cwd=ROOT,
+                                  stdout=subprocess.DEVNULL)
+        wait_for(host, port)
+    try:
+        teams = asyncio.run(warm_up(host, port, [f"/seasons/{args.season}/teams"]))[:args.teams]
+        paths = request_mix(args.season, teams)
+        asyncio.run(warm_up(host, port, paths))
+        results = asyncio.run(load(host, port, paths, args.n, args.c, args.etag))
+    finally:
+        if server is not None:
+            # SIGINT lets the server shut its render workers down too
+            server.send_signal(signal.SIGINT)
+            server.wait(timeout=30)
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
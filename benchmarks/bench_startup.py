@@ -0,0 +1,81 @@
+"""Startup-time benchmark for the soccer-stats CLI.
+
+Measures, in fresh interpreters:
+  * ``python -m soccer_stats --help``
+  * importing ``soccer_stats.cli`` (what every command pays before doing work)
+  * building and painting the Tk selection window from the cached team list
+
+Run from the repository root:  python benchmarks/bench_startup.py [-n 5]
+"""
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+WINDOW_SNIPPET = """
+import time
+t0 = time.perf_counter()
+from soccer_stats.dialog import build_dialog
+root, _ = build_dialog(title="bench")
+root.update()
+print(time.perf_counter() - t0)
+root.destroy()
+"""
+
+IMPORT_SNIPPET = """
+import time, sys
+t0 = time.perf_counter()
+import soccer_stats.cli
+print(time.perf_counter() - t0)
+heavy = [m for m in ("pandas", "matplotlib", "seaborn", "soccerdata", "tkinter", "streamlit") if m in sys.modules]
+print(",".join(heavy))
+"""
+
+
+def run_python(args):
+    start = time.perf_counter()
+    proc = subprocess.run([sys.executable, *args], cwd=ROOT, capture_output=True, text=True)
+    return time.perf_counter() - start, proc
+
+
+def summarize(samples):
+    return {"min": min(samples), "median": statistics.median(samples), "max": max(samples)}
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("-n", type=int, default=5, help="repetitions per measurement")
+    n = parser.parse_args().n
+
+    results = {}
+    results["help_wall_s"] = summarize([run_python(["-m", "soccer_stats", "--help"])[0] for _ in range(n)])
+
+    import_times, heavy = [], ""
+    for _ in range(n):
+        _, proc = run_python(["-c", IMPORT_SNIPPET])
+        lines = proc.stdout.splitlines()
+        import_times.append(float(lines[0]))
+        heavy = lines[1] if len(lines) > 1 else ""
+    results["cli_import_s"] = summarize(import_times)
+    results["heavy_modules_at_import"] = heavy.split(",") if heavy else []
+
+    window_times = []
+    for _ in range(n):
+        _, proc = run_python(["-c", WINDOW_SNIPPET])
+        if proc.returncode != 0:
+            results["window_s"] = "skipped (no display or tkinter unavailable)"
+            break
+        window_times.append(float(proc.stdout.strip()))
+    else:
+        results["window_s"] = summarize(window_times)
+
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1 @@
+"""Shared helpers for the Soccer_Stats scripts and Streamlit apps."""
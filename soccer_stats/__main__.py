@@ -0,0 +1,3 @@
+from soccer_stats.cli import main
+
+main()
@@ -0,0 +1,237 @@
+"""Materialized season aggregates, updated incrementally as match batches arrive.
+
+Running sums and counts kept per season:
+
+* ``team`` - per team: matches, points, goals and xG for/against (from team
+  matches), shots, shot xG and a count per shot result (from shots)
+* ``player`` - per (player_id, team): matches, minutes, goals, xG, xA, ...
+  with the player's latest name, so a mid-season transfer keeps one row per
+  club
+* ``player_position`` - per (player_id, team, position): matches and minutes
+
+``update`` folds in only the games it has not applied yet, so a matchweek
+refresh costs a groupby over that matchweek's rows and an index-aligned add,
+never a groupby over the season. Tables are Parquet files in
+``STORE_DIR/aggregates`` next to the frames, with the applied game_ids kept
+alongside; a game is applied once, so use ``rebuild`` after upstream
+corrections to already-ingested games. Updates of a season hold an
+exclusive file lock, so concurrent ingests never lose each other's games.
+"""
+import contextlib
+import json
+import os
+
+import pandas as pd
+
+from soccer_stats import config
+
+# Bumped when table keys change, so tables in an older layout are rebuilt rather than folded into
+LAYOUT = 2
+DEFAULT_DIR = config.STORE_DIR / "aggregates" / f"v{LAYOUT}"
+
+TABLES = ("team", "player", "player_position")
+PLAYER_SUMS = ["minutes", "goals", "own_goals", "shots", "xg", "xa", "xg_chain", "xg_buildup",
+               "assists", "key_passes", "yellow_cards", "red_cards"]
+# Non-additive columns: the newest batch wins
+LABELS = ["player"]
+FLOAT_COLUMNS = {"xg", "xa", "xg_chain", "xg_buildup", "xg_for", "xg_against", "shot_xg"}
+
+
+# ------------------------ Batch aggregation ------------------------
+def _team_from_matches(matches):
+    sides = []
+    for side, other in (("home", "away"), ("away", "home")):
+        sides.append(pd.DataFrame({
+            "team": matches[f"{side}_team"].to_numpy(),
+            "matches": 1,
+            "points": matches[f"{side}_points"].to_numpy(),
+            "goals_for": matches[f"{side}_goals"].to_numpy(),
+            "goals_against": matches[f"{other}_goals"].to_numpy(),
+            "xg_for": matches[f"{side}_xg"].to_numpy(),
+            "xg_against": matches[f"{other}_xg"].to_numpy(),
+        }))
+    return pd.concat(sides).groupby("team", sort=False).sum()
+
+
+def _team_from_shots(shots):
+    grouped = shots.groupby("team", sort=False)
+    batch = pd.DataFrame({"shots": grouped.size(), "shot_xg": grouped["xg"].sum()})
+    results = pd.crosstab(shots["team"], shots["result"])
+    results.columns = [f"result_{r}" for r in results.columns]
+    return batch.join(results)
+
+
+def _player_from_matches(player_matches):
+    grouped = player_matches.groupby(["player_id", "team"], sort=False)
+    batch = grouped[[c for c in PLAYER_SUMS if c in player_matches]].sum()
+    batch.insert(0, "matches", grouped.size())
+    batch[LABELS] = grouped[LABELS].last()
+    return batch
+
+
+def _positions_from_matches(player_matches):
+    grouped = player_matches.groupby(["player_id", "team", "position"], sort=False)
+    batch = pd.DataFrame({"matches": grouped.size(), "minutes": grouped["minutes"].sum()})
+    batch[LABELS] = grouped[LABELS].last()
+    return batch
+
+
+# table -> source kind -> batch function (returns a frame indexed by the table's keys)
+BUILDERS = {
+    "team": {"team_matches": _team_from_matches, "shots": _team_from_shots},
+    "player": {"player_matches": _player_from_matches},
+    "player_position": {"player_matches": _positions_from_matches},
+}
+KEYS = {"team": ["team"], "player": ["player_id", "team"], "player_position": ["player_id", "team", "position"]}
+
+
+def fold(current, batch):
+    """Add ``batch`` into ``current`` (both indexed by the table keys)."""
+    labels = [c for c in LABELS if c in batch]
+    sums = current.drop(columns=labels).add(batch.drop(columns=labels), fill_value=0).fillna(0)
+    ints = [c for c in sums.columns if c not in FLOAT_COLUMNS]
+    sums[ints] = sums[ints].astype("int64")
+    if labels:
+        sums[labels] = batch[labels].combine_first(current[labels])
+    return sums
+
+
+# ------------------------ Persistence ------------------------
+def _path(root, name, season):
+    return root / f"{name}_{season}.parquet"
+
+
+def _applied_path(root, season):
+    return root / f"applied_{season}.json"
+
+
+def _replace(path, write):
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    write(tmp)
+    tmp.replace(path)
+
+
+def applied_games(season, root=None):
+    """kind -> set of game_ids already folded into the season's tables."""
+    path = _applied_path(root or DEFAULT_DIR, season)
+    if not path.exists():
+        return {}
+    return {kind: set(ids) for kind, ids in json.loads(path.read_text()).items()}
+
+
+def _stamp_path(root, season):
+    return root / f"stamp_{season}"
+
+
+def touch(season, root=None):
+    """Move ``version`` on without new games, e.g. when a stored frame is replaced."""
+    root = root or DEFAULT_DIR
+    root.mkdir(parents=True, exist_ok=True)
+    _stamp_path(root, season).touch()
+
+
+def version(season, root=None):
+    """Changes whenever the season's aggregates or stored frames do; use it as a cache key."""
+    root = root or DEFAULT_DIR
+    paths = (_applied_path(root, season), _stamp_path(root, season))
+    return max((path.stat().st_mtime_ns for path in paths if path.exists()), default=0)
+
+
+def derived_path(root, name, season, suffix=".parquet"):
+    """Path of a cache derived from a season's frames; it moves on whenever ``version`` does."""
+    return root / f"{name}_{season}_v{version(season)}{suffix}"
+
+
+def prune_derived(keep):
+    """Remove the other versions of the derived cache ``keep``."""
+    name = keep.name[:keep.name.rindex("_v")]
+    for path in keep.parent.glob(f"{name}_v*"):
+        if path != keep and ".tmp" not in path.name:
+            path.unlink(missing_ok=True)
+
+
+@contextlib.contextmanager
+def _locked(root, season):
+    """Exclusive lock on a season's tables, held across processes."""
+    root.mkdir(parents=True, exist_ok=True)
+    with open(root / f"lock_{season}", "a+b") as fh:
+        if os.name == "nt":
+            import msvcrt
+
+            fh.seek(0)
+            while True:
+                try:
+                    msvcrt.locking(fh.fileno(), msvcrt.LK_LOCK, 1)
+                    break
+                except OSError:  # LK_LOCK gives up after ~10s; keep waiting
+                    continue
+            try:
+                yield
+            finally:
+                fh.seek(0)
+                msvcrt.locking(fh.fileno(), msvcrt.LK_UNLCK, 1)
+        else:
+            import fcntl
+
+            fcntl.flock(fh, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(fh, fcntl.LOCK_UN)
+
+
+def update(season, kind, rows, root=None):
+    """Fold the games in ``rows`` (a validated ``kind`` frame) that are not applied yet.
+
+    Returns the number of newly applied games.
+    """
+    root = root or DEFAULT_DIR
+    with _locked(root, season):
+        return _update(season, kind, rows, root)
+
+
+def _update(season, kind, rows, root):
+    applied = applied_games(season, root)
+    done = applied.get(kind, set())
+    new = rows[~rows["game_id"].isin(done)]
+    if new.empty:
+        return 0
+
+    for name, builders in BUILDERS.items():
+        if kind not in builders:
+            continue
+        batch = builders[kind](new)
+        path = _path(root, name, season)
+        if path.exists():
+            batch = fold(pd.read_parquet(path).set_index(KEYS[name]), batch)
+        _replace(path, lambda tmp: batch.reset_index().to_parquet(tmp, index=False))
+
+    new_games = set(new["game_id"].unique().tolist())
+    applied[kind] = done | new_games
+    payload = json.dumps({k: sorted(ids) for k, ids in applied.items()})
+    _replace(_applied_path(root, season), lambda tmp: tmp.write_text(payload))
+    return len(new_games)
+
+
+def rebuild(season, root=None):
+    """Drop the season's tables and fold every stored game again."""
+    from soccer_stats.sources import get_source
+
+    root = root or DEFAULT_DIR
+    with _locked(root, season):
+        for path in [_path(root, name, season) for name in TABLES] + [_applied_path(root, season)]:
+            path.unlink(missing_ok=True)
+        for kind in ("shots", "team_matches", "player_matches"):
+            # Uncached: the memoized readers are keyed on the version this rebuild changes
+            _update(season, kind, get_source().read(kind, season), root)
+
+
+def table(name, season, root=None):
+    """A season's aggregate table, built from the stored frames the first time."""
+    root = root or DEFAULT_DIR
+    if name not in TABLES:
+        raise ValueError(f"Unknown aggregate table: {name}")
+    path = _path(root, name, season)
+    if not path.exists():
+        rebuild(season, root)
+    return pd.read_parquet(path)
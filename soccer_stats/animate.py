@@ -0,0 +1,82 @@
+"""Animated match-by-match shot heatmap with cross-fades between games."""
+import matplotlib.pyplot as plt
+import seaborn as sns
+from matplotlib.animation import FuncAnimation
+
+from soccer_stats import data
+from soccer_stats.archive import ShotArchive
+from soccer_stats.pitch import draw_pitch
+
+FADE_FRAMES = 5  # Number of fade transition frames between games
+
+
+def build_frames(matches, fade_frames=FADE_FRAMES):
+    # (prev_match_id, next_match_id, fade_step)
+    frame_pairs = []
+    for i in range(len(matches) - 1):
+        for step in range(fade_frames + 1):
+            frame_pairs.append((matches[i], matches[i + 1], step / fade_frames))
+    return frame_pairs
+
+
+def load_archive(season):
+    """The on-disk archive if it holds the current data for ``season``, else an in-memory one."""
+    if ShotArchive.exists():
+        archive = ShotArchive.open()
+        if archive.current(season):
+            return archive
+    return ShotArchive.from_frame(data.read_shots(season), season)
+
+
+def run(season, team, player=data.ALL_PLAYERS, save=None, interval=1200):
+    archive = load_archive(season)
+    if team not in archive.teams:
+        raise SystemExit(f"No shots for {team} in {season}.")
+    team_id = archive.teams[team]
+    player_id = None
+    if player and player != data.ALL_PLAYERS:
+        if player not in archive.players:
+            raise SystemExit(f"No shots for {player} in {season}.")
+        player_id = archive.players[player]
+
+    def match_shots(match_id):
+        # Contiguous slice of the archive, no per-frame filtering of a DataFrame
+        shots = archive.match(season, team_id, match_id)
+        if player_id is not None:
+            shots = shots[shots["player_id"] == player_id]
+        return shots
+
+    matches = [m for m in archive.team_games(season, team_id) if len(match_shots(m))]
+    if not matches:
+        raise SystemExit(f"No shots for {player if player_id is not None else team} in {season}.")
+    fixtures = data.team_fixtures(data.read_team_matches(season), team)
+    match_titles = data.match_titles(fixtures)
+
+    fig, ax = plt.subplots(figsize=(12, 8))
+
+    def update(frame):
+        ax.clear()
+        match_id_a, match_id_b, alpha_b = frame
+        alpha_a = 1.0 - alpha_b
+
+        data_a = match_shots(match_id_a)
+        data_b = match_shots(match_id_b)
+
+        draw_pitch(ax)
+
+        # Blend KDE plots
+        if len(data_a) and alpha_a > 0:
+            sns.kdeplot(x=data_a["x"], y=data_a["y"], fill=True, cmap="Reds", alpha=alpha_a, ax=ax, thresh=0.05)
+        if len(data_b) and alpha_b > 0:
+            sns.kdeplot(x=data_b["x"], y=data_b["y"], fill=True, cmap="Reds", alpha=alpha_b, ax=ax, thresh=0.05)
+
+        # Label based on the dominant game
+        info = match_titles.get(match_id_b if alpha_b >= 0.5 else match_id_a, {})
+        ax.set_title(data.match_label(info))
+
+    anim = FuncAnimation(fig, update, frames=build_frames(matches), interval=interval)
+    if save:
+        anim.save(save, writer="pillow", fps=1)
+    else:
+        plt.show()
+    return anim
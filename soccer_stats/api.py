@@ -0,0 +1,312 @@
+"""Asynchronous HTTP JSON API over the cached frames and the render cache.
+
+Endpoints (GET or HEAD; JSON unless noted)::
+
+    /seasons/<season>/teams
+    /seasons/<season>/teams/<team>/players
+    /seasons/<season>/teams/<team>/matches
+    /seasons/<season>/leaderboard?stat=xg&n=20[&team=...]
+    /seasons/<season>/shots?team=...[&player=...][&match=<game_id>][&result=Goal,SavedShot]
+    /seasons/<season>/heatmap.png?team=...[&player=...][&match=...][&result=...][&plot=Shot+Map]
+
+One asyncio loop serves every connection (HTTP/1.1 keep-alive). Frame queries
+run in a small thread pool on the memoized season frames and their encoded
+bodies are kept per request and data version (``aggregates.version``); heat maps are rendered by the worker process pool
+into the render cache. Every response carries an ETag, and a request whose
+If-None-Match matches gets an empty 304.
+"""
+import asyncio
+import functools
+import hashlib
+import json
+import math
+import re
+from concurrent.futures import ThreadPoolExecutor
+from http import HTTPStatus
+from urllib.parse import parse_qs, unquote, urlsplit
+
+from soccer_stats import aggregates, config
+from soccer_stats.render_cache import cache_key
+from soccer_stats.sources import SourceMiss
+
+LEADERBOARD_STATS = ["goals", "xg", "assists", "xa", "shots", "key_passes", "xg_chain", "xg_buildup", "minutes"]
+SHOT_COLUMNS = ["game_id", "minute", "player", "result", "xg", "x", "y", "situation"]
+PLOT_TYPES = ["Heat Map", "Shot Map"]
+MAX_HEADERS = 100
+
+
+class HTTPError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+# ------------------------ Queries (run in the thread pool) ------------------------
+def _one(query, name, default=None):
+    values = query.get(name)
+    return values[0] if values else default
+
+
+def _season(value):
+    try:
+        season = int(value)
+    except ValueError:
+        season = None
+    # Only configured seasons: anything else would be fetched, stored and memoized
+    if season not in config.SEASONS:
+        raise HTTPError(HTTPStatus.BAD_REQUEST, f"season must be one of {', '.join(map(str, config.SEASONS))}")
+    return season
+
+
+def _team_shots(season, team):
+    from soccer_stats import data, pipeline
+
+    if team is None:
+        raise HTTPError(HTTPStatus.BAD_REQUEST, "Missing team")
+    if team not in data.team_names(season):
+        raise HTTPError(HTTPStatus.NOT_FOUND, f"Unknown team: {team}")
+    return pipeline.team_slice(data.read_shots(season), team)
+
+
+def _match_id(value):
+    if value in (None, "all"):
+        return "all"
+    try:
+        return int(value)
+    except ValueError:
+        raise HTTPError(HTTPStatus.BAD_REQUEST, f"Bad match: {value}") from None
+
+
+def get_teams(season, query):
+    from soccer_stats import data
+
+    return data.team_names(season)
+
+
+def get_players(season, team, query):
+    return sorted(_team_shots(season, team)["player"].dropna().unique().tolist())
+
+
+def get_matches(season, team, query):
+    from soccer_stats import data, pipeline
+
+    _team_shots(season, team)
+    fixtures = pipeline.match_table(data.read_team_matches(season), team).sort_values("date")
+    columns = ["game_id", "opponent", "home_away", "home_goals", "away_goals", "home_xg", "away_xg"]
+    records = fixtures[columns].to_dict("records")
+    for record, date in zip(records, fixtures["date"].dt.strftime("%Y-%m-%d")):
+        record["date"] = date
+    return records
+
+
+def get_leaderboard(season, query):
+    stat = _one(query, "stat", "xg")
+    if stat not in LEADERBOARD_STATS:
+        raise HTTPError(HTTPStatus.BAD_REQUEST, f"stat must be one of {', '.join(LEADERBOARD_STATS)}")
+    try:
+        n = min(int(_one(query, "n", 20)), 500)
+    except ValueError:
+        raise HTTPError(HTTPStatus.BAD_REQUEST, "n must be an integer") from None
+    # One row per (player, club): a transferred player counts for each club they played for
+    totals = aggregates.table("player", season)
+    team = _one(query, "team")
+    if team is not None:
+        totals = totals[totals["team"] == team]
+    else:
+        totals = totals.groupby("player_id", as_index=False, sort=False).agg({"player": "last", stat: "sum"})
+    top = totals.nlargest(n, stat)
+    return [{"player_id": pid, "player": name, stat: value}
+            for pid, name, value in zip(top["player_id"].tolist(), top["player"], top[stat].tolist())]
+
+
+def get_shots(season, query):
+    from soccer_stats import pipeline
+
+    shots = _team_shots(season, _one(query, "team"))
+    player = _one(query, "player")
+    if player is not None:
+        shots = pipeline.player_slice(shots, player)
+    shots = pipeline.match_slice(shots, _match_id(_one(query, "match")))
+    if "result" in query:
+        shots = pipeline.outcome_filter(shots, _one(query, "result").split(","))
+    return shots[[c for c in SHOT_COLUMNS if c in shots.columns]].to_dict("records")
+
+
+# (path pattern, handler, query parameters the handler reads)
+ROUTES = [
+    (re.compile(r"/seasons/([^/]+)/teams"), get_teams, ()),
+    (re.compile(r"/seasons/([^/]+)/teams/([^/]+)/players"), get_players, ()),
+    (re.compile(r"/seasons/([^/]+)/teams/([^/]+)/matches"), get_matches, ()),
+    (re.compile(r"/seasons/([^/]+)/leaderboard"), get_leaderboard, ("stat", "n", "team")),
+    (re.compile(r"/seasons/([^/]+)/shots"), get_shots, ("team", "player", "match", "result")),
+]
+HEATMAP_ROUTE = re.compile(r"/seasons/([^/]+)/heatmap\.png")
+SEASON_PREFIX = re.compile(r"/seasons/([^/]+)/")
+
+
+def _etag(body, version):
+    return '"' + hashlib.sha1(f"{version}|".encode() + body).hexdigest()[:20] + '"'
+
+
+def _json_safe(value):
+    """``value`` with NaN/inf floats (missing stats) replaced by None, which encodes as null."""
+    if isinstance(value, float):
+        return value if math.isfinite(value) else None
+    if isinstance(value, dict):
+        return {k: _json_safe(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_json_safe(v) for v in value]
+    return value
+
+
+def json_response(path, query_string):
+    """(status, body, etag) for a JSON endpoint."""
+    match = SEASON_PREFIX.match(path)
+    if match is None:
+        raise HTTPError(HTTPStatus.NOT_FOUND, f"No route for {path}")
+    season = _season(unquote(match.group(1)))
+    query = parse_qs(query_string)
+    for pattern, handler, names in ROUTES:
+        match = pattern.fullmatch(path)
+        if match:
+            # Keyed on the parameters the handler reads, so extra or reordered ones share an entry
+            params = tuple((name, _one(query, name)) for name in names if name in query)
+            groups = tuple(unquote(g) for g in match.groups()[1:])
+            return _json_response(handler, groups, params, season, aggregates.version(season))
+    raise HTTPError(HTTPStatus.NOT_FOUND, f"No route for {path}")
+
+
+@functools.lru_cache(maxsize=2048)
+def _json_response(handler, groups, params, season, version):
+    # Frames only change with the data version, so bodies are memoized per request and version
+    try:
+        payload = handler(season, *groups, {name: [value] for name, value in params})
+    except SourceMiss as exc:
+        raise HTTPError(HTTPStatus.NOT_FOUND, str(exc)) from None
+    body = json.dumps(_json_safe(payload), default=str, allow_nan=False).encode()
+    return HTTPStatus.OK, body, _etag(body, version)
+
+
+# ------------------------ Server ------------------------
+class StatsAPI:
+    def __init__(self, workers=None, threads=4):
+        self.workers = workers
+        self.threads = ThreadPoolExecutor(threads, thread_name_prefix="api")
+        self._pool = None
+
+    @property
+    def pool(self):
+        # Started on the first render, so JSON-only use never spawns workers
+        if self._pool is None:
+            from soccer_stats.workers import get_pool
+
+            self._pool = get_pool(self.workers)
+        return self._pool
+
+    async def _in_thread(self, func, *args):
+        return await asyncio.get_running_loop().run_in_executor(self.threads, func, *args)
+
+    async def heatmap(self, season, query, if_none_match):
+        from soccer_stats.data import ALL_PLAYERS
+        from soccer_stats.workers import ComputePool
+
+        season = _season(season)
+        team = _one(query, "team")
+        await self._in_thread(_team_shots, season, team)
+        plot_type = _one(query, "plot", "Heat Map")
+        if plot_type not in PLOT_TYPES:
+            raise HTTPError(HTTPStatus.BAD_REQUEST, f"plot must be one of {', '.join(PLOT_TYPES)}")
+        result = _one(query, "result")
+        params = ComputePool.render_params(
+            season=season, team=team, player=_one(query, "player", ALL_PLAYERS),
+            match_id=_match_id(_one(query, "match")), outcomes=result.split(",") if result else None,
+            plot_type=plot_type)
+        # The render cache key already identifies the image, so it doubles as the ETag
+        key = cache_key("render_shots", params)
+        etag = f'"{key[:20]}"'
+        if if_none_match == etag:
+            return HTTPStatus.NOT_MODIFIED, b"", etag
+        body = await self._in_thread(self.pool.cache.get, key)
+        if body is None:
+            await asyncio.wrap_future(self.pool.submit("render_shots", **params))
+            body = await self._in_thread(self.pool.cache.get, key)
+        return HTTPStatus.OK, body, etag
+
+    async def respond(self, method, target, headers):
+        """(status, content type, body, etag) for one request."""
+        if method not in ("GET", "HEAD"):
+            raise HTTPError(HTTPStatus.METHOD_NOT_ALLOWED, "Only GET and HEAD are supported")
+        url = urlsplit(target)
+        path = url.path.rstrip("/") or "/"
+        match = HEATMAP_ROUTE.fullmatch(path)
+        if match:
+            status, body, etag = await self.heatmap(unquote(match.group(1)), parse_qs(url.query),
+                                                    headers.get("if-none-match"))
+            return status, "image/png", body, etag
+        status, body, etag = await self._in_thread(json_response, path, url.query)
+        if headers.get("if-none-match") == etag:
+            return HTTPStatus.NOT_MODIFIED, "application/json", b"", etag
+        return status, "application/json", body, etag
+
+    async def handle(self, reader, writer):
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line.strip():
+                    break
+                method, target, version = request_line.decode("latin-1").split()
+                headers = {}
+                for _ in range(MAX_HEADERS):
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+
+                try:
+                    status, content_type, body, etag = await self.respond(method, target, headers)
+                except HTTPError as exc:
+                    status, content_type, etag = exc.status, "application/json", None
+                    body = json.dumps({"error": str(exc)}).encode()
+                except Exception as exc:  # keep serving other requests
+                    status, content_type, etag = HTTPStatus.INTERNAL_SERVER_ERROR, "application/json", None
+                    body = json.dumps({"error": f"{type(exc).__name__}: {exc}"}).encode()
+
+                keep_alive = version == "HTTP/1.1" and headers.get("connection", "").lower() != "close"
+                head = [f"HTTP/1.1 {status.value} {status.phrase}",
+                        f"Content-Type: {content_type}",
+                        f"Content-Length: {len(body)}",
+                        f"Connection: {'keep-alive' if keep_alive else 'close'}"]
+                if etag:
+                    head += [f"ETag: {etag}", "Cache-Control: no-cache"]
+                writer.write(("\r\n".join(head) + "\r\n\r\n").encode("latin-1"))
+                if method != "HEAD":
+                    writer.write(body)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, ValueError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def serve(self, host="127.0.0.1", port=8000):
+        server = await asyncio.start_server(self.handle, host, port, backlog=1024)
+        print(f"Serving the stats API on http://{host}:{port}")
+        async with server:
+            await server.serve_forever()
+
+    def close(self):
+        self.threads.shutdown(wait=False)
+        if self._pool is not None:
+            self._pool.shutdown()
+
+
+def serve(host="127.0.0.1", port=8000, workers=None, threads=4):
+    api = StatsAPI(workers, threads)
+    try:
+        asyncio.run(api.serve(host, port))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        api.close()
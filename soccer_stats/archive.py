@@ -0,0 +1,155 @@
+"""Memory-mapped multi-season shot archive.
+
+Shots are stored as one NumPy structured array sorted by
+(season, team_id, game_id), with a companion ``keys``/``offsets`` index, so
+every match's shots for a team are a contiguous slice found by a dict
+lookup and pointer arithmetic. On disk the records are a flat binary file
+opened with ``np.memmap``; seasons are appended one at a time, so neither
+building nor opening the archive needs the whole history in RAM.
+Each season is stamped with the ``aggregates.version`` it was built from,
+so readers can tell when an ingest has left it behind.
+"""
+import functools
+import json
+
+import numpy as np
+
+from soccer_stats import aggregates, config
+
+SHOT_DTYPE = np.dtype([
+    ("season", "i4"), ("team_id", "i4"), ("game_id", "i4"), ("player_id", "i4"),
+    ("minute", "i2"), ("result", "i1"),
+    ("x", "f4"), ("y", "f4"), ("xg", "f4"),
+])
+RESULTS = ["Goal", "SavedShot", "MissedShots", "BlockedShot", "ShotOnPost", "OwnGoal"]
+KEY_DTYPE = np.dtype([("season", "i4"), ("team_id", "i4"), ("game_id", "i4")])
+
+DEFAULT_DIR = config.STORE_DIR / "archive"
+
+
+def to_records(shots, season):
+    """Sorted structured array for one season of soccerdata shot events."""
+    records = np.empty(len(shots), dtype=SHOT_DTYPE)
+    records["season"] = int(season)
+    records["team_id"] = shots["team_id"].to_numpy()
+    records["game_id"] = shots["game_id"].to_numpy()
+    records["player_id"] = shots["player_id"].fillna(-1).to_numpy()
+    records["minute"] = shots["minute"].fillna(0).to_numpy()
+    records["result"] = shots["result"].map({r: i for i, r in enumerate(RESULTS)}).fillna(-1).to_numpy()
+    records["x"] = shots["x"].to_numpy(dtype=np.float32)
+    records["y"] = shots["y"].to_numpy(dtype=np.float32)
+    records["xg"] = shots["xg"].to_numpy(dtype=np.float32)
+    order = np.lexsort((records["minute"], records["game_id"], records["team_id"]))
+    return records[order]
+
+
+def build_index(records):
+    """Unique (season, team_id, game_id) keys and start offsets (plus end sentinel)."""
+    if len(records) == 0:
+        return np.empty(0, KEY_DTYPE), np.zeros(1, np.int64)
+    key_cols = np.stack([records["season"], records["team_id"], records["game_id"]], axis=1)
+    change = np.r_[True, np.any(key_cols[1:] != key_cols[:-1], axis=1)]
+    starts = np.flatnonzero(change)
+    keys = np.empty(len(starts), KEY_DTYPE)
+    for name in KEY_DTYPE.names:
+        keys[name] = records[name][starts]
+    return keys, np.r_[starts, len(records)].astype(np.int64)
+
+
+class ShotArchive:
+    def __init__(self, records, keys, offsets, teams=None, players=None, versions=None):
+        self.records = records
+        self.keys = keys
+        self.offsets = offsets
+        self.teams = teams or {}        # team name -> team_id
+        self.players = players or {}    # player name -> player_id
+        self.versions = versions or {}  # season -> data version it was built from
+        self._lookup = {tuple(int(v) for v in k): i for i, k in enumerate(keys.tolist())}
+        self._season_team = keys["season"].astype(np.int64) << 32 | keys["team_id"].astype(np.int64)
+
+    # ------------------------ Building ------------------------
+    @classmethod
+    def from_frame(cls, shots, season):
+        """In-memory archive for one season's shot frame."""
+        records = to_records(shots, season)
+        keys, offsets = build_index(records)
+        return cls(records, keys, offsets, _names(shots, "team"), _names(shots, "player"))
+
+    @staticmethod
+    def build(seasons, read_shots, root=DEFAULT_DIR):
+        """Write an archive for ``seasons``, loading one season at a time."""
+        root.mkdir(parents=True, exist_ok=True)
+        all_keys, all_offsets, teams, players, versions = [], [], {}, {}, {}
+        written = 0
+        with open(root / "shots.bin", "wb") as fh:
+            for season in sorted(seasons):
+                # Stamped before the read, so an ingest racing the build leaves it stale, not current
+                versions[str(season)] = aggregates.version(season)
+                shots = read_shots(season)
+                records = to_records(shots, season)
+                keys, offsets = build_index(records)
+                records.tofile(fh)
+                all_keys.append(keys)
+                all_offsets.append(offsets[:-1] + written)
+                written += len(records)
+                teams.update(_names(shots, "team"))
+                players.update(_names(shots, "player"))
+        np.save(root / "keys.npy", np.concatenate(all_keys) if all_keys else np.empty(0, KEY_DTYPE))
+        np.save(root / "offsets.npy", np.r_[np.concatenate(all_offsets) if all_offsets else [], written].astype(np.int64))
+        (root / "names.json").write_text(json.dumps({"teams": teams, "players": players, "versions": versions}))
+        return root
+
+    @classmethod
+    def open(cls, root=DEFAULT_DIR):
+        """Open an archive written by ``build`` without reading the records into RAM."""
+        offsets = np.load(root / "offsets.npy")
+        if offsets[-1] > 0:
+            records = np.memmap(root / "shots.bin", dtype=SHOT_DTYPE, mode="r", shape=(int(offsets[-1]),))
+        else:
+            records = np.empty(0, SHOT_DTYPE)
+        names = json.loads((root / "names.json").read_text())
+        versions = {int(season): v for season, v in names.get("versions", {}).items()}
+        return cls(records, np.load(root / "keys.npy"), offsets, names["teams"], names["players"], versions)
+
+    @staticmethod
+    def exists(root=DEFAULT_DIR):
+        return (root / "offsets.npy").exists()
+
+    def current(self, season):
+        """Whether ``season`` is in the archive and built from the season's current data."""
+        return self.versions.get(int(season)) == aggregates.version(int(season))
+
+    # ------------------------ Access ------------------------
+    def match(self, season, team_id, game_id):
+        """Shots of one team in one match: a contiguous (memory-mapped) slice."""
+        i = self._lookup.get((int(season), int(team_id), int(game_id)))
+        if i is None:
+            return self.records[0:0]
+        return self.records[self.offsets[i]:self.offsets[i + 1]]
+
+    def _team_key_range(self, season, team_id):
+        target = int(season) << 32 | int(team_id)
+        return (np.searchsorted(self._season_team, target, "left"),
+                np.searchsorted(self._season_team, target, "right"))
+
+    def team_games(self, season, team_id):
+        """game_ids the team has shots in, in archive (game_id) order."""
+        lo, hi = self._team_key_range(season, team_id)
+        return self.keys["game_id"][lo:hi].tolist()
+
+    def team_season(self, season, team_id):
+        lo, hi = self._team_key_range(season, team_id)
+        return self.records[self.offsets[lo]:self.offsets[hi]]
+
+
+def _names(shots, column):
+    pairs = shots[[column, f"{column}_id"]].dropna().drop_duplicates(column)
+    return {str(name): int(i) for name, i in zip(pairs[column], pairs[f"{column}_id"])}
+
+
+def run(seasons, root=None):
+    from soccer_stats.sources import get_source
+
+    # Straight from the source: data.read_shots would keep every season memoized
+    path = ShotArchive.build(seasons, functools.partial(get_source().read, "shots"), root or DEFAULT_DIR)
+    print(f"Saved {path}")
@@ -0,0 +1,137 @@
+"""Bootstrap confidence intervals for finishing and per-90 metrics.
+
+Matches are the resampling unit: every player (and team) season is
+resampled by drawing its matches with replacement. Groups with the same
+number of matches share one ``(n_boot, n_matches)`` matrix of multinomial
+draw counts, so a whole bucket's resampled totals are a single matmul
+instead of a Python loop per player. Players are grouped per (player, club),
+so a mid-season transfer gets an interval for each club. Seasons run in
+parallel worker processes and results are cached as Parquet per season and
+data version.
+"""
+import os
+import warnings
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from soccer_stats import aggregates, config
+
+DEFAULT_DIR = config.STORE_DIR
+SUMS = ["goals", "xg", "xa", "shots", "minutes"]
+METRICS = ["goals_minus_xg", "conversion", "goals_90", "xg_90", "xa_90", "shots_90"]
+N_BOOT = 2000
+CI = 0.95
+
+
+def metrics(totals):
+    """METRICS from summed ``SUMS`` (last axis, in SUMS order)."""
+    goals, xg, xa, shots, minutes = np.moveaxis(totals, -1, 0)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        per90 = 90 / np.where(minutes > 0, minutes, np.nan)
+        conversion = np.where(shots > 0, goals / shots, np.nan)
+    return np.stack([goals - xg, conversion, goals * per90, xg * per90, xa * per90, shots * per90], axis=-1)
+
+
+def bootstrap_groups(units, key, n_boot=N_BOOT, ci=CI, seed=0):
+    """Point estimates and CIs of METRICS per ``key`` group (a column or list of columns) of match rows.
+
+    Returns one row per group with ``<metric>``, ``<metric>_lo`` and ``<metric>_hi``.
+    """
+    rng = np.random.default_rng(seed)
+    keys = [key] if isinstance(key, str) else list(key)
+    units = units.sort_values(keys, kind="stable")
+    # Sorted, so each group's rows are contiguous and numbered in order
+    codes = units.groupby(keys, sort=False).ngroup().to_numpy()
+    groups = units.loc[np.r_[True, codes[1:] != codes[:-1]], keys].reset_index(drop=True)
+    values = units[SUMS].to_numpy(np.float64)
+    sizes = np.bincount(codes)
+    starts = np.r_[0, np.cumsum(sizes)[:-1]]
+
+    point = metrics(np.add.reduceat(values, starts, axis=0))
+    lo, hi = np.full_like(point, np.nan), np.full_like(point, np.nan)
+    q = [(1 - ci) / 2 * 100, (1 + ci) / 2 * 100]
+    for size in np.unique(sizes):
+        members = np.flatnonzero(sizes == size)
+        # (groups, matches, sums) block for every group with ``size`` matches
+        block = values[starts[members][:, None] + np.arange(size)]
+        counts = rng.multinomial(size, np.full(size, 1 / size), n_boot).astype(np.float64)
+        samples = metrics(np.matmul(counts, block))  # (groups, n_boot, metrics)
+        with warnings.catch_warnings():
+            # Groups without a single shot have no conversion rate
+            warnings.simplefilter("ignore", RuntimeWarning)
+            lo[members], hi[members] = np.nanpercentile(samples, q, axis=1)
+
+    out = groups.assign(matches=sizes)
+    for i, name in enumerate(METRICS):
+        out[name], out[f"{name}_lo"], out[f"{name}_hi"] = point[:, i], lo[:, i], hi[:, i]
+    return out
+
+
+def team_units(player_matches):
+    """Team-match rows; a team match counts as 90 minutes, so per-90 means per match."""
+    units = player_matches.groupby(["team", "game_id"], sort=False)[SUMS[:-1]].sum().reset_index()
+    units["minutes"] = 90
+    return units
+
+
+def compute_season(player_matches, n_boot=N_BOOT, seed=0):
+    """``{"players": ..., "teams": ...}`` interval tables for one season of player match stats."""
+    played = player_matches[player_matches["minutes"] > 0]
+    players = bootstrap_groups(played, ["player_id", "team"], n_boot, seed=seed)
+    labels = played.groupby(["player_id", "team"], sort=False)["player"].last()
+    players = labels.reset_index().merge(players, on=["player_id", "team"])
+    teams = bootstrap_groups(team_units(played), "team", n_boot, seed=seed + 1)
+    return {"players": players, "teams": teams}
+
+
+def _path(season, part, root=DEFAULT_DIR):
+    # Keyed on the data version, so ingest invalidates it
+    return aggregates.derived_path(root, f"bootstrap_{part}", season)
+
+
+def _season_job(args):
+    season, n_boot, root = args
+    from soccer_stats import data
+
+    tables = compute_season(data.read_player_matches(season), n_boot, seed=int(season))
+    root.mkdir(parents=True, exist_ok=True)
+    for part, table in tables.items():
+        path = _path(season, part, root)
+        tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        table.to_parquet(tmp, index=False)
+        tmp.replace(path)
+        aggregates.prune_derived(path)
+    return season
+
+
+def build(seasons, n_boot=N_BOOT, workers=None, root=DEFAULT_DIR):
+    """Compute and cache every season, one worker process per season."""
+    jobs = [(season, n_boot, root) for season in seasons]
+    if workers == 1 or len(jobs) < 2:
+        return [_season_job(job) for job in jobs]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(_season_job, jobs))
+
+
+def load_season(season, root=DEFAULT_DIR):
+    """Cached interval tables for a season, (re)computed when missing or stale."""
+    if not _path(season, "teams", root).exists():
+        _season_job((season, N_BOOT, root))
+    return {part: pd.read_parquet(_path(season, part, root)) for part in ("players", "teams")}
+
+
+def run(seasons, n_boot=N_BOOT, workers=None, top=15, metric="goals_minus_xg", min_matches=10):
+    import time
+
+    start = time.perf_counter()
+    build(seasons, n_boot, workers)
+    print(f"Bootstrapped {len(seasons)} season(s) in {time.perf_counter() - start:.2f}s")
+    for season in seasons:
+        players = load_season(season)["players"]
+        players = players[players["matches"] >= min_matches].nlargest(top, metric)
+        print(f"\n{season}: {metric} with {CI:.0%} intervals")
+        for _, row in players.iterrows():
+            print(f"  {row['player']:<28} {row['team']:<24} {row[metric]:+7.2f} "
+                  f"[{row[f'{metric}_lo']:+.2f}, {row[f'{metric}_hi']:+.2f}]")
@@ -0,0 +1,273 @@
+"""Command line entry point: ``soccer-stats <command>``.
+
+Commands: heatmap, animate, positions, compare, similar, profile, styles, h2h,
+timeline, bootstrap, archive, build-site, api, ingest, raw-cache, replay. Only argparse is imported up front; each command
+imports its plotting and data dependencies when it runs, so ``--help`` and
+the selection windows come up quickly.
+"""
+import argparse
+from pathlib import Path
+
+from soccer_stats import config
+
+
+def _match_id(value):
+    return value if value == "all" else int(value)
+
+
+def _ask(args, with_player=True, with_match=False, title="Select"):
+    """Fill in missing season/team/player/match choices from the Tk window."""
+    if args.team is not None:
+        return
+    from soccer_stats.dialog import choose
+
+    choices = choose(season=args.season, team=config.DEFAULT_TEAM, with_player=with_player, with_match=with_match, title=title)
+    if not choices:
+        raise SystemExit("No selection made.")
+    for key, value in choices.items():
+        setattr(args, key, value)
+
+
+def cmd_heatmap(args):
+    _ask(args, with_match=True, title="Select Season, Team, Player, and Match")
+    if args.match_id is None:
+        raise SystemExit("Selected match not found.")
+    from soccer_stats import heatmap
+
+    heatmap.run(args.season, args.team, args.player, args.match_id)
+
+
+def cmd_animate(args):
+    _ask(args, title="Select Season, Team, and Player")
+    from soccer_stats import animate
+
+    animate.run(args.season, args.team, args.player, save=args.save)
+
+
+def cmd_positions(args):
+    from soccer_stats import positions
+
+    positions.run(args.season, args.player, args.team, args.squad, args.league, args.out, args.workers)
+
+
+def cmd_ingest(args):
+    from soccer_stats import ingest
+    from soccer_stats.sources import get_source
+
+    # Ingest always reads from the network side: live Understat or the replay server
+    source = get_source("replay") if args.source == "replay" else None
+    print(f"Saved {ingest.run(args.season, args.out, source)}")
+
+
+def cmd_compare(args):
+    from soccer_stats import multiples
+
+    multiples.run(args.season, args.by, args.items, args.team, args.kind, args.ncols, args.out, args.workers)
+
+
+def cmd_similar(args):
+    from soccer_stats import similarity
+
+    similarity.run(args.season, args.player, args.k, args.position)
+
+
+def cmd_profile(args):
+    from soccer_stats import percentiles
+
+    percentiles.run(args.season, args.player, args.team, args.league, args.out, args.workers)
+
+
+def cmd_styles(args):
+    from soccer_stats import styles
+
+    styles.run(args.seasons or [args.season], args.k, args.window, Path(args.out) if args.out else None)
+
+
+def cmd_archive(args):
+    from soccer_stats import archive
+
+    archive.run(args.seasons, Path(args.dir) if args.dir else None)
+
+
+def cmd_build_site(args):
+    from soccer_stats import site
+
+    site.run(args.seasons, args.out, args.format, args.workers)
+
+
+def cmd_h2h(args):
+    from soccer_stats import fixtures
+
+    fixtures.run(args.seasons or [args.season], args.team, args.opponent)
+
+
+def cmd_timeline(args):
+    from soccer_stats import timeline
+
+    timeline.run(args.season, args.game_id, args.out)
+
+
+def cmd_bootstrap(args):
+    from soccer_stats import bootstrap
+
+    bootstrap.run(args.seasons or [args.season], args.n_boot, args.workers, metric=args.metric)
+
+
+def cmd_api(args):
+    from soccer_stats import api
+
+    api.serve(args.host, args.port, args.workers, args.threads)
+
+
+def cmd_raw_cache(args):
+    from soccer_stats import rawcache
+
+    rawcache.run(clear=args.clear)
+
+
+def cmd_replay(args):
+    from soccer_stats import replay
+
+    replay.serve(Path(args.dir) if args.dir else None, args.host, args.port, record=args.record)
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="soccer-stats", description="Understat shot and player visualizations.")
+    parser.add_argument("--source", choices=["local", "live", "replay"],
+                        help="Data source (default: local store, live Understat on a miss)")
+    parser.add_argument("--offline", action="store_true", help="Never fall back to the network")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    def add_selection(p, with_match=False):
+        p.add_argument("--season", type=int, default=config.DEFAULT_SEASON)
+        p.add_argument("--team", help="Team name; opens a selection window when omitted")
+        p.add_argument("--player", default="(All Players)")
+        if with_match:
+            p.add_argument("--match", dest="match_id", type=_match_id, default="all",
+                           help="Understat game_id, or 'all' for the whole season")
+
+    p = sub.add_parser("heatmap", help="Shot heatmap for a team/player/match")
+    add_selection(p, with_match=True)
+    p.set_defaults(func=cmd_heatmap)
+
+    p = sub.add_parser("animate", help="Animated match-by-match heatmap")
+    add_selection(p)
+    p.add_argument("--save", help="Write a GIF instead of opening a window")
+    p.set_defaults(func=cmd_animate)
+
+    p = sub.add_parser("positions", help="Positional usage map for a player, squad or league")
+    p.add_argument("--season", type=int, default=config.DEFAULT_SEASON)
+    p.add_argument("--player", help="Player name; shows sample data when omitted")
+    p.add_argument("--team")
+    p.add_argument("--squad", action="store_true", help="Every player of --team in one sheet")
+    p.add_argument("--league", action="store_true", help="A squad sheet per team, written to --out")
+    p.add_argument("--out", help="Image file (folder with --league) instead of opening a window")
+    p.add_argument("--workers", type=int, help="Render processes for --league (default: CPU count)")
+    p.set_defaults(func=cmd_positions)
+
+    p = sub.add_parser("ingest", help="Download stats into the local store and CSV exports")
+    p.add_argument("--season", type=int, default=config.DEFAULT_SEASON)
+    p.add_argument("--out", help="Folder for the CSV exports (default: data folder)")
+    p.set_defaults(func=cmd_ingest)
+
+    p = sub.add_parser("compare", help="Small-multiples grid of teams, players or matches")
+    p.add_argument("--season", type=int, default=config.DEFAULT_SEASON)
+    p.add_argument("--by", choices=["team", "player", "match"], default="team")
+    p.add_argument("items", nargs="*", help="Teams, players or game_ids (default: all)")
+    p.add_argument("--team", help="Restrict players to a team; required for --by match")
+    p.add_argument("--kind", choices=["heatmap", "shots"], default="heatmap")
+    p.add_argument("--ncols", type=int, default=5)
+    p.add_argument("--workers", type=int, help="Density worker processes (default: CPU count)")
+    p.add_argument("--out", help="Save to an image file instead of opening a window")
+    p.set_defaults(func=cmd_compare)
+
+    p = sub.add_parser("similar", help="Players with the most similar per-90 profile")
+    p.add_argument("player")
+    p.add_argument("--season", type=int, default=config.DEFAULT_SEASON)
+    p.add_argument("-k", type=int, default=10)
+    p.add_argument("--position", help="Understat position code or group (GK/DEF/MID/FWD)")
+    p.set_defaults(func=cmd_similar)
+
+    p = sub.add_parser("profile", help="Per-90 percentile pizza chart for a player, squad or league")
+    p.add_argument("player", nargs="?", help="Player name or id")
+    p.add_argument("--season", type=int, default=config.DEFAULT_SEASON)
+    p.add_argument("--team", help="Squad sheet for a team (or disambiguates the player)")
+    p.add_argument("--league", action="store_true", help="One sheet per team, rendered in parallel")
+    p.add_argument("--out", help="Image file (folder with --league) instead of opening a window")
+    p.add_argument("--workers", type=int, help="Worker processes for --league (default: CPU count)")
+    p.set_defaults(func=cmd_profile)
+
+    p = sub.add_parser("styles", help="Cluster team-matches into playing styles")
+    p.add_argument("--season", type=int, default=config.DEFAULT_SEASON)
+    p.add_argument("--seasons", type=int, nargs="*", help="Several seasons, processed one at a time")
+    p.add_argument("-k", type=int, default=6, help="Number of style clusters")
+    p.add_argument("--window", type=int, default=5, help="Rolling window in matches")
+    p.add_argument("--out", help="Parquet output (default: store/team_styles.parquet)")
+    p.set_defaults(func=cmd_styles)
+
+    p = sub.add_parser("archive", help="Build the memory-mapped shot archive")
+    p.add_argument("seasons", type=int, nargs="+")
+    p.add_argument("--dir", help="Output folder (default: store/archive)")
+    p.set_defaults(func=cmd_archive)
+
+    p = sub.add_parser("build-site", help="Render a static dashboard site")
+    p.add_argument("seasons", type=int, nargs="+")
+    p.add_argument("--out", default="site")
+    p.add_argument("--format", choices=["png", "svg"], default="png")
+    p.add_argument("--workers", type=int, help="Render processes (default: CPU count)")
+    p.set_defaults(func=cmd_build_site)
+
+    p = sub.add_parser("h2h", help="Head-to-head history between two teams")
+    p.add_argument("team")
+    p.add_argument("opponent")
+    p.add_argument("--season", type=int, default=config.DEFAULT_SEASON)
+    p.add_argument("--seasons", type=int, nargs="*")
+    p.set_defaults(func=cmd_h2h)
+
+    p = sub.add_parser("timeline", help="Cumulative xG race chart for a match")
+    p.add_argument("game_id", type=int, nargs="?", help="Understat game_id; only builds the season when omitted")
+    p.add_argument("--season", type=int, default=config.DEFAULT_SEASON)
+    p.add_argument("--out", help="Save to an image file instead of opening a window")
+    p.set_defaults(func=cmd_timeline)
+
+    p = sub.add_parser("bootstrap", help="Bootstrap confidence intervals for finishing metrics")
+    p.add_argument("--season", type=int, default=config.DEFAULT_SEASON)
+    p.add_argument("--seasons", type=int, nargs="*", help="Several seasons, one worker process each")
+    p.add_argument("--n-boot", type=int, default=2000, help="Resamples per player")
+    p.add_argument("--metric", default="goals_minus_xg",
+                   choices=["goals_minus_xg", "conversion", "goals_90", "xg_90", "xa_90", "shots_90"])
+    p.add_argument("--workers", type=int, help="Worker processes (default: CPU count)")
+    p.set_defaults(func=cmd_bootstrap)
+
+    p = sub.add_parser("api", help="Serve stats and rendered plots over HTTP")
+    p.add_argument("--host", default="127.0.0.1")
+    p.add_argument("--port", type=int, default=8000)
+    p.add_argument("--workers", type=int, help="Render processes (default: CPU count)")
+    p.add_argument("--threads", type=int, default=4, help="Threads for frame queries")
+    p.set_defaults(func=cmd_api)
+
+    p = sub.add_parser("raw-cache", help="Show (or clear) the raw Understat page cache")
+    p.add_argument("--clear", action="store_true")
+    p.set_defaults(func=cmd_raw_cache)
+
+    p = sub.add_parser("replay", help="Serve recorded Understat pages locally")
+    p.add_argument("--dir", help="Recorded pages folder (default: cache/replay)")
+    p.add_argument("--host", default="127.0.0.1")
+    p.add_argument("--port", type=int, default=8765)
+    p.add_argument("--record", action="store_true", help="Fetch and save pages that are not recorded yet")
+    p.set_defaults(func=cmd_replay)
+
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    if args.source:
+        config.SOURCE = args.source
+    if args.offline:
+        config.OFFLINE = True
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
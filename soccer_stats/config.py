@@ -0,0 +1,36 @@
+"""Project-wide settings."""
+import os
+from pathlib import Path
+
+LEAGUE = "ENG-Premier League"
+SEASONS = [2023, 2024, 2025]
+DEFAULT_SEASON = 2024
+DEFAULT_TEAM = "Arsenal"
+
+# Folder holding the shipped CSV exports
+DATA_DIR = Path(os.environ.get("SOCCER_STATS_DATA", Path(__file__).resolve().parent.parent))
+
+# Small derived files (team lists etc.) that make startup fast
+CACHE_DIR = Path(os.environ.get("SOCCER_STATS_CACHE", Path.home() / ".cache" / "soccer_stats"))
+
+# Parquet frames written by ingest / the live fallback ("local" source)
+STORE_DIR = Path(os.environ.get("SOCCER_STATS_STORE", CACHE_DIR / "store"))
+
+# Data source used by the apps: "local" (store, network on miss), "live" or "replay"
+SOURCE = os.environ.get("SOCCER_STATS_SOURCE", "local")
+# Set to 1 to never fall back to the network from the local store
+OFFLINE = os.environ.get("SOCCER_STATS_OFFLINE", "0") == "1"
+
+# Raw Understat responses (see soccer_stats.rawcache): location and size budget
+RAW_CACHE_DIR = Path(os.environ.get("SOCCER_STATS_RAW_CACHE", CACHE_DIR / "raw"))
+RAW_CACHE_MAX_MB = int(os.environ.get("SOCCER_STATS_RAW_CACHE_MB", "512"))
+# Season still being played: its raw pages expire hourly, finished seasons' never do
+CURRENT_SEASON = int(os.environ.get("SOCCER_STATS_CURRENT_SEASON", max(SEASONS)))
+
+# Rendered plot images (see soccer_stats.render_cache): size budget
+RENDER_CACHE_MAX_MB = int(os.environ.get("SOCCER_STATS_RENDER_CACHE_MB", "256"))
+
+# Local HTTP stand-in for understat.com (see soccer_stats.replay)
+UNDERSTAT_URL = "https://understat.com"
+REPLAY_DIR = Path(os.environ.get("SOCCER_STATS_REPLAY_DIR", CACHE_DIR / "replay"))
+REPLAY_URL = os.environ.get("SOCCER_STATS_REPLAY_URL", "http://127.0.0.1:8765")
@@ -0,0 +1,87 @@
+"""Understat data access shared by the scripts.
+
+Heavy imports (soccerdata, pandas) happen here, so the CLI only pays for them
+once a command actually needs data. Frames come from the configured data
+source (see soccer_stats.sources), are memoized per season and data version
+(``aggregates.version``, bumped by ingest) and must not be mutated by callers.
+"""
+import functools
+import json
+
+from soccer_stats import aggregates, config
+from soccer_stats.sources import get_source
+
+ALL_PLAYERS = "(All Players)"
+
+
+@functools.lru_cache(maxsize=12)
+def _read(kind, season, version):
+    return get_source().read(kind, season)
+
+
+def read_shots(season):
+    return _read("shots", season, aggregates.version(season))
+
+
+def read_team_matches(season):
+    return _read("team_matches", season, aggregates.version(season))
+
+
+def read_player_matches(season):
+    return _read("player_matches", season, aggregates.version(season))
+
+
+# ------------------------ Cached team list ------------------------
+def _teams_cache_path(season):
+    return config.CACHE_DIR / f"teams_{season}.json"
+
+
+def save_team_names(season, teams):
+    path = _teams_cache_path(season)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(sorted(teams)))
+
+
+def team_names(season):
+    """Sorted team names for a season, read from the on-disk cache when possible."""
+    path = _teams_cache_path(season)
+    if path.exists():
+        return json.loads(path.read_text())
+    teams = sorted(read_shots(season)["team"].unique().tolist())
+    save_team_names(season, teams)
+    return teams
+
+
+def team_players(season, team):
+    shots = read_shots(season)
+    players = sorted(shots.loc[shots["team"] == team, "player"].dropna().unique().tolist())
+    return [ALL_PLAYERS] + players
+
+
+# ------------------------ Match helpers ------------------------
+def team_fixtures(matches, team):
+    """Rows of ``matches`` involving ``team`` with opponent and home/away columns."""
+    fixtures = matches[(matches["home_team"] == team) | (matches["away_team"] == team)].copy()
+    is_home = fixtures["home_team"] == team
+    fixtures["opponent"] = fixtures["away_team_code"].where(is_home, fixtures["home_team_code"])
+    fixtures["home_away"] = is_home.map({True: "Home", False: "Away"})
+    return fixtures
+
+
+def match_titles(fixtures):
+    return fixtures.set_index("game_id")[["date", "opponent", "home_away"]].to_dict("index")
+
+
+def match_label(info):
+    return f"{info.get('date', 'Unknown')} – vs {info.get('opponent', '?')} ({info.get('home_away', '?')})"
+
+
+def select_shots(season, team, player=ALL_PLAYERS, match_id="all"):
+    """Shots for a team (and optionally player / match)."""
+    shots = read_shots(season)
+    mask = shots["team"] == team
+    if player and player != ALL_PLAYERS:
+        mask &= shots["player"] == player
+    if match_id != "all":
+        mask &= shots["game_id"] == match_id
+    return shots[mask]
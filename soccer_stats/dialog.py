@@ -0,0 +1,97 @@
+"""Tk selection window used by the heatmap and animate commands.
+
+The window is drawn from the cached team list; players and matches are filled
+in once the window is on screen, so it appears without waiting on the network.
+"""
+import tkinter as tk
+from tkinter import ttk, messagebox
+
+from soccer_stats import config
+
+
+def build_dialog(season=None, team=None, with_player=True, with_match=False, title="Select"):
+    """Build (but do not run) the selection window.
+
+    Returns ``(root, choices)``; ``choices`` is filled in when the user submits.
+    """
+    choices = {}
+    match_id_map = {}
+
+    root = tk.Tk()
+    root.title(title)
+
+    def add_combo(row, label, values=()):
+        tk.Label(root, text=label).grid(row=row, column=0, padx=10, pady=10, sticky="w")
+        var = tk.StringVar()
+        combo = ttk.Combobox(root, textvariable=var, values=list(values), state="readonly")
+        combo.grid(row=row, column=1, padx=10, pady=10)
+        return var, combo
+
+    season_var, season_combo = add_combo(0, "Select a season:", [str(s) for s in config.SEASONS])
+    season_combo.set(str(season or config.DEFAULT_SEASON))
+    team_var, team_combo = add_combo(1, "Select a team:")
+    player_var, player_combo = add_combo(2, "Select a player (or all):") if with_player else (None, None)
+    match_var, match_combo = add_combo(3, "Select a match:") if with_match else (None, None)
+
+    def update_players(event=None):
+        from soccer_stats import data
+
+        season_selected, team_selected = season_var.get(), team_var.get()
+        if not (season_selected and team_selected):
+            return
+        try:
+            if player_combo is not None:
+                players = data.team_players(season_selected, team_selected)
+                player_combo["values"] = players
+                player_combo.set(players[0])
+            if match_combo is not None:
+                shots = data.read_shots(season_selected)
+                played = set(shots.loc[shots["team"] == team_selected, "game_id"])
+                fixtures = data.team_fixtures(data.read_team_matches(season_selected), team_selected)
+                match_id_map.clear()
+                for mid, info in data.match_titles(fixtures).items():
+                    if mid in played:
+                        match_id_map[data.match_label(info)] = mid
+                match_combo["values"] = list(match_id_map)
+                if match_id_map:
+                    match_combo.set(next(iter(match_id_map)))
+        except Exception:
+            messagebox.showerror("Data Load Error", f"Could not load data for {season_selected}.")
+
+    def update_teams(event=None):
+        from soccer_stats import data
+
+        season_selected = season_var.get()
+        try:
+            teams = data.team_names(season_selected)
+        except Exception:
+            team_combo["values"] = []
+            messagebox.showerror("Data Load Error", f"Could not load data for {season_selected}. Please try a different season.")
+            return
+        team_combo["values"] = teams
+        if teams:
+            team_combo.set(team if team in teams else teams[0])
+        root.after(10, update_players)
+
+    def on_submit():
+        choices["season"] = int(season_var.get())
+        choices["team"] = team_var.get()
+        if player_var is not None:
+            choices["player"] = player_var.get()
+        if match_var is not None:
+            choices["match_id"] = match_id_map.get(match_var.get())
+        root.destroy()
+
+    season_combo.bind("<<ComboboxSelected>>", update_teams)
+    team_combo.bind("<<ComboboxSelected>>", update_players)
+    ttk.Button(root, text="Submit", command=on_submit).grid(row=4, column=0, columnspan=2, pady=20)
+
+    # Fill in after the first paint so the window shows up straight away
+    root.after(50, update_teams)
+    return root, choices
+
+
+def choose(**kwargs):
+    root, choices = build_dialog(**kwargs)
+    root.mainloop()
+    return choices
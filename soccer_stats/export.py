@@ -0,0 +1,122 @@
+"""Streaming shot-data export.
+
+Frames are serialized in fixed-size row chunks straight to a file on disk, so
+an export never holds a second full copy of the data in memory. Callers can
+pass a single DataFrame or any iterable of DataFrames (e.g. one per season)
+and the frames are consumed one at a time.
+"""
+import contextlib
+import gzip
+import io
+import os
+import tempfile
+
+import pandas as pd
+
+# label -> (file extension, mime type)
+EXPORT_FORMATS = {
+    "CSV": ("csv", "text/csv"),
+    "CSV (gzip)": ("csv.gz", "application/gzip"),
+    "Parquet": ("parquet", "application/vnd.apache.parquet"),
+}
+
+CHUNK_ROWS = 50_000
+
+
+def iter_chunks(frames, chunk_rows=CHUNK_ROWS):
+    """Yield row slices of at most ``chunk_rows`` from one or many frames."""
+    if isinstance(frames, pd.DataFrame):
+        frames = [frames]
+    for frame in frames:
+        for start in range(0, len(frame), chunk_rows):
+            yield frame.iloc[start:start + chunk_rows]
+
+
+def _write_csv(chunks, fh):
+    text = io.TextIOWrapper(fh, encoding="utf-8", newline="")
+    header = True
+    for chunk in chunks:
+        chunk.to_csv(text, header=header, index=False)
+        header = False
+    text.flush()
+    text.detach()
+
+
+def _write_parquet(chunks, fh):
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    writer = None
+    try:
+        for chunk in chunks:
+            table = pa.Table.from_pandas(chunk, preserve_index=False)
+            if writer is None:
+                writer = pq.ParquetWriter(fh, table.schema)
+            else:
+                table = table.cast(writer.schema)
+            writer.write_table(table)
+    finally:
+        if writer is not None:
+            writer.close()
+
+
+def write_export(frames, fh, fmt="CSV", chunk_rows=CHUNK_ROWS):
+    """Write ``frames`` to the binary file object ``fh`` in ``fmt``."""
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Unknown export format: {fmt}")
+    chunks = iter_chunks(frames, chunk_rows)
+    if fmt == "CSV":
+        _write_csv(chunks, fh)
+    elif fmt == "CSV (gzip)":
+        with gzip.GzipFile(fileobj=fh, mode="wb") as gz:
+            _write_csv(chunks, gz)
+    else:
+        _write_parquet(chunks, fh)
+
+
+def export_to_path(frames, path, fmt="CSV", chunk_rows=CHUNK_ROWS):
+    """Export ``frames`` to ``path``; returns the path."""
+    with open(path, "wb") as fh:
+        write_export(frames, fh, fmt, chunk_rows)
+    return path
+
+
+class _ExportFile(io.BufferedReader):
+    """Read handle on a finished export that deletes the file when closed.
+
+    On POSIX the name is unlinked straight away; Windows cannot remove an
+    open file, so there it goes on ``close``.
+    """
+
+    def __init__(self, path):
+        super().__init__(io.FileIO(path, "rb"))
+        self._path = path
+        if os.name == "posix":
+            os.unlink(path)
+            self._path = None
+
+    def close(self):
+        try:
+            super().close()
+        finally:
+            if self._path is not None:
+                with contextlib.suppress(FileNotFoundError):
+                    os.unlink(self._path)
+                self._path = None
+
+
+def export_to_tempfile(frames, fmt="CSV", chunk_rows=CHUNK_ROWS):
+    """Export to a temporary file and return it open for reading from the start.
+
+    The result is an ``io.BufferedReader``, one of the file types Streamlit's
+    download_button accepts, and the file is removed once it is closed.
+    """
+    fd, path = tempfile.mkstemp(suffix="." + EXPORT_FORMATS.get(fmt, ("tmp",))[0])
+    try:
+        with open(fd, "wb") as fh:
+            write_export(frames, fh, fmt, chunk_rows)
+        return _ExportFile(path)
+    except BaseException:
+        with contextlib.suppress(FileNotFoundError):
+            os.unlink(path)
+        raise
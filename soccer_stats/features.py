@@ -0,0 +1,44 @@
+"""Per-90 player-season features from Understat player match stats."""
+import numpy as np
+
+PER90_STATS = ["xg", "xa", "xg_chain", "xg_buildup", "key_passes", "shots"]
+
+# Understat position code -> broad group
+POSITION_GROUPS = {
+    "GK": "GK",
+    "DR": "DEF", "DC": "DEF", "DL": "DEF", "DMR": "DEF", "DML": "DEF",
+    "DMC": "MID", "MR": "MID", "MC": "MID", "ML": "MID",
+    "AMR": "MID", "AMC": "MID", "AML": "MID",
+    "FWR": "FWD", "FW": "FWD", "FWL": "FWD",
+}
+
+
+def primary_positions(player_matches, keys=("season", "player_id")):
+    """Position with the most minutes per player-season, ignoring "Sub"."""
+    keys = list(keys)
+    started = player_matches[player_matches["position"] != "Sub"]
+    by_pos = started.groupby(keys + ["position"], sort=False)["minutes"].sum().reset_index()
+    idx = by_pos.groupby(keys, sort=False)["minutes"].idxmax()
+    return by_pos.loc[idx].set_index(keys)["position"]
+
+
+def player_season_per90(player_matches, stats=PER90_STATS, min_minutes=450, keys=("season", "player_id")):
+    """One row per ``keys`` (default (season, player_id)) with summed minutes and per-90 ``stats``.
+
+    Pass ``keys=("season", "player_id", "team")`` to keep a transferred
+    player's clubs apart; otherwise ``team`` is their last club.
+    """
+    keys = list(keys)
+    grouped = player_matches.groupby(keys, sort=False)
+    totals = grouped[["minutes"] + list(stats)].sum()
+    labels = [column for column in ("player", "team") if column not in keys]
+    for column in labels:
+        totals[column] = grouped[column].last()
+    totals["position"] = primary_positions(player_matches, keys).reindex(totals.index).fillna("Sub")
+    totals["position_group"] = totals["position"].map(POSITION_GROUPS).fillna("SUB")
+    totals = totals[totals["minutes"] >= min_minutes]
+
+    per90 = totals[list(stats)].to_numpy(dtype=np.float64) / totals["minutes"].to_numpy()[:, None] * 90
+    out = totals[labels + ["position", "position_group", "minutes"]].copy()
+    out[[f"{s}_90" for s in stats]] = per90
+    return out.reset_index()
@@ -0,0 +1,119 @@
+"""Fixture and head-to-head lookups over team match stats.
+
+Fixtures are stored once per team perspective as NumPy columns sorted by
+(team, opponent, date), with dates pre-parsed to datetime64. A team's or a
+pairing's fixtures are contiguous slices found through dicts, and date
+ranges inside a slice are binary searches, so a lookup costs the same
+however many seasons are loaded.
+"""
+import numpy as np
+import pandas as pd
+
+COLUMNS = ["season", "game_id", "date", "team", "opponent", "opponent_code", "is_home",
+           "goals_for", "goals_against", "xg_for", "xg_against", "points"]
+
+
+def perspective(matches, own_columns, opponent_columns):
+    """Two rows per fixture, the home team's view then the away team's.
+
+    Every row has season, game_id, date, team, opponent and is_home. The
+    ``own_columns`` and ``opponent_columns`` dicts map output names to team
+    match stats column suffixes, read from the row team's side or its opponent's.
+    """
+    def side(own, opp, is_home):
+        columns = {
+            "season": matches["season"].to_numpy(),
+            "game_id": matches["game_id"].to_numpy(),
+            "date": pd.to_datetime(matches["date"]).to_numpy(),
+            "team": matches[f"{own}_team"].to_numpy(),
+            "opponent": matches[f"{opp}_team"].to_numpy(),
+            "is_home": is_home,
+        }
+        columns.update({name: matches[f"{own}_{suffix}"].to_numpy() for name, suffix in own_columns.items()})
+        columns.update({name: matches[f"{opp}_{suffix}"].to_numpy() for name, suffix in opponent_columns.items()})
+        return pd.DataFrame(columns)
+
+    return pd.concat([side("home", "away", True), side("away", "home", False)], ignore_index=True)
+
+
+def _slices(*keys):
+    """{key tuple: (start, stop)} for runs of equal keys in already-sorted arrays."""
+    n = len(keys[0])
+    if n == 0:
+        return {}
+    change = np.zeros(n, dtype=bool)
+    change[0] = True
+    for k in keys:
+        change[1:] |= k[1:] != k[:-1]
+    starts = np.flatnonzero(change)
+    stops = np.r_[starts[1:], n]
+    if len(keys) == 1:
+        return {keys[0][s]: (s, e) for s, e in zip(starts, stops)}
+    return {tuple(k[s] for k in keys): (s, e) for s, e in zip(starts, stops)}
+
+
+class FixtureIndex:
+    def __init__(self, matches):
+        """``matches`` is a team match stats frame (or a list of them, e.g. one per season)."""
+        if isinstance(matches, (list, tuple)):
+            matches = pd.concat(matches, ignore_index=True)
+        long = perspective(matches, {"goals_for": "goals", "xg_for": "xg", "points": "points"},
+                           {"opponent_code": "team_code", "goals_against": "goals", "xg_against": "xg"})
+        long = long.sort_values(["team", "opponent", "date"], kind="stable")
+        self.cols = {c: long[c].to_numpy() for c in COLUMNS}
+        self.pairs = _slices(self.cols["team"], self.cols["opponent"])
+
+        # Second ordering by (team, date) for a team's full fixture list
+        by_date = np.lexsort((self.cols["date"], self.cols["team"]))
+        self.team_order = by_date
+        self.team_dates = self.cols["date"][by_date]
+        self.teams = _slices(self.cols["team"][by_date])
+
+    def _frame(self, rows):
+        return pd.DataFrame({c: v[rows] for c, v in self.cols.items()})
+
+    @staticmethod
+    def _date_bounds(dates, start, stop, date_from, date_to):
+        lo = start if date_from is None else start + np.searchsorted(dates[start:stop], np.datetime64(pd.Timestamp(date_from)), "left")
+        hi = stop if date_to is None else start + np.searchsorted(dates[start:stop], np.datetime64(pd.Timestamp(date_to)), "right")
+        return lo, hi
+
+    def team_fixtures(self, team, date_from=None, date_to=None):
+        """A team's fixtures in date order, optionally within [date_from, date_to]."""
+        start, stop = self.teams.get(team, (0, 0))
+        lo, hi = self._date_bounds(self.team_dates, start, stop, date_from, date_to)
+        return self._frame(self.team_order[lo:hi])
+
+    def head_to_head(self, team, opponent, date_from=None, date_to=None):
+        """``(fixtures, summary)`` of ``team`` against ``opponent`` across all loaded seasons."""
+        start, stop = self.pairs.get((team, opponent), (0, 0))
+        lo, hi = self._date_bounds(self.cols["date"], start, stop, date_from, date_to)
+        rows = slice(lo, hi)
+        gf, ga = self.cols["goals_for"][rows], self.cols["goals_against"][rows]
+        summary = {
+            "played": int(hi - lo),
+            "wins": int((gf > ga).sum()),
+            "draws": int((gf == ga).sum()),
+            "losses": int((gf < ga).sum()),
+            "goals_for": int(gf.sum()),
+            "goals_against": int(ga.sum()),
+            "xg_for": float(self.cols["xg_for"][rows].sum()),
+            "xg_against": float(self.cols["xg_against"][rows].sum()),
+            "points": int(self.cols["points"][rows].sum()),
+        }
+        return self._frame(np.arange(lo, hi)), summary
+
+    def find(self, team, opponent, date):
+        """The fixture between ``team`` and ``opponent`` on ``date`` (a day), or None."""
+        day = pd.Timestamp(date).normalize()
+        found, _ = self.head_to_head(team, opponent, day, day + pd.Timedelta(hours=23, minutes=59, seconds=59))
+        return None if found.empty else found.iloc[0]
+
+
+def run(seasons, team, opponent):
+    from soccer_stats import data
+
+    index = FixtureIndex([data.read_team_matches(s) for s in seasons])
+    fixtures, summary = index.head_to_head(team, opponent)
+    print(fixtures[["date", "is_home", "goals_for", "goals_against", "xg_for", "xg_against", "points"]].to_string(index=False))
+    print(summary)
@@ -0,0 +1,29 @@
+"""Shot heatmap for a team / player, for one match or the whole season."""
+import matplotlib.pyplot as plt
+import seaborn as sns
+
+from soccer_stats import data
+from soccer_stats.pitch import draw_pitch
+
+
+def plot_heatmap(shot_data, title, ax=None):
+    if ax is None:
+        fig, ax = plt.subplots(figsize=(12, 8))
+    draw_pitch(ax)
+    if not shot_data.empty:
+        sns.kdeplot(data=shot_data, x="x", y="y", fill=True, cmap="Reds", alpha=0.8, ax=ax, thresh=0.05)
+    ax.set_title(title)
+    return ax
+
+
+def run(season, team, player=data.ALL_PLAYERS, match_id="all"):
+    shot_data = data.select_shots(season, team, player, match_id)
+    if match_id == "all":
+        title = f"{team} Shot Heatmap – {season}"
+        if player and player != data.ALL_PLAYERS:
+            title = f"{player} ({team}) Shot Heatmap – {season}"
+    else:
+        fixtures = data.team_fixtures(data.read_team_matches(season), team)
+        title = data.match_label(data.match_titles(fixtures).get(match_id, {}))
+    plot_heatmap(shot_data, title)
+    plt.show()
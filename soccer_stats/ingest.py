@@ -0,0 +1,28 @@
+"""Download Understat stats into the local store and refresh the cached team list."""
+from pathlib import Path
+
+from soccer_stats import aggregates, config, data
+from soccer_stats.sources import KINDS, LEGACY_CSV, LocalStore, UnderstatSource
+
+
+def run(season=config.DEFAULT_SEASON, out=None, source=None):
+    """Fetch every kind (validated by the source), store it and write the CSV exports.
+
+    ``out`` overrides the folder the CSVs are written to.
+    """
+    source = source or UnderstatSource()
+    store = LocalStore()
+    frames = {}
+    for kind in KINDS:
+        frames[kind] = source.read(kind, season)
+        store.write(kind, season, frames[kind])
+        # Only games not seen before are folded into the season totals
+        aggregates.update(season, kind, frames[kind])
+
+    # Save to CSV, under the names LocalStore falls back to
+    out_dir = config.DATA_DIR if out is None else Path(out)
+    for kind, name in LEGACY_CSV.items():
+        frames[kind].to_csv(out_dir / name.format(season=season), index=False)
+
+    data.save_team_names(season, frames["shots"]["team"].unique().tolist())
+    return out_dir
@@ -0,0 +1,125 @@
+"""Small-multiples comparison: a grid of heatmaps or shot maps.
+
+Each panel's density is computed in a worker process, then every panel is
+drawn over one pre-rendered pitch image with a shared colour scale, so a
+20-club overview costs roughly one pitch render plus 20 ``imshow`` calls.
+"""
+import math
+from concurrent.futures import ProcessPoolExecutor
+
+import matplotlib.pyplot as plt
+import numpy as np
+from matplotlib.colors import Normalize
+
+from soccer_stats.density import DEFAULT_BINS, extent, shot_density
+from soccer_stats.pitch import draw_pitch
+
+
+def _panel_density(job):
+    label, x, y, bins, sigma = job
+    return label, shot_density(x, y, bins, sigma), len(x)
+
+
+def compute_densities(panels, bins=DEFAULT_BINS, sigma=2.0, workers=None):
+    """``panels`` is a list of ``(label, shot_frame)``; returns ``(label, grid, n)`` in order."""
+    jobs = [(label, frame["x"].to_numpy(), frame["y"].to_numpy(), bins, sigma) for label, frame in panels]
+    if workers == 1 or len(jobs) < 2:
+        return [_panel_density(job) for job in jobs]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(_panel_density, jobs))
+
+
+def pitch_background(dpi=100, theme="Grass"):
+    """Render the pitch once to an RGBA array that every panel reuses."""
+    fig, ax = plt.subplots(figsize=(6, 4), dpi=dpi)
+    fig.subplots_adjust(0, 0, 1, 1)
+    draw_pitch(ax, theme)
+    fig.canvas.draw()
+    image = np.asarray(fig.canvas.buffer_rgba()).copy()
+    plt.close(fig)
+    return image
+
+
+def team_panels(shots, teams=None):
+    teams = teams or sorted(shots["team"].unique())
+    return [(team, shots[shots["team"] == team]) for team in teams]
+
+
+def player_panels(shots, players):
+    return [(player, shots[shots["player"] == player]) for player in players]
+
+
+def match_panels(shots, match_titles, match_ids):
+    return [(match_titles.get(mid, str(mid)), shots[shots["game_id"] == mid]) for mid in match_ids]
+
+
+def render_small_multiples(panels, kind="heatmap", ncols=5, title=None, bins=DEFAULT_BINS,
+                           sigma=2.0, cmap="Reds", thresh=0.05, workers=None):
+    """Lay out ``panels`` (``(label, shot_frame)`` with x/y columns) in one figure."""
+    nrows = max(1, math.ceil(len(panels) / ncols))
+    fig, axes = plt.subplots(nrows, ncols, figsize=(3.2 * ncols, 2.3 * nrows), squeeze=False)
+    background = pitch_background()
+
+    if kind == "heatmap":
+        densities = compute_densities(panels, bins, sigma, workers)
+        vmax = max((grid.max() for _, grid, _ in densities), default=0) or 1.0
+        norm = Normalize(vmin=0, vmax=vmax)
+    else:
+        densities = [(label, None, len(frame)) for label, frame in panels]
+
+    for ax, (label, grid, n), (_, frame) in zip(axes.flat, densities, panels):
+        ax.imshow(background, extent=extent(), aspect="auto", zorder=0)
+        if grid is not None:
+            # Cells below the threshold stay transparent, like kdeplot's thresh
+            masked = np.ma.masked_less(grid.T, thresh * vmax)
+            ax.imshow(masked, extent=extent(), origin="lower", cmap=cmap, norm=norm,
+                      alpha=0.8, aspect="auto", zorder=1)
+        elif n:
+            goals = (frame["result"] == "Goal").to_numpy()
+            ax.scatter(frame["x"].to_numpy()[~goals], frame["y"].to_numpy()[~goals], marker="x", color="red", s=10, zorder=2)
+            ax.scatter(frame["x"].to_numpy()[goals], frame["y"].to_numpy()[goals], marker="o", color="lime", s=14, zorder=3)
+        ax.set_title(f"{label} ({n})", fontsize=9)
+        ax.set_xticks([])
+        ax.set_yticks([])
+        ax.set_xlim(0, 120)
+        ax.set_ylim(0, 80)
+
+    for ax in axes.flat[len(panels):]:
+        ax.axis("off")
+
+    if kind == "heatmap":
+        fig.colorbar(plt.cm.ScalarMappable(norm=norm, cmap=cmap), ax=axes, shrink=0.6, label="Smoothed shots per cell")
+    if title:
+        fig.suptitle(title, fontsize=14)
+    return fig
+
+
+def run(season, by="team", items=None, team=None, kind="heatmap", ncols=5, out=None, workers=None):
+    from soccer_stats import data
+
+    shots = data.read_shots(season)
+
+    if by == "team":
+        panels = team_panels(shots, items)
+        title = f"Shot {kind} by team – {season}"
+    elif by == "player":
+        if team:
+            shots = shots[shots["team"] == team]
+        panels = player_panels(shots, items or sorted(shots["player"].dropna().unique()))
+        title = f"Shot {kind} by player – {team or 'league'} {season}"
+    else:
+        if not team:
+            raise SystemExit("--team is required when comparing matches.")
+        shots = shots[shots["team"] == team]
+        fixtures = data.team_fixtures(data.read_team_matches(season), team)
+        titles = {mid: f"{info['date']} v {info['opponent']}"[:30] for mid, info in data.match_titles(fixtures).items()}
+        match_ids = [int(m) for m in items] if items else sorted(shots["game_id"].unique())
+        panels = match_panels(shots, titles, match_ids)
+        title = f"{team} shot {kind} by match – {season}"
+
+    fig = render_small_multiples(panels, kind=kind, ncols=ncols, title=title, workers=workers)
+    if out:
+        fig.savefig(out, dpi=120, bbox_inches="tight")
+    else:
+        plt.show()
+    return fig
@@ -0,0 +1,294 @@
+"""Percentile-rank profiles against positional peers, drawn as pizza charts.
+
+For each season the per-90 table of qualifying players is grouped by
+position group, and every group keeps one column-wise sorted
+``(players, stats)`` block. A player's percentile in a stat is then the
+mid-rank of their value in that sorted column (two ``searchsorted`` calls),
+so a profile costs O(stats * log N) instead of a sort of the league table.
+Blocks and player rows are flat arrays plus group ``offsets`` and a season
+saves to a single ``.npz``; ``render_league`` draws every squad's profile
+sheet across worker processes.
+"""
+import math
+import re
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+
+from soccer_stats import aggregates, config
+from soccer_stats.features import player_season_per90
+
+DEFAULT_DIR = config.STORE_DIR
+PROFILE_STATS = ["goals", "shots", "xg", "assists", "xa", "key_passes", "xg_chain", "xg_buildup"]
+LABELS = {
+    "goals": "Goals", "shots": "Shots", "xg": "xG", "assists": "Assists", "xa": "xA",
+    "key_passes": "Key passes", "xg_chain": "xGChain", "xg_buildup": "xGBuildup",
+}
+# Slice colours: shooting, creating, build-up
+COLORS = {"goals": "#d7191c", "shots": "#d7191c", "xg": "#d7191c",
+          "assists": "#2c7bb6", "xa": "#2c7bb6", "key_passes": "#2c7bb6",
+          "xg_chain": "#1a9641", "xg_buildup": "#1a9641"}
+MIN_MINUTES = 450
+
+
+def _table_path(season, root=DEFAULT_DIR):
+    return aggregates.derived_path(root, "percentiles", season, ".npz")
+
+
+class PercentileTable:
+    ARRAYS = ("stats", "groups", "offsets", "sorted", "player_id", "player", "team",
+              "position", "group", "minutes", "values")
+
+    def __init__(self, **arrays):
+        for name in self.ARRAYS:
+            setattr(self, name, arrays[name])
+        self._row = self._ranks = None
+
+    # ------------------------ Building ------------------------
+    @classmethod
+    def from_player_matches(cls, player_matches, stats=PROFILE_STATS, min_minutes=MIN_MINUTES):
+        """Distributions for one season of player match stats, one row per (player, club).
+
+        A player who changed clubs is profiled separately for each; stints
+        under ``min_minutes`` are left out.
+        """
+        table = player_season_per90(player_matches, stats, min_minutes, keys=("season", "player_id", "team"))
+        groups, group = np.unique(table["position_group"].to_numpy(str), return_inverse=True)
+        order = np.argsort(group, kind="stable")
+        group = group[order]
+        values = table[[f"{s}_90" for s in stats]].to_numpy(np.float64)[order]
+        offsets = np.r_[np.searchsorted(group, np.arange(len(groups))), len(group)].astype(np.int64)
+
+        ordered = values.copy()
+        for lo, hi in zip(offsets[:-1], offsets[1:]):
+            ordered[lo:hi] = np.sort(values[lo:hi], axis=0)
+
+        table = table.iloc[order]
+        return cls(
+            stats=np.asarray(stats), groups=groups, offsets=offsets, sorted=ordered,
+            player_id=table["player_id"].to_numpy(np.int64), player=table["player"].to_numpy(str),
+            team=table["team"].to_numpy(str), position=table["position"].to_numpy(str),
+            group=group.astype(np.int16), minutes=table["minutes"].to_numpy(np.int64), values=values,
+        )
+
+    def save(self, path):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(path.stem + ".tmp.npz")
+        np.savez(tmp, **{name: getattr(self, name) for name in self.ARRAYS})
+        tmp.replace(path)
+        return path
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as archive:
+            return cls(**{name: archive[name] for name in cls.ARRAYS})
+
+    # ------------------------ Lookup ------------------------
+    def __len__(self):
+        return len(self.player_id)
+
+    def percentiles(self, group, values):
+        """Percentile ranks (0-100) of a ``values`` vector (one per stat) among ``group`` peers."""
+        g = int(np.searchsorted(self.groups, group))
+        if g == len(self.groups) or self.groups[g] != group:
+            raise KeyError(group)
+        block = self.sorted[self.offsets[g]:self.offsets[g + 1]]
+        ranks = np.empty(len(self.stats))
+        for i, value in enumerate(values):
+            column = block[:, i]
+            # Mid-rank, so ties (every player on zero goals) share one percentile
+            ranks[i] = (np.searchsorted(column, value, "left") + np.searchsorted(column, value, "right")) / 2
+        return ranks / len(block) * 100
+
+    def rank_all(self):
+        """Percentile matrix for every player at once, ``(players, stats)``."""
+        ranks = np.empty_like(self.values)
+        for lo, hi in zip(self.offsets[:-1], self.offsets[1:]):
+            block, rows = self.sorted[lo:hi], self.values[lo:hi]
+            for i in range(len(self.stats)):
+                below = np.searchsorted(block[:, i], rows[:, i], "left")
+                upto = np.searchsorted(block[:, i], rows[:, i], "right")
+                ranks[lo:hi, i] = (below + upto) / 2 / max(hi - lo, 1) * 100
+        return ranks
+
+    def row_for(self, player, team=None):
+        """Row index for a player name or id, optionally on ``team``; KeyError when not qualified.
+
+        Without ``team`` a transferred player resolves to the club they played most minutes for.
+        """
+        if self._row is None:
+            self._row = {}
+            # Ascending minutes, so the longest stint wins the team-less keys
+            for i in np.argsort(self.minutes, kind="stable").tolist():
+                pid, name, side = int(self.player_id[i]), str(self.player[i]), str(self.team[i])
+                self._row[pid] = self._row[name] = self._row[(pid, side)] = self._row[(name, side)] = i
+        key = int(player) if isinstance(player, (int, np.integer)) else player
+        return self._row[key if team is None else (key, team)]
+
+    def _profile(self, i, percentiles):
+        g = self.group[i]
+        return {
+            "player": str(self.player[i]), "team": str(self.team[i]), "position": str(self.position[i]),
+            "group": str(self.groups[g]), "peers": int(self.offsets[g + 1] - self.offsets[g]),
+            "minutes": int(self.minutes[i]), "stats": [str(s) for s in self.stats],
+            "values": self.values[i], "percentiles": percentiles,
+        }
+
+    def profile(self, player, team=None):
+        """One player's per-90 values and percentile ranks against their position group."""
+        i = self.row_for(player, team)
+        return self._profile(i, self.percentiles(self.groups[self.group[i]], self.values[i]))
+
+    def team_profiles(self, team):
+        """Profiles for a squad's qualifying players, most minutes first."""
+        if self._ranks is None:
+            self._ranks = self.rank_all()
+        rows = np.flatnonzero(self.team == team)
+        rows = rows[np.argsort(-self.minutes[rows], kind="stable")]
+        return [self._profile(i, self._ranks[i]) for i in rows]
+
+
+def build(season, root=DEFAULT_DIR):
+    from soccer_stats import data
+
+    table = PercentileTable.from_player_matches(data.read_player_matches(season))
+    path = table.save(_table_path(season, root))
+    aggregates.prune_derived(path)
+    return table
+
+
+def load_season(season, root=DEFAULT_DIR):
+    """Distributions for a season, (re)built from the stored frames when missing or stale."""
+    path = _table_path(season, root)
+    if path.exists():
+        return PercentileTable.load(path)
+    return build(season, root)
+
+
+# ------------------------ Rendering ------------------------
+def draw_pizza(ax, profile, fontsize=9, values=True):
+    """Pizza chart of a ``profile``: one wedge per stat, radius = percentile.
+
+    Wedges are two patch collections on a plain unit-circle axis; polar axes
+    cost more to set up and draw than the chart itself in a squad sheet.
+    """
+    from matplotlib.collections import PatchCollection
+    from matplotlib.patches import Circle, Wedge
+
+    stats = profile["stats"]
+    n = len(stats)
+    pct = np.asarray(profile["percentiles"], dtype=np.float64)
+    # First stat at the top, then clockwise
+    centers = 90 - np.arange(n) * 360 / n
+    half = 180 / n * 0.96
+    radians = np.deg2rad(centers)
+
+    ax.add_collection(PatchCollection([Wedge((0, 0), 1, c - half, c + half) for c in centers],
+                                      facecolor="#eeeeee", edgecolor="none", zorder=1))
+    ax.add_collection(PatchCollection([Circle((0, 0), r) for r in (0.25, 0.5, 0.75)],
+                                      facecolor="none", edgecolor="#cccccc", linewidth=0.6, zorder=1.5))
+    ax.add_collection(PatchCollection([Wedge((0, 0), p / 100, c - half, c + half) for c, p in zip(centers, pct)],
+                                      facecolor=[COLORS.get(s, "grey") for s in stats],
+                                      edgecolor="white", linewidth=0.8, zorder=2))
+
+    labels = [LABELS.get(s, s) for s in stats]
+    if values:
+        labels = [f"{label}\n{v:.2f}" for label, v in zip(labels, profile["values"])]
+    inner = np.maximum(pct, 12) / 100 - 0.06
+    for angle, r, p, label in zip(radians, inner, pct, labels):
+        ax.text(r * np.cos(angle), r * np.sin(angle), f"{p:.0f}", ha="center", va="center",
+                fontsize=fontsize, color="white", fontweight="bold", zorder=3)
+        ax.text(1.18 * np.cos(angle), 1.18 * np.sin(angle), label, ha="center", va="center", fontsize=fontsize)
+
+    ax.set_xlim(-1.35, 1.35)
+    ax.set_ylim(-1.35, 1.35)
+    ax.set_aspect("equal")
+    ax.axis("off")
+
+
+def plot_profile(profile, title=None):
+    """Single player pizza chart; returns the matplotlib figure."""
+    import matplotlib.pyplot as plt
+
+    fig, ax = plt.subplots(figsize=(7, 7.5))
+    draw_pizza(ax, profile, fontsize=10)
+    ax.set_title(title or f"{profile['player']} – {profile['team']}", fontsize=15)
+    fig.text(0.5, 0.03, f"Per 90 percentile vs {profile['peers']} {profile['group']} players "
+                        f"({profile['minutes']} min, {profile['position']})", ha="center", fontsize=9)
+    return fig
+
+
+def render_sheet(profiles, title, ncols=5):
+    """Grid of pizza charts, one per profile."""
+    import matplotlib.pyplot as plt
+
+    nrows = max(1, math.ceil(len(profiles) / ncols))
+    fig, axes = plt.subplots(nrows, ncols, figsize=(3.4 * ncols, 3.6 * nrows), squeeze=False)
+    for ax, profile in zip(axes.flat, profiles):
+        draw_pizza(ax, profile, fontsize=6, values=False)
+        ax.set_title(f"{profile['player']} ({profile['group']}, {profile['minutes']} min)", fontsize=8)
+    for ax in axes.flat[len(profiles):]:
+        ax.axis("off")
+    fig.suptitle(title, fontsize=14)
+    fig.subplots_adjust(left=0.02, right=0.98, bottom=0.02, top=1 - 1.0 / fig.get_figheight(),
+                        wspace=0.1, hspace=0.15)
+    return fig
+
+
+def sheet_file(team):
+    return "profiles-" + re.sub(r"[^a-z0-9]+", "-", team.lower()).strip("-") + ".png"
+
+
+def _render_sheet_job(job):
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+
+    profiles, title, path = job
+    fig = render_sheet(profiles, title)
+    fig.savefig(path, dpi=100)
+    plt.close(fig)
+    return path
+
+
+def render_league(table, out_dir, workers=None):
+    """One profile sheet per team, rendered in worker processes; returns the written paths."""
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    jobs = [(table.team_profiles(team), f"Percentile Profiles – {team}", out_dir / sheet_file(team))
+            for team in np.unique(table.team)]
+    if workers == 1:
+        return [_render_sheet_job(job) for job in jobs]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(_render_sheet_job, jobs))
+
+
+def run(season, player=None, team=None, league=False, out=None, workers=None):
+    import time
+
+    import matplotlib.pyplot as plt
+
+    start = time.perf_counter()
+    table = build(season)
+    sizes = ", ".join(f"{g} {n}" for g, n in zip(table.groups, np.diff(table.offsets)))
+    print(f"Built {season} distributions for {len(table)} players ({sizes}) in {time.perf_counter() - start:.3f}s")
+    if league:
+        paths = render_league(table, out or "profiles", workers)
+        print(f"Wrote {len(paths)} profile sheets to {Path(paths[0]).parent if paths else out}")
+        return
+    if player is not None:
+        if isinstance(player, str) and player.isdigit():
+            player = int(player)
+        try:
+            fig = plot_profile(table.profile(player, team))
+        except KeyError:
+            raise SystemExit(f"{player} has not played {MIN_MINUTES} minutes in {season}.") from None
+    elif team:
+        fig = render_sheet(table.team_profiles(team), f"Percentile Profiles – {team}")
+    else:
+        return
+    if out:
+        fig.savefig(out, dpi=120, bbox_inches="tight")
+    else:
+        plt.show()
@@ -0,0 +1,63 @@
+"""Filtering stages behind the Streamlit apps.
+
+season -> team slice -> player slice -> match slice -> outcome filter -> render
+
+Each stage is a plain function of the previous stage's output plus its own
+inputs, so the apps can cache them separately (keyed only on those inputs)
+and a cosmetic toggle reruns nothing but the render.
+"""
+import pandas as pd
+
+from soccer_stats.data import ALL_PLAYERS, team_fixtures
+
+DATE_FORMAT = "%d %b %Y"
+
+
+def team_slice(shots, team):
+    # x/y pitch coordinates are added once at ingestion (validate)
+    return shots[shots["team"] == team]
+
+
+def team_players(team_shots):
+    return [ALL_PLAYERS] + sorted(team_shots["player"].dropna().unique())
+
+
+def player_slice(team_shots, player):
+    if player == ALL_PLAYERS:
+        return team_shots
+    return team_shots[team_shots["player"] == player]
+
+
+def match_table(matches, team):
+    """Team fixtures with parsed dates, opponent code and home/away."""
+    fixtures = team_fixtures(matches, team)
+    fixtures["date"] = pd.to_datetime(fixtures["date"])
+    return fixtures
+
+
+def match_options(fixtures, match_ids):
+    """Dropdown label -> game_id for fixtures in ``match_ids``, led by "All Matches"."""
+    played = fixtures[fixtures["game_id"].isin(match_ids)]
+    labels = (played["date"].dt.strftime(DATE_FORMAT) + " – vs " + played["opponent"]
+              + " (" + played["home_away"] + ")")
+    return {"All Matches": "all"} | dict(zip(labels, played["game_id"]))
+
+
+def match_slice(player_shots, match_id):
+    if match_id == "all":
+        return player_shots
+    return player_shots[player_shots["game_id"] == match_id]
+
+
+def outcome_filter(match_shots, outcomes):
+    return match_shots[match_shots["result"].isin(outcomes)]
+
+
+def match_title(fixtures, team, match_id):
+    if match_id == "all":
+        return f"All Matches – {team}"
+    row = fixtures[fixtures["game_id"] == match_id]
+    if row.empty:
+        return "Unknown – vs ? (?)"
+    info = row.iloc[0]
+    return f"{info['date'].strftime(DATE_FORMAT)} – vs {info['opponent']} ({info['home_away']})"
@@ -0,0 +1,48 @@
+"""Plain matplotlib pitch drawing (120 x 80 StatsBomb-style coordinates)."""
+import matplotlib.patches as patches
+
+# theme -> (pitch colour, line colour)
+PITCH_THEMES = {
+    "Grass": ("green", "black"),
+    "Light": ("white", "dimgray"),
+    "Dark": ("#22312b", "#c7d5cc"),
+}
+
+
+def draw_pitch(ax, theme="Grass"):
+    facecolor, line = PITCH_THEMES.get(theme, PITCH_THEMES["Grass"])
+
+    # Pitch Outline & Centre Line
+    ax.plot([0, 0, 120, 120, 0], [0, 80, 80, 0, 0], color=line)
+    ax.plot([60, 60], [0, 80], color=line)  # Halfway line
+
+    # Center circle
+    ax.add_patch(patches.Circle((60, 40), 10, edgecolor=line, facecolor="none"))
+    ax.plot(60, 40, 'o', color=line)  # Center spot
+
+    # Penalty areas
+    ax.plot([0, 18], [62, 62], color=line)
+    ax.plot([0, 18], [18, 18], color=line)
+    ax.plot([18, 18], [18, 62], color=line)
+    ax.plot([120, 102], [62, 62], color=line)
+    ax.plot([120, 102], [18, 18], color=line)
+    ax.plot([102, 102], [18, 62], color=line)
+
+    # 6-yard boxes
+    ax.plot([0, 6], [48, 48], color=line)
+    ax.plot([0, 6], [32, 32], color=line)
+    ax.plot([6, 6], [32, 48], color=line)
+    ax.plot([120, 114], [48, 48], color=line)
+    ax.plot([120, 114], [32, 32], color=line)
+    ax.plot([114, 114], [32, 48], color=line)
+
+    # Penalty spots
+    ax.plot(12, 40, 'o', color=line)
+    ax.plot(108, 40, 'o', color=line)
+
+    # Remove axes
+    ax.set_xticks([])
+    ax.set_yticks([])
+    ax.set_xlim(0, 120)
+    ax.set_ylim(0, 80)
+    ax.set_facecolor(facecolor)
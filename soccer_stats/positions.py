@@ -0,0 +1,164 @@
+"""Positional usage maps: share of a player's minutes at each position.
+
+Minutes are aggregated for every player at once (``usage_table``), every
+Understat position code has a pitch location, and each map is drawn with
+one scatter call for the dots and one for the primary-position rings. A
+whole squad renders as a grid of small pitches over one pre-rendered
+background; ``render_league`` draws every squad across worker processes.
+"""
+import math
+import re
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import matplotlib.pyplot as plt
+import pandas as pd
+from mplsoccer import Pitch
+
+from soccer_stats import data
+
+# Understat position code -> pitch location (StatsBomb 120 x 80, attacking left to right)
+POS_COORDS = {
+    "GK": (6, 40),
+    "DL": (24, 10), "DC": (24, 40), "DR": (24, 70),
+    "DML": (40, 16), "DMC": (40, 40), "DMR": (40, 64),
+    "ML": (58, 10), "MC": (58, 40), "MR": (58, 70),
+    "AML": (76, 16), "AMC": (76, 40), "AMR": (76, 64),
+    "FWL": (96, 20), "FW": (102, 40), "FWR": (96, 60),
+    "Sub": (112, 72),  # off the bench, drawn in a corner
+}
+
+SAMPLE_DATA = [
+    {'position': 'DC', 'minutes': 3000},
+    {'position': 'DR', 'minutes': 2000},
+    {'position': 'DMC', 'minutes': 800},
+    {'position': 'Sub', 'minutes': 400}
+]
+
+
+def usage_table(player_matches, keys=("team", "player")):
+    """Minutes per ``keys`` + position, with share of the player's minutes, primary flag and x/y."""
+    keys = list(keys)
+    usage = player_matches.groupby(keys + ["position"], sort=False)["minutes"].sum().reset_index()
+    usage = usage[usage["minutes"] > 0].reset_index(drop=True)
+    grouped = usage.groupby(keys, sort=False)["minutes"]
+    usage["pct"] = usage["minutes"] / grouped.transform("sum") * 100
+    usage["primary"] = usage.index.isin(grouped.idxmax())
+    usage["x"] = usage["position"].map({pos: xy[0] for pos, xy in POS_COORDS.items()})
+    usage["y"] = usage["position"].map({pos: xy[1] for pos, xy in POS_COORDS.items()})
+    return usage
+
+
+def draw_usage(ax, rows, size=150, fontsize=10):
+    """One player's ``usage_table`` rows on a StatsBomb-oriented axis."""
+    rows = rows[rows["x"].notna()]
+    x, y = rows["x"].to_numpy(), rows["y"].to_numpy()
+    primary = rows["primary"].to_numpy()
+    ax.scatter(x[primary], y[primary], s=size * 3, color='black', zorder=3)
+    ax.scatter(x, y, s=size, color='blue', zorder=4)
+    for xi, yi, pos, pct in zip(x, y, rows["position"], rows["pct"].to_numpy()):
+        label = f"Sub {pct:.0f}%" if pos == "Sub" else f"{pct:.0f}%"
+        ax.text(xi, yi + 3, label, ha='center', va='top', fontsize=fontsize, zorder=5)
+
+
+def plot_player_position_usage(position_minutes, player_name="Player Name"):
+    """
+    position_minutes: list of dicts like:
+        [{'position': 'DC', 'minutes': 3000},
+         {'position': 'DR', 'minutes': 2000},
+         {'position': 'DMC', 'minutes': 800},
+         {'position': 'Sub', 'minutes': 400}]
+    Returns the matplotlib figure.
+    """
+    rows = usage_table(pd.DataFrame(position_minutes).assign(player=player_name), keys=["player"])
+
+    pitch = Pitch(pitch_type='statsbomb', line_zorder=2, pitch_color='white')
+    fig, ax = pitch.draw(figsize=(10, 6))
+    pitch.annotate(player_name, (60, 5), ax=ax, ha='center', fontsize=14, fontweight='bold')
+    draw_usage(ax, rows)
+
+    ax.set_title(f"Positional Usage – {player_name}", fontsize=16)
+    plt.tight_layout()
+    return fig
+
+
+def render_squad(usage, team, ncols=6, title=None):
+    """Grid of positional maps for every player of ``team`` in a ``usage_table``, most minutes first."""
+    from soccer_stats.multiples import pitch_background
+
+    rows = usage[usage["team"] == team]
+    by_player = dict(tuple(rows.groupby("player", sort=False)))
+    minutes = rows.groupby("player", sort=False)["minutes"].sum().sort_values(ascending=False)
+
+    nrows = max(1, math.ceil(len(minutes) / ncols))
+    fig, axes = plt.subplots(nrows, ncols, figsize=(3 * ncols, 2.3 * nrows), squeeze=False)
+    background = pitch_background(theme="Light")
+    for ax, (player, total) in zip(axes.flat, minutes.items()):
+        ax.imshow(background, extent=(0, 120, 80, 0), aspect="auto", zorder=0)
+        draw_usage(ax, by_player[player], size=30, fontsize=6)
+        ax.set_title(f"{player} ({total} min)", fontsize=8)
+        ax.set_xticks([])
+        ax.set_yticks([])
+        ax.set_xlim(0, 120)
+        ax.set_ylim(80, 0)
+    for ax in axes.flat[len(minutes):]:
+        ax.axis("off")
+
+    fig.suptitle(title or f"Positional Usage – {team}", fontsize=14)
+    return fig
+
+
+def squad_file(team):
+    return "positions-" + re.sub(r"[^a-z0-9]+", "-", team.lower()).strip("-") + ".png"
+
+
+def _render_squad_job(job):
+    import matplotlib
+    matplotlib.use("Agg")
+
+    team_usage, team, path = job
+    fig = render_squad(team_usage, team)
+    fig.savefig(path, dpi=100, bbox_inches="tight")
+    plt.close(fig)
+    return path
+
+
+def render_league(usage, out_dir, workers=None):
+    """One squad sheet per team, rendered in worker processes; returns the written paths."""
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    jobs = [(rows, team, out_dir / squad_file(team)) for team, rows in usage.groupby("team", sort=True)]
+    if workers == 1:
+        return [_render_squad_job(job) for job in jobs]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(_render_squad_job, jobs))
+
+
+def position_minutes(player_stats, player, team=None):
+    rows = player_stats[player_stats["player"] == player]
+    if team:
+        rows = rows[rows["team"] == team]
+    return rows.groupby("position")["minutes"].sum().reset_index().to_dict("records")
+
+
+def run(season=None, player=None, team=None, squad=False, league=False, out=None, workers=None):
+    if league:
+        paths = render_league(usage_table(data.read_player_matches(season)), out or "positions", workers)
+        print(f"Wrote {len(paths)} squad sheets to {Path(paths[0]).parent if paths else out}")
+        return
+    if squad:
+        if not team:
+            raise SystemExit("--team is required for a squad sheet.")
+        matches = data.read_player_matches(season)
+        fig = render_squad(usage_table(matches[matches["team"] == team]), team)
+    elif player is None:
+        fig = plot_player_position_usage(SAMPLE_DATA, player_name="Cristhian Mosquera")
+    else:
+        records = position_minutes(data.read_player_matches(season), player, team)
+        if not records:
+            raise SystemExit(f"No position data available for {player}.")
+        fig = plot_player_position_usage(records, player_name=player)
+    if out:
+        fig.savefig(out, dpi=120, bbox_inches="tight")
+    else:
+        plt.show()
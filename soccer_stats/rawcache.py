@@ -0,0 +1,176 @@
+"""Managed disk cache for raw Understat responses.
+
+soccerdata keeps every page as a plain file with one global max age and no
+size limit. ``RawCache`` replaces that for ``UnderstatSource``:
+
+* payloads are zlib-compressed files named by a hash of the page key, with
+  season, size and fetch/access times in a SQLite index
+* pages of finished seasons never expire; pages of ``CURRENT_SEASON`` (and
+  later) expire after ``CURRENT_TTL``
+* least recently used entries are evicted once the total exceeds the budget
+* files are written to a temporary name and renamed, and the index runs in
+  WAL mode, so several app processes can share one cache directory
+
+A warm restart serves every page from here without touching the network.
+"""
+import functools
+import hashlib
+import inspect
+import io
+import os
+import sqlite3
+import time
+import zlib
+from contextlib import closing
+
+from soccer_stats import config
+
+CURRENT_TTL = 3600  # seconds
+
+# CachedUnderstat overrides private soccerdata methods; this is the release
+# (also pinned in requirements.txt) whose signatures it was written against.
+SOCCERDATA_VERSION = "1.8.7"
+OVERRIDDEN = {
+    "get": ["self", "url", "filepath", "max_age", "no_cache", "var"],
+    "_download_and_save": ["self", "url", "filepath", "var"],
+}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    key TEXT PRIMARY KEY,
+    file TEXT NOT NULL,
+    season INTEGER,
+    size INTEGER NOT NULL,
+    fetched REAL NOT NULL,
+    accessed REAL NOT NULL
+)
+"""
+
+
+class RawCache:
+    def __init__(self, root=None, max_bytes=None, current_season=None, current_ttl=CURRENT_TTL):
+        self.root = root or config.RAW_CACHE_DIR
+        self.max_bytes = max_bytes if max_bytes is not None else config.RAW_CACHE_MAX_MB * 1024 * 1024
+        self.current_season = current_season if current_season is not None else config.CURRENT_SEASON
+        self.current_ttl = current_ttl
+        self.root.mkdir(parents=True, exist_ok=True)
+        with closing(self._connect()) as db:
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute(SCHEMA)
+
+    def _connect(self):
+        # Autocommit; transactions are opened explicitly where several statements must agree
+        return sqlite3.connect(self.root / "index.sqlite", timeout=30, isolation_level=None)
+
+    def _file(self, key):
+        digest = hashlib.sha1(key.encode()).hexdigest()
+        return f"{digest[:2]}/{digest}.z"
+
+    def expired(self, season, fetched, now=None):
+        if season is not None and season < self.current_season:
+            return False
+        return (now or time.time()) - fetched > self.current_ttl
+
+    def get(self, key):
+        """Cached payload for ``key``, or None when missing or expired."""
+        with closing(self._connect()) as db:
+            row = db.execute("SELECT file, season, fetched FROM entries WHERE key = ?", (key,)).fetchone()
+            if row is None or self.expired(row[1], row[2]):
+                return None
+            try:
+                payload = zlib.decompress((self.root / row[0]).read_bytes())
+            except (FileNotFoundError, zlib.error):
+                # Evicted or half-written by another process: treat as a miss
+                db.execute("DELETE FROM entries WHERE key = ?", (key,))
+                return None
+            db.execute("UPDATE entries SET accessed = ? WHERE key = ?", (time.time(), key))
+            return payload
+
+    def put(self, key, payload, season=None):
+        name = self._file(key)
+        path = self.root / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        blob = zlib.compress(payload, 6)
+        tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        tmp.write_bytes(blob)
+        os.replace(tmp, path)
+        now = time.time()
+        with closing(self._connect()) as db:
+            db.execute("INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?, ?)",
+                       (key, name, season, len(blob), now, now))
+        self.evict()
+
+    def evict(self):
+        """Drop least recently used entries until the cache fits in ``max_bytes``."""
+        with closing(self._connect()) as db:
+            db.execute("BEGIN IMMEDIATE")
+            try:
+                total = db.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+                victims = []
+                if total > self.max_bytes:
+                    for key, name, size in db.execute("SELECT key, file, size FROM entries ORDER BY accessed"):
+                        if total <= self.max_bytes:
+                            break
+                        victims.append((key, name))
+                        total -= size
+                    db.executemany("DELETE FROM entries WHERE key = ?", [(k,) for k, _ in victims])
+                db.execute("COMMIT")
+            except BaseException:
+                db.execute("ROLLBACK")
+                raise
+        for _, name in victims:
+            (self.root / name).unlink(missing_ok=True)
+        return len(victims)
+
+    def stats(self):
+        with closing(self._connect()) as db:
+            count, size = db.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries").fetchone()
+            expired = sum(self.expired(season, fetched)
+                          for season, fetched in db.execute("SELECT season, fetched FROM entries"))
+        return {"entries": count, "bytes": size, "expired": expired, "max_bytes": self.max_bytes}
+
+    def clear(self):
+        with closing(self._connect()) as db:
+            names = [name for (name,) in db.execute("SELECT file FROM entries")]
+            db.execute("DELETE FROM entries")
+        for name in names:
+            (self.root / name).unlink(missing_ok=True)
+
+
+@functools.lru_cache(maxsize=None)
+def cached_understat():
+    """soccerdata's Understat reader with page fetches going through a RawCache."""
+    import soccerdata.understat as sd_understat
+
+    for name, expected in OVERRIDDEN.items():
+        params = list(inspect.signature(getattr(sd_understat.Understat, name)).parameters)
+        if params != expected:
+            raise RuntimeError(f"soccerdata Understat.{name}{tuple(params)} does not match the "
+                               f"soccerdata {SOCCERDATA_VERSION} signature CachedUnderstat overrides")
+
+    class CachedUnderstat(sd_understat.Understat):
+        raw_cache = None
+        cache_season = None
+
+        def get(self, url, filepath=None, max_age=None, no_cache=False, var=None):
+            # soccerdata names its cache files after the page, which makes a stable key
+            key = filepath.name if filepath is not None else url
+            if not (no_cache or self.no_cache):
+                payload = self.raw_cache.get(key)
+                if payload is not None:
+                    return io.BytesIO(payload)
+            payload = self._download_and_save(url, None, var).read()
+            # The league index lists every season, so it expires like the current one
+            self.raw_cache.put(key, payload, None if key == "leagues.json" else self.cache_season)
+            return io.BytesIO(payload)
+
+    return CachedUnderstat
+
+
+def run(clear=False):
+    cache = RawCache()
+    if clear:
+        cache.clear()
+    stats = cache.stats()
+    print(f"{cache.root}: {stats['entries']} pages, {stats['bytes'] / 1024 / 1024:.1f} MB "
+          f"of {stats['max_bytes'] / 1024 / 1024:.0f} MB, {stats['expired']} expired")
@@ -0,0 +1,55 @@
+"""Heat map / shot map figures shared by the Streamlit apps."""
+import io
+
+import matplotlib.pyplot as plt
+import seaborn as sns
+
+from soccer_stats.pitch import draw_pitch
+from soccer_stats.zones import plot_zone_overlay
+
+LABEL_BOX = dict(facecolor='black', alpha=0.5, pad=1)
+
+
+def plot_shot_map(ax, match_shots, show_xg=False, show_names=False):
+    goals = (match_shots["result"] == "Goal").to_numpy()
+    x, y = match_shots["x"].to_numpy(), match_shots["y"].to_numpy()
+    ax.scatter(x[~goals], y[~goals], marker="$X$", color="red", s=120, zorder=3)
+    ax.scatter(x[goals], y[goals], marker="$O$", color="lime", s=120, zorder=3)
+
+    # Labels are per-shot text artists, so they are only built when asked for
+    if show_xg and "xg" in match_shots:
+        for xi, yi, xg in zip(x, y, match_shots["xg"].astype(float)):
+            ax.text(xi, yi + 2, f"xg: {xg:.2f}", fontsize=8, color="white",
+                    ha='center', va='center', bbox=LABEL_BOX)
+    if show_names and "player" in match_shots:
+        for xi, yi, name in zip(x, y, match_shots["player"]):
+            ax.text(xi, yi - 2, name, fontsize=8, color="white",
+                    ha='center', va='center', bbox=LABEL_BOX)
+
+
+def render_shots(match_shots, plot_type="Heat Map", title="", show_xg=False, show_names=False, theme="Grass",
+                 zone_values=None):
+    """Pitch figure with a KDE heat map or a shot map of ``match_shots`` (x/y columns).
+
+    ``zone_values`` (a zones.league_zones table) adds the league conversion rate per zone underneath.
+    """
+    fig, ax = plt.subplots(figsize=(12, 8))
+    draw_pitch(ax, theme)
+    if zone_values is not None:
+        fig.colorbar(plot_zone_overlay(ax, zone_values), ax=ax, shrink=0.6, label="League conversion rate")
+    if not match_shots.empty:
+        if plot_type == "Heat Map":
+            sns.kdeplot(data=match_shots, x="x", y="y", fill=True,
+                        cmap="Reds", alpha=0.8, ax=ax, thresh=0.05)
+        else:
+            plot_shot_map(ax, match_shots, show_xg, show_names)
+    ax.set_title(title)
+    return fig
+
+
+def figure_png(fig, close=True):
+    buffer = io.BytesIO()
+    fig.savefig(buffer, format='png', bbox_inches='tight')
+    if close:
+        plt.close(fig)
+    return buffer.getvalue()
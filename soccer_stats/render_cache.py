@@ -0,0 +1,68 @@
+"""Content-addressed on-disk cache for rendered images and other job results.
+
+Keys hash the job parameters, which include the season's data version, so
+an ingest moves renders on to new keys. Reads refresh a file's mtime and
+``put`` evicts the least recently used files once the cache outgrows its
+size budget.
+"""
+import hashlib
+import json
+import os
+
+from soccer_stats import config
+
+DEFAULT_DIR = config.CACHE_DIR / "renders"
+
+
+def cache_key(kind, params):
+    blob = json.dumps([kind, params], sort_keys=True, default=str)
+    return hashlib.sha256(blob.encode()).hexdigest()
+
+
+class RenderCache:
+    def __init__(self, root=DEFAULT_DIR, max_bytes=None):
+        self.root = root
+        self.max_bytes = max_bytes if max_bytes is not None else config.RENDER_CACHE_MAX_MB * 1024 * 1024
+
+    def path(self, key, ext="png"):
+        return self.root / key[:2] / f"{key}.{ext}"
+
+    def get(self, key, ext="png"):
+        path = self.path(key, ext)
+        try:
+            payload = path.read_bytes()
+            os.utime(path)  # mtime doubles as the last access time for eviction
+        except FileNotFoundError:
+            return None
+        return payload
+
+    def put(self, key, payload, ext="png"):
+        """Write atomically, so concurrent processes never see a partial file."""
+        path = self.path(key, ext)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        tmp.write_bytes(payload)
+        os.replace(tmp, path)
+        self.evict()
+        return path
+
+    def evict(self):
+        """Delete least recently used files until the cache fits in ``max_bytes``."""
+        entries, total = [], 0
+        for path in self.root.glob("*/*"):
+            if path.name.endswith(".tmp"):
+                continue
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime_ns, stat.st_size, path))
+            total += stat.st_size
+        removed = 0
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+            removed += 1
+        return removed
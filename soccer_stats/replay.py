@@ -0,0 +1,72 @@
+"""Local HTTP stand-in for understat.com.
+
+Serves recorded pages from ``config.REPLAY_DIR`` so soccerdata can run against
+it with no network (``SOCCER_STATS_SOURCE=replay``). With ``record=True``,
+pages that are not on disk yet are fetched from the real site once and saved,
+which is how a replay directory gets populated.
+"""
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit
+
+from soccer_stats import config
+
+
+def page_path(root, url_path):
+    """File holding the recorded page for ``url_path`` (e.g. /match/26602)."""
+    parts = [p for p in urlsplit(url_path).path.split("/") if p and p not in (".", "..")]
+    if not parts:
+        return root / "index.html"
+    return root.joinpath(*parts[:-1], parts[-1] + ".html")
+
+
+def make_handler(root, record=False, upstream=config.UNDERSTAT_URL):
+    class ReplayHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            path = page_path(root, self.path)
+            if not path.exists() and record:
+                self._record(path)
+            if not path.exists():
+                self.send_error(404, "Page not recorded")
+                return
+            body = path.read_bytes()
+            self.send_response(200)
+            self.send_header("Content-Type", "text/html; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def _record(self, path):
+            import requests
+
+            from soccer_stats.scrape import USER_AGENT
+
+            response = requests.get(upstream + self.path, headers={"User-Agent": USER_AGENT}, timeout=30)
+            if response.ok:
+                path.parent.mkdir(parents=True, exist_ok=True)
+                path.write_bytes(response.content)
+
+        def log_message(self, format, *args):
+            pass
+
+    return ReplayHandler
+
+
+def start_server(root=None, host="127.0.0.1", port=8765, record=False):
+    """Start the replay server in a background thread and return it."""
+    root = root or config.REPLAY_DIR
+    server = ThreadingHTTPServer((host, port), make_handler(root, record))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def serve(root=None, host="127.0.0.1", port=8765, record=False):
+    root = root or config.REPLAY_DIR
+    server = ThreadingHTTPServer((host, port), make_handler(root, record))
+    print(f"Replaying {root} on http://{host}:{port} (record={record})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
@@ -0,0 +1,22 @@
+"""Request patching needed to scrape Understat."""
+import requests
+
+USER_AGENT = (
+    "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) "
+    "AppleWebKit/537.36 (KHTML, like Gecko) "
+    "Chrome/114.0.0.0 Safari/537.36"
+)
+
+_original_get = requests.get
+
+
+def patched_get(*args, **kwargs):
+    headers = kwargs.pop("headers", None) or {}
+    headers["User-Agent"] = USER_AGENT
+    kwargs["headers"] = headers
+    return _original_get(*args, **kwargs)
+
+
+def patch_user_agent():
+    """Patch requests.get globally to send a browser user-agent."""
+    requests.get = patched_get
@@ -0,0 +1,73 @@
+"""Player similarity search over normalized per-90 vectors.
+
+Player-season per-90 features are z-scored per column and L2-normalized per
+row into one contiguous float32 matrix, so cosine similarity for a batch of
+query players is a single matrix multiply followed by ``argpartition``.
+"""
+import numpy as np
+import pandas as pd
+
+from soccer_stats.features import PER90_STATS, player_season_per90
+
+
+class SimilarityIndex:
+    def __init__(self, meta, matrix):
+        self.meta = meta.reset_index(drop=True)
+        self.matrix = np.ascontiguousarray(matrix, dtype=np.float32)
+
+    @classmethod
+    def from_player_matches(cls, player_matches, stats=PER90_STATS, min_minutes=450):
+        table = player_season_per90(player_matches, stats, min_minutes)
+        values = table[[f"{s}_90" for s in stats]].to_numpy(dtype=np.float64)
+        std = values.std(axis=0)
+        values = (values - values.mean(axis=0)) / np.where(std > 0, std, 1)
+        norms = np.linalg.norm(values, axis=1, keepdims=True)
+        values /= np.where(norms > 0, norms, 1)
+        return cls(table.drop(columns=[f"{s}_90" for s in stats]), values)
+
+    def rows_for(self, player, season=None):
+        """Matrix rows for a player name or id (optionally one season)."""
+        meta = self.meta
+        mask = (meta["player_id"] == player) if isinstance(player, (int, np.integer)) else (meta["player"] == player)
+        if season is not None:
+            mask &= meta["season"] == season
+        return np.flatnonzero(mask.to_numpy())
+
+    def top_k_rows(self, rows, k=10, position=None):
+        """Top-k similar rows for each query row: ``(indices, scores)``, both (len(rows), k)."""
+        rows = np.asarray(rows)
+        scores = self.matrix[rows] @ self.matrix.T
+        scores[np.arange(len(rows)), rows] = -np.inf  # never return the query itself
+        if position is not None:
+            allowed = (self.meta["position"] == position) | (self.meta["position_group"] == position)
+            scores[:, ~allowed.to_numpy()] = -np.inf
+        k = min(k, scores.shape[1] - 1)
+        part = np.argpartition(-scores, k, axis=1)[:, :k]
+        part_scores = np.take_along_axis(scores, part, axis=1)
+        order = np.argsort(-part_scores, axis=1)
+        return np.take_along_axis(part, order, axis=1), np.take_along_axis(part_scores, order, axis=1)
+
+    def most_similar(self, player, k=10, position=None, season=None):
+        rows = self.rows_for(player, season)
+        if rows.size == 0:
+            raise KeyError(f"No per-90 profile for {player}")
+        idx, scores = self.top_k_rows(rows[-1:], k, position)
+        keep = np.isfinite(scores[0])
+        result = self.meta.iloc[idx[0][keep]].copy()
+        result["similarity"] = scores[0][keep]
+        return result.reset_index(drop=True)
+
+    def save(self, path_prefix):
+        np.save(f"{path_prefix}.npy", self.matrix)
+        self.meta.to_parquet(f"{path_prefix}.parquet", index=False)
+
+    @classmethod
+    def load(cls, path_prefix):
+        return cls(pd.read_parquet(f"{path_prefix}.parquet"), np.load(f"{path_prefix}.npy", mmap_mode="r"))
+
+
+def run(season, player, k=10, position=None):
+    from soccer_stats import data
+
+    index = SimilarityIndex.from_player_matches(data.read_player_matches(season))
+    print(index.most_similar(player, k, position).to_string(index=False))
@@ -0,0 +1,139 @@
+"""Static dashboard export.
+
+Renders heat maps, shot maps and positional maps for every
+(season, team, player, match) combination into a folder of images plus an
+``index.json`` (and a plain ``index.html``), ready to serve from any static
+host. File names are content hashes of the inputs, so a rebuild only renders
+images whose shots, title or renderer changed.
+"""
+import hashlib
+import html
+import json
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+
+from soccer_stats import data, pipeline
+
+# Bump when the renderers change so every image is redrawn
+RENDER_VERSION = "1"
+SHOT_COLUMNS = ["x", "y", "xg", "result", "player"]
+
+
+def content_hash(kind, title, payload):
+    digest = hashlib.sha256(f"{RENDER_VERSION}|{kind}|{title}".encode())
+    if isinstance(payload, dict):
+        for name in SHOT_COLUMNS:
+            digest.update(np.ascontiguousarray(payload[name]).tobytes() if payload[name].dtype != object
+                          else "\x1f".join(map(str, payload[name])).encode())
+    else:
+        digest.update(json.dumps(payload, sort_keys=True, default=str).encode())
+    return digest.hexdigest()[:20]
+
+
+def _shot_payload(frame):
+    return {
+        "x": frame["x"].to_numpy(dtype=np.float32),
+        "y": frame["y"].to_numpy(dtype=np.float32),
+        "xg": frame["xg"].to_numpy(dtype=np.float32),
+        "result": frame["result"].astype(str).to_numpy(dtype=object),
+        "player": frame["player"].astype(str).to_numpy(dtype=object),
+    }
+
+
+def plan_season(season, shots, matches, player_stats):
+    """Yield one job per image for a season (without rendering anything)."""
+    from soccer_stats.positions import position_minutes
+
+    for team in sorted(shots["team"].unique()):
+        team_shots = pipeline.team_slice(shots, team)
+        fixtures = pipeline.match_table(matches, team)
+        for player in pipeline.team_players(team_shots):
+            player_shots = pipeline.player_slice(team_shots, player)
+            match_ids = ["all"] + sorted(player_shots["game_id"].unique().tolist())
+            for match_id in match_ids:
+                frame = pipeline.match_slice(player_shots, match_id)
+                title = pipeline.match_title(fixtures, team, match_id)
+                if player != data.ALL_PLAYERS:
+                    title = f"{player} – {title}"
+                payload = _shot_payload(frame)
+                for kind in ("Heat Map", "Shot Map"):
+                    yield {"season": season, "team": team, "player": player, "match_id": match_id,
+                           "kind": kind, "title": title, "payload": payload}
+            if player != data.ALL_PLAYERS:
+                records = position_minutes(player_stats, player, team)
+                if records:
+                    yield {"season": season, "team": team, "player": player, "match_id": "all",
+                           "kind": "Positional Map", "title": player, "payload": records}
+
+
+def render_job(job, out_dir, fmt):
+    """Render one image (runs in a worker process)."""
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+    import pandas as pd
+
+    if job["kind"] == "Positional Map":
+        from soccer_stats.positions import plot_player_position_usage
+
+        fig = plot_player_position_usage(job["payload"], player_name=job["title"])
+    else:
+        from soccer_stats.render import render_shots
+
+        fig = render_shots(pd.DataFrame(job["payload"]), job["kind"], job["title"])
+    fig.savefig(Path(out_dir) / job["file"], format=fmt, bbox_inches="tight")
+    plt.close(fig)
+    return job["file"]
+
+
+def _render_star(args):
+    return render_job(*args)
+
+
+def build(seasons, out_dir, fmt="png", workers=None, prune=True):
+    """Render every missing image for ``seasons`` into ``out_dir``; returns (rendered, skipped)."""
+    out_dir = Path(out_dir)
+    (out_dir / "img").mkdir(parents=True, exist_ok=True)
+    entries, todo = [], []
+    for season in seasons:
+        shots = data.read_shots(season)
+        for job in plan_season(season, shots, data.read_team_matches(season), data.read_player_matches(season)):
+            slug = job["kind"].split()[0].lower()
+            job["file"] = f"img/{slug}-{content_hash(job['kind'], job['title'], job['payload'])}.{fmt}"
+            entries.append({k: job[k] for k in ("season", "team", "player", "match_id", "kind", "title", "file")})
+            if not (out_dir / job["file"]).exists():
+                todo.append(job)
+
+    # Identical inputs share one file, so render each file once
+    unique = {job["file"]: job for job in todo}
+    if unique:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            list(pool.map(_render_star, [(job, out_dir, fmt) for job in unique.values()], chunksize=8))
+
+    if prune:
+        keep = {e["file"] for e in entries}
+        for path in (out_dir / "img").glob(f"*.{fmt}"):
+            if f"img/{path.name}" not in keep:
+                path.unlink()
+
+    (out_dir / "index.json").write_text(json.dumps(entries, default=str, indent=1))
+    _write_html(out_dir, entries)
+    return len(unique), len(entries) - len(todo)
+
+
+def _write_html(out_dir, entries):
+    rows = []
+    for e in entries:
+        label = " / ".join(str(e[k]) for k in ("season", "team", "player", "title", "kind"))
+        rows.append(f'<li><a href="{html.escape(e["file"])}">{html.escape(label)}</a></li>')
+    (out_dir / "index.html").write_text(
+        "<!doctype html><meta charset='utf-8'><title>Shot Visualizer</title>"
+        "<h1>Premier League Shot Visualizer</h1><ul>" + "\n".join(rows) + "</ul>"
+    )
+
+
+def run(seasons, out, fmt="png", workers=None):
+    rendered, skipped = build(seasons, out, fmt, workers)
+    print(f"Rendered {rendered} images, {skipped} unchanged – {Path(out) / 'index.json'}")
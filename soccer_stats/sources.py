@@ -0,0 +1,166 @@
+"""Pluggable data sources for Understat frames.
+
+Every source exposes ``read(kind, season)`` returning a flat, validated
+DataFrame (see soccer_stats.validate), where ``kind`` is one of ``KINDS``:
+
+* ``UnderstatSource`` - live understat.com through soccerdata, or a replay
+  server standing in for it when given a ``base_url``.
+* ``LocalStore`` - Parquet files on disk, plus the CSVs shipped with the repo.
+* ``FallbackSource`` - reads the local store and only goes to the network on
+  a miss, saving what it fetched.
+
+``get_source()`` builds the configured source; the apps default to the local
+store with a live fallback.
+"""
+import functools
+import os
+
+import pandas as pd
+
+from soccer_stats import aggregates, config
+from soccer_stats.rawcache import RawCache, cached_understat
+from soccer_stats.scrape import patch_user_agent
+from soccer_stats.validate import validate
+
+KINDS = ("shots", "team_matches", "player_matches")
+
+# CSV exports shipped in DATA_DIR, used when the store has no Parquet file
+LEGACY_CSV = {
+    "team_matches": "Team_{season}_Stats.csv",
+    "player_matches": "Player_{season}_Stats.csv",
+}
+
+
+class SourceMiss(LookupError):
+    """Raised when a source has no data for the requested kind and season."""
+
+
+def _check_kind(kind):
+    if kind not in KINDS:
+        raise ValueError(f"Unknown data kind: {kind}")
+
+
+class UnderstatSource:
+    """Live Understat data via soccerdata."""
+
+    name = "live"
+    readers = {
+        "shots": "read_shot_events",
+        "team_matches": "read_team_match_stats",
+        "player_matches": "read_player_match_stats",
+    }
+
+    def __init__(self, base_url=None, raw_cache=None):
+        # base_url points soccerdata at a replay server instead of understat.com
+        self.base_url = base_url.rstrip("/") if base_url else None
+        self.raw_cache = raw_cache
+        self._understat = {}
+
+    def understat(self, season):
+        season = int(season)
+        if season not in self._understat:
+            import soccerdata.understat as sd_understat
+
+            patch_user_agent()
+            sd_understat.UNDERSTAT_URL = self.base_url or config.UNDERSTAT_URL
+            if self.base_url:
+                # Skip soccerdata's own cache and request throttling for replays
+                us = sd_understat.Understat(leagues=config.LEAGUE, seasons=season, no_cache=True, no_store=True)
+                us.rate_limit = 0
+                us.max_delay = 0
+            else:
+                # Raw pages go to the managed cache instead of soccerdata's own folder
+                us = cached_understat()(leagues=config.LEAGUE, seasons=season, no_store=True)
+                us.raw_cache = self.raw_cache or RawCache()
+                us.cache_season = season
+            self._understat[season] = us
+        return self._understat[season]
+
+    def read(self, kind, season):
+        _check_kind(kind)
+        frame = getattr(self.understat(season), self.readers[kind])().reset_index()
+        return validate(frame, kind)[0]
+
+
+class LocalStore:
+    """Frames stored on disk as ``<root>/<kind>_<season>.parquet``."""
+
+    name = "local"
+
+    def __init__(self, root=None, legacy_dir=None):
+        self.root = root or config.STORE_DIR
+        self.legacy_dir = legacy_dir or config.DATA_DIR
+
+    def path(self, kind, season):
+        return self.root / f"{kind}_{season}.parquet"
+
+    def has(self, kind, season):
+        return self.path(kind, season).exists() or self._legacy_path(kind, season) is not None
+
+    def _legacy_path(self, kind, season):
+        pattern = LEGACY_CSV.get(kind)
+        if pattern is None:
+            return None
+        path = self.legacy_dir / pattern.format(season=season)
+        return path if path.exists() else None
+
+    def read(self, kind, season):
+        _check_kind(kind)
+        path = self.path(kind, season)
+        if path.exists():
+            frame = pd.read_parquet(path)
+            # Stores written before validation existed lack the derived shot columns
+            return validate(frame, kind)[0] if kind == "shots" and "x" not in frame else frame
+        legacy = self._legacy_path(kind, season)
+        if legacy is not None:
+            return validate(pd.read_csv(legacy), kind)[0]
+        raise SourceMiss(f"No local {kind} data for season {season}")
+
+    def write(self, kind, season, frame):
+        """Store a frame that has already been through validate()."""
+        _check_kind(kind)
+        path = self.path(kind, season)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        frame.to_parquet(tmp, index=False)
+        tmp.replace(path)
+        # Corrected stats for games already seen change no aggregates, so move the data version on here
+        aggregates.touch(season)
+        return path
+
+
+def stored_seasons(kind, store=None):
+    """Seasons the local store can serve for ``kind`` without the network."""
+    store = store or LocalStore()
+    return [s for s in config.SEASONS if store.has(kind, s)]
+
+
+class FallbackSource:
+    """Local store first; fetch from ``remote`` on a miss and store the result."""
+
+    def __init__(self, local, remote):
+        self.local = local
+        self.remote = remote
+        self.name = f"{local.name}+{remote.name}"
+
+    def read(self, kind, season):
+        try:
+            return self.local.read(kind, season)
+        except SourceMiss:
+            frame = self.remote.read(kind, season)
+            self.local.write(kind, season, frame)
+            return frame
+
+
+@functools.lru_cache(maxsize=None)
+def get_source(name=None):
+    """Return the data source called ``name`` (defaults to ``config.SOURCE``)."""
+    name = name or config.SOURCE
+    if name == "local":
+        store = LocalStore()
+        return store if config.OFFLINE else FallbackSource(store, UnderstatSource())
+    if name == "live":
+        return UnderstatSource()
+    if name == "replay":
+        return UnderstatSource(base_url=config.REPLAY_URL)
+    raise ValueError(f"Unknown data source: {name}")
@@ -0,0 +1,200 @@
+"""Team-style clustering from match-level PPDA, deep completions and np xG.
+
+Fixture rows are reshaped to one row per team per match, smoothed into
+rolling style profiles, and clustered with a NumPy mini-batch k-means.
+Everything streams over chunks of fixtures (e.g. one season at a time) in
+date order: only the last ``window - 1`` matches per team are carried between
+chunks, so memory does not grow with the length of the history.
+"""
+import numpy as np
+import pandas as pd
+
+from soccer_stats import config
+from soccer_stats.fixtures import perspective
+
+STYLE_FEATURES = ["ppda", "ppda_allowed", "deep", "deep_allowed", "np_xg", "np_xga"]
+
+# feature -> (word when high, word when low), used to name clusters
+STYLE_WORDS = {
+    "ppda": ("sits off", "high press"),
+    "ppda_allowed": ("pressed hard", "unpressed build-up"),
+    "deep": ("deep territory", "few deep entries"),
+    "deep_allowed": ("concedes territory", "keeps opponents out"),
+    "np_xg": ("creates a lot", "low threat"),
+    "np_xga": ("leaky", "tight defence"),
+}
+
+DEFAULT_PATH = config.STORE_DIR / "team_styles.parquet"
+
+
+def team_perspective(matches):
+    """Two rows per fixture (home and away view) with the team's own and allowed numbers."""
+    return perspective(
+        matches,
+        {"ppda": "ppda", "deep": "deep_completions", "np_xg": "np_xg", "np_xg_difference": "np_xg_difference"},
+        {"ppda_allowed": "ppda", "deep_allowed": "deep_completions", "np_xga": "np_xg"},
+    )
+
+
+def rolling_profiles(team_matches, window=5, carry=None):
+    """Rolling mean of STYLE_FEATURES per team.
+
+    ``carry`` holds the previous chunk's last ``window - 1`` rows per team so the
+    windows run across chunk boundaries. Returns ``(profiles, new_carry)``.
+    """
+    frame = team_matches.assign(_carried=False)
+    if carry is not None and not carry.empty:
+        frame = pd.concat([carry.assign(_carried=True), frame], ignore_index=True)
+    frame = frame.sort_values(["team", "date"], kind="stable").reset_index(drop=True)
+
+    rolled = (
+        frame.groupby("team", sort=False)[STYLE_FEATURES]
+        .rolling(window, min_periods=1).mean()
+        .reset_index(level=0, drop=True)
+    )
+    frame[[f"{f}_roll" for f in STYLE_FEATURES]] = rolled[STYLE_FEATURES].to_numpy()
+
+    new_carry = frame.groupby("team", sort=False).tail(window - 1)[team_matches.columns]
+    profiles = frame[~frame["_carried"]].drop(columns="_carried")
+    return profiles, new_carry
+
+
+def profile_matrix(profiles):
+    return profiles[[f"{f}_roll" for f in STYLE_FEATURES]].to_numpy(dtype=np.float64)
+
+
+class MiniBatchKMeans:
+    """Vectorized k-means that can be fitted chunk by chunk."""
+
+    def __init__(self, k=6, seed=0):
+        self.k = k
+        self.rng = np.random.default_rng(seed)
+        self.centers = None
+        self.counts = None
+
+    def _init_centers(self, X):
+        # k-means++ seeding on the first batch
+        centers = [X[self.rng.integers(len(X))]]
+        for _ in range(1, self.k):
+            d2 = np.min(((X[:, None, :] - np.array(centers)[None]) ** 2).sum(-1), axis=1)
+            probs = d2 / d2.sum() if d2.sum() > 0 else None
+            centers.append(X[self.rng.choice(len(X), p=probs)])
+        self.centers = np.array(centers)
+        self.counts = np.zeros(self.k)
+
+    def predict(self, X):
+        # ||x - c||^2 = ||x||^2 - 2 x.c + ||c||^2 ; ||x||^2 is constant per row
+        d = -2 * X @ self.centers.T + (self.centers ** 2).sum(axis=1)
+        return np.argmin(d, axis=1)
+
+    def partial_fit(self, X, iters=3):
+        if len(X) == 0:
+            return self
+        if self.centers is None:
+            self._init_centers(X)
+        for _ in range(iters):
+            labels = self.predict(X)
+            n = np.bincount(labels, minlength=self.k).astype(float)
+            sums = np.zeros_like(self.centers)
+            np.add.at(sums, labels, X)
+            seen = n > 0
+            self.counts[seen] += n[seen]
+            # Running mean update of each center with this batch
+            self.centers[seen] += (sums[seen] - n[seen, None] * self.centers[seen]) / self.counts[seen, None]
+        return self
+
+
+class _Scaler:
+    """Running mean/std accumulated across chunks."""
+
+    def __init__(self):
+        self.n = 0
+        self.total = 0.0
+        self.total_sq = 0.0
+
+    def update(self, X):
+        self.n += len(X)
+        self.total = self.total + X.sum(axis=0)
+        self.total_sq = self.total_sq + (X ** 2).sum(axis=0)
+
+    @property
+    def mean(self):
+        return self.total / self.n
+
+    @property
+    def std(self):
+        std = np.sqrt(np.maximum(self.total_sq / self.n - self.mean ** 2, 0))
+        return np.where(std > 0, std, 1)
+
+    def transform(self, X):
+        return (X - self.mean) / self.std
+
+
+def _profile_chunks(chunks, window):
+    carry = None
+    for chunk in chunks():
+        profiles, carry = rolling_profiles(team_perspective(chunk), window, carry)
+        yield profiles
+
+
+def describe_centers(centers_z):
+    """Short name per cluster from its two most distinctive features."""
+    names = []
+    for center in centers_z:
+        top = np.argsort(-np.abs(center))[:2]
+        words = [STYLE_WORDS[STYLE_FEATURES[i]][0 if center[i] > 0 else 1] for i in top]
+        names.append(", ".join(words))
+    return names
+
+
+def run_pipeline(chunks, k=6, window=5, out=DEFAULT_PATH, seed=0):
+    """Cluster team-matches and write assignments to ``out`` (Parquet).
+
+    ``chunks`` is a callable returning an iterator of fixture frames in date
+    order; it is called three times (scaling, fitting, assignment) so each
+    pass streams the data instead of holding it.
+    """
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    scaler = _Scaler()
+    for profiles in _profile_chunks(chunks, window):
+        scaler.update(profile_matrix(profiles))
+
+    model = MiniBatchKMeans(k, seed)
+    for profiles in _profile_chunks(chunks, window):
+        model.partial_fit(scaler.transform(profile_matrix(profiles)))
+
+    names = describe_centers(model.centers)
+    out.parent.mkdir(parents=True, exist_ok=True)
+    writer = None
+    try:
+        for profiles in _profile_chunks(chunks, window):
+            labels = model.predict(scaler.transform(profile_matrix(profiles)))
+            assigned = profiles.assign(style_cluster=labels, style=[names[i] for i in labels])
+            table = pa.Table.from_pandas(assigned, preserve_index=False)
+            if writer is None:
+                writer = pq.ParquetWriter(out, table.schema)
+            writer.write_table(table.cast(writer.schema))
+    finally:
+        if writer is not None:
+            writer.close()
+    return out, names
+
+
+def load_styles(path=DEFAULT_PATH):
+    return pd.read_parquet(path) if path.exists() else None
+
+
+def run(seasons, k=6, window=5, out=None):
+    from soccer_stats.sources import get_source
+
+    def chunks():
+        # Straight from the source: data.read_* would keep every season memoized
+        for season in sorted(seasons):
+            yield get_source().read("team_matches", season).sort_values("date")
+
+    path, names = run_pipeline(chunks, k, window, out or DEFAULT_PATH)
+    for i, name in enumerate(names):
+        print(f"{i}: {name}")
+    print(f"Saved {path}")
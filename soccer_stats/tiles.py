@@ -0,0 +1,130 @@
+"""Pre-aggregated payloads for the interactive Plotly map.
+
+Instead of sending every shot to the browser, the server sends
+
+* a density grid for the visible part of the pitch, quantized to uint8, and
+* at most ``max_per_cell`` shots per grid cell (highest xG first),
+
+both as compact NumPy arrays, which Plotly serializes as base64 typed arrays.
+Zooming in (a smaller viewport) keeps the same grid size, so detail goes up
+while the payload stays a few kilobytes no matter how many shots are behind
+it.
+"""
+import numpy as np
+
+from soccer_stats.density import shot_density
+from soccer_stats.pitch import PITCH_THEMES
+
+# name -> (x0, x1, y0, y1) in 120 x 80 pitch coordinates
+VIEWPORTS = {
+    "Full pitch": (0, 120, 0, 80),
+    "Attacking half": (60, 120, 0, 80),
+    "Final third": (80, 120, 0, 80),
+    "Penalty box": (96, 120, 12, 68),
+}
+GRID = (48, 32)
+MAX_PER_CELL = 2
+
+
+def _in_view(x, y, viewport):
+    x0, x1, y0, y1 = viewport
+    return (x >= x0) & (x <= x1) & (y >= y0) & (y <= y1)
+
+
+def _cell_ids(x, y, viewport, grid):
+    x0, x1, y0, y1 = viewport
+    ix = np.clip(((x - x0) / (x1 - x0) * grid[0]).astype(np.int64), 0, grid[0] - 1)
+    iy = np.clip(((y - y0) / (y1 - y0) * grid[1]).astype(np.int64), 0, grid[1] - 1)
+    return ix * grid[1] + iy
+
+
+def decimate(x, y, xg, viewport, grid=GRID, max_per_cell=MAX_PER_CELL):
+    """Indices of at most ``max_per_cell`` highest-xG shots per grid cell."""
+    idx = np.flatnonzero(_in_view(x, y, viewport))
+    if idx.size == 0:
+        return idx
+    cells = _cell_ids(x[idx], y[idx], viewport, grid)
+    order = np.lexsort((-xg[idx], cells))
+    cells = cells[order]
+    # Rank of each shot within its cell after sorting by (cell, -xg)
+    starts = np.flatnonzero(np.r_[True, cells[1:] != cells[:-1]])
+    rank = np.arange(cells.size) - np.repeat(starts, np.diff(np.r_[starts, cells.size]))
+    return np.sort(idx[order][rank < max_per_cell])
+
+
+def build_tile(shots, viewport_name="Full pitch", grid=GRID, max_per_cell=MAX_PER_CELL):
+    """Density grid + decimated points for ``shots`` (x/y/xg/result columns)."""
+    viewport = VIEWPORTS[viewport_name]
+    x = shots["x"].to_numpy(dtype=np.float64)
+    y = shots["y"].to_numpy(dtype=np.float64)
+    xg = shots["xg"].to_numpy(dtype=np.float64) if "xg" in shots else np.zeros(len(x))
+
+    x0, x1, y0, y1 = viewport
+    in_view = _in_view(x, y, viewport)
+    # Re-bin the visible part of the pitch onto the same grid size
+    grid_x = (x[in_view] - x0) / (x1 - x0) * 120
+    grid_y = (y[in_view] - y0) / (y1 - y0) * 80
+    density = shot_density(grid_x, grid_y, bins=grid, sigma=grid[0] / 24)
+    peak = float(density.max())
+    quantized = np.round(density / peak * 255).astype(np.uint8) if peak > 0 else density.astype(np.uint8)
+
+    keep = decimate(x, y, xg, viewport, grid, max_per_cell)
+    goals = (shots["result"].to_numpy()[keep] == "Goal") if "result" in shots else np.zeros(keep.size, bool)
+    return {
+        "viewport": viewport,
+        "density": quantized.T.copy(),  # rows = y for plotting
+        "peak": peak,
+        "x": x[keep].astype(np.float32),
+        "y": y[keep].astype(np.float32),
+        "xg": xg[keep].astype(np.float32),
+        "goal": goals.astype(np.uint8),
+        "total_shots": int(len(x)),
+    }
+
+
+def payload_bytes(tile):
+    """Approximate size of the array data sent to the browser."""
+    return sum(tile[k].nbytes for k in ("density", "x", "y", "xg", "goal"))
+
+
+def _pitch_shapes(line):
+    def rect(x0, y0, x1, y1):
+        return dict(type="rect", x0=x0, y0=y0, x1=x1, y1=y1, line=dict(color=line), layer="above")
+
+    return [
+        rect(0, 0, 120, 80), rect(0, 18, 18, 62), rect(102, 18, 120, 62),
+        rect(0, 32, 6, 48), rect(114, 32, 120, 48),
+        dict(type="line", x0=60, y0=0, x1=60, y1=80, line=dict(color=line), layer="above"),
+        dict(type="circle", x0=50, y0=30, x1=70, y1=50, line=dict(color=line), layer="above"),
+    ]
+
+
+def plotly_figure(tile, title="", theme="Grass"):
+    import plotly.graph_objects as go
+
+    facecolor, line = PITCH_THEMES.get(theme, PITCH_THEMES["Grass"])
+    x0, x1, y0, y1 = tile["viewport"]
+    rows, cols = tile["density"].shape
+    fig = go.Figure()
+    fig.add_trace(go.Heatmap(
+        z=tile["density"], x0=x0 + (x1 - x0) / cols / 2, dx=(x1 - x0) / cols,
+        y0=y0 + (y1 - y0) / rows / 2, dy=(y1 - y0) / rows,
+        zmin=0, zmax=255, showscale=False, hoverinfo="skip",
+        # Lowest band transparent, like kdeplot's thresh
+        colorscale=[[0, "rgba(0,0,0,0)"], [0.05, "rgba(0,0,0,0)"], [0.05, "rgba(254,224,210,0.8)"], [1, "rgba(165,15,21,0.9)"]],
+    ))
+    goal = tile["goal"] == 1
+    for mask, symbol, color in ((~goal, "x", "white"), (goal, "circle", "lime")):
+        fig.add_trace(go.Scattergl(
+            x=tile["x"][mask], y=tile["y"][mask], mode="markers", customdata=tile["xg"][mask],
+            marker=dict(size=7, symbol=symbol, color=color),
+            hovertemplate="xG %{customdata:.2f}<extra></extra>",
+        ))
+    fig.update_layout(
+        title=f"{title} ({tile['total_shots']} shots, showing {len(tile['x'])})",
+        shapes=_pitch_shapes(line), plot_bgcolor=facecolor, showlegend=False,
+        xaxis=dict(range=[x0, x1], showgrid=False, zeroline=False, visible=False),
+        yaxis=dict(range=[y0, y1], showgrid=False, zeroline=False, visible=False, scaleanchor="x"),
+        margin=dict(l=10, r=10, t=40, b=10),
+    )
+    return fig
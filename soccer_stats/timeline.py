@@ -0,0 +1,189 @@
+"""Match timelines: cumulative xG race charts rebuilt from shot events.
+
+A season's shots are sorted once by (game_id, minute, shot_id) and both
+sides' running xG comes from two ``np.cumsum`` calls over the whole season,
+rebased at each match boundary. The result is kept as flat per-shot arrays
+plus ``game_ids``/``offsets``, so one match's timeline is an array slice
+found by ``searchsorted``, and a season saves to a single ``.npz`` named
+after the data version, so an ingest leads to a rebuild.
+"""
+import numpy as np
+
+from soccer_stats import aggregates, config
+
+DEFAULT_DIR = config.STORE_DIR
+MOMENTUM_WINDOW = 10  # minutes
+HOME_COLOR, AWAY_COLOR = "tab:red", "tab:blue"
+
+
+def _timeline_path(season, root=DEFAULT_DIR):
+    return aggregates.derived_path(root, "timelines", season, ".npz")
+
+
+class MatchTimelines:
+    ARRAYS = ("game_ids", "offsets", "home_team", "away_team", "home_goals", "away_goals",
+              "minute", "xg", "home", "goal", "player", "home_cum", "away_cum", "players")
+
+    def __init__(self, **arrays):
+        for name in self.ARRAYS:
+            setattr(self, name, arrays[name])
+
+    # ------------------------ Building ------------------------
+    @classmethod
+    def from_frames(cls, shots, matches):
+        """Timelines for every played fixture in ``matches`` from that season's ``shots``.
+
+        Fixtures without a result (``validate`` keeps them with NA goals) are
+        left out, so ``match`` raises KeyError for them.
+        """
+        fixtures = matches.dropna(subset=["home_goals", "away_goals"]).sort_values("game_id")
+        game_ids = fixtures["game_id"].to_numpy(np.int64)
+        home_ids = fixtures.set_index("game_id")["home_team_id"]
+
+        # Shots of games missing from ``matches`` are dropped
+        shots = shots[shots["game_id"].isin(game_ids)]
+        game = shots["game_id"].to_numpy(np.int64)
+        minute = shots["minute"].fillna(0).to_numpy(np.int16)
+        order = np.lexsort((shots["shot_id"].to_numpy(), minute, game))
+        game, minute = game[order], minute[order]
+        xg = shots["xg"].to_numpy(np.float32)[order]
+        home = (shots["team_id"].to_numpy() == shots["game_id"].map(home_ids).to_numpy())[order]
+        goal = (shots["result"] == "Goal").to_numpy()[order]
+        player, players = _codes(shots["player"].to_numpy()[order])
+
+        # Season-wide running sums, rebased to zero at the first shot of each match
+        home_xg, away_xg = np.where(home, xg, 0), np.where(home, 0, xg)
+        home_cum, away_cum = np.cumsum(home_xg, dtype=np.float64), np.cumsum(away_xg, dtype=np.float64)
+        offsets = np.r_[np.searchsorted(game, game_ids, "left"), len(game)].astype(np.int64)
+        lengths = np.diff(offsets)
+        first = offsets[:-1][lengths > 0]
+        home_cum -= np.repeat(home_cum[first] - home_xg[first], lengths[lengths > 0])
+        away_cum -= np.repeat(away_cum[first] - away_xg[first], lengths[lengths > 0])
+
+        return cls(
+            game_ids=game_ids, offsets=offsets,
+            home_team=fixtures["home_team"].to_numpy(str), away_team=fixtures["away_team"].to_numpy(str),
+            home_goals=fixtures["home_goals"].to_numpy(np.int16), away_goals=fixtures["away_goals"].to_numpy(np.int16),
+            minute=minute, xg=xg, home=home, goal=goal, player=player,
+            home_cum=home_cum.astype(np.float32), away_cum=away_cum.astype(np.float32),
+            players=players,
+        )
+
+    def save(self, path):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(path.stem + ".tmp.npz")
+        np.savez(tmp, **{name: getattr(self, name) for name in self.ARRAYS})
+        tmp.replace(path)
+        return path
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as archive:
+            return cls(**{name: archive[name] for name in cls.ARRAYS})
+
+    # ------------------------ Access ------------------------
+    def __len__(self):
+        return len(self.game_ids)
+
+    def match(self, game_id):
+        """One match's timeline: array slices plus the fixture's teams and score."""
+        i = int(np.searchsorted(self.game_ids, game_id))
+        if i == len(self.game_ids) or self.game_ids[i] != game_id:
+            raise KeyError(game_id)
+        rows = slice(self.offsets[i], self.offsets[i + 1])
+        return {
+            "game_id": int(game_id),
+            "home_team": str(self.home_team[i]), "away_team": str(self.away_team[i]),
+            "home_goals": int(self.home_goals[i]), "away_goals": int(self.away_goals[i]),
+            "minute": self.minute[rows], "xg": self.xg[rows], "home": self.home[rows],
+            "goal": self.goal[rows], "player": self.players[self.player[rows]],
+            "home_cum": self.home_cum[rows], "away_cum": self.away_cum[rows],
+        }
+
+
+def _codes(values):
+    players, codes = np.unique(values.astype(str), return_inverse=True)
+    return codes.astype(np.int32), players
+
+
+def momentum(timeline, window=MOMENTUM_WINDOW):
+    """Home minus away xG over the trailing ``window`` minutes, for each minute of the match."""
+    minute = timeline["minute"].astype(np.int64)
+    length = max(int(minute.max()) + 1 if len(minute) else 0, 91)
+    signed = np.where(timeline["home"], timeline["xg"], -timeline["xg"]).astype(np.float64)
+    per_minute = np.bincount(minute, weights=signed, minlength=length)
+    return np.convolve(per_minute, np.ones(window))[:length]
+
+
+def load_season(season, root=DEFAULT_DIR):
+    """Timelines for a season, (re)built from the stored frames when missing or stale."""
+    path = _timeline_path(season, root)
+    if path.exists():
+        return MatchTimelines.load(path)
+    from soccer_stats import data
+
+    timelines = MatchTimelines.from_frames(data.read_shots(season), data.read_team_matches(season))
+    timelines.save(path)
+    aggregates.prune_derived(path)
+    return timelines
+
+
+# ------------------------ Rendering ------------------------
+def plot_race(timeline, title=None, window=MOMENTUM_WINDOW):
+    """Cumulative xG step chart for both sides, goals marked, with momentum bars below."""
+    import matplotlib.pyplot as plt
+
+    fig, (ax, bars) = plt.subplots(2, 1, figsize=(10, 6), sharex=True, gridspec_kw={"height_ratios": [3, 1]})
+    minute = timeline["minute"].astype(np.float64)
+    end = max(float(minute.max()) if len(minute) else 0.0, 90.0) + 2
+    home = timeline["home"]
+
+    for side, mask, cum, color in (("home", home, timeline["home_cum"], HOME_COLOR),
+                                   ("away", ~home, timeline["away_cum"], AWAY_COLOR)):
+        x = np.r_[0, minute[mask], end]
+        y = np.r_[0, cum[mask], cum[mask][-1] if mask.any() else 0]
+        ax.step(x, y, where="post", color=color, linewidth=2,
+                label=f"{timeline[f'{side}_team']} ({y[-1]:.2f} xG)")
+        scored = mask & timeline["goal"]
+        ax.scatter(minute[scored], cum[scored], s=80, color=color, edgecolor="black", zorder=3)
+        for mx, my, name in zip(minute[scored], cum[scored], timeline["player"][scored]):
+            ax.annotate(name, (mx, my), xytext=(4, 6), textcoords="offset points", fontsize=8)
+
+    swing = momentum(timeline, window)
+    bars.bar(np.arange(len(swing)), swing, width=1.0, color=np.where(swing >= 0, HOME_COLOR, AWAY_COLOR))
+    bars.axhline(0, color="black", linewidth=0.8)
+    bars.set_ylabel(f"xG, last {window}'")
+    bars.set_xlabel("Minute")
+
+    ax.set_ylabel("Cumulative xG")
+    ax.set_xlim(0, end)
+    ax.legend(loc="upper left")
+    ax.set_title(title or f"{timeline['home_team']} {timeline['home_goals']}–{timeline['away_goals']} "
+                          f"{timeline['away_team']}", fontsize=14)
+    fig.tight_layout()
+    return fig
+
+
+def run(season, game_id=None, out=None):
+    import time
+
+    import matplotlib.pyplot as plt
+
+    from soccer_stats import data
+
+    start = time.perf_counter()
+    timelines = MatchTimelines.from_frames(data.read_shots(season), data.read_team_matches(season))
+    print(f"Built {len(timelines)} match timelines in {time.perf_counter() - start:.3f}s")
+    path = timelines.save(_timeline_path(season))
+    aggregates.prune_derived(path)
+    print(f"Saved {path}")
+    if game_id is None:
+        return
+    try:
+        fig = plot_race(timelines.match(game_id))
+    except KeyError:
+        raise SystemExit(f"No xG timeline for match {game_id} in {season}.") from None
+    if out:
+        fig.savefig(out, dpi=120, bbox_inches="tight")
+    else:
+        plt.show()
@@ -0,0 +1,131 @@
+"""Schema checks, normalization and de-duplication at ingestion time.
+
+Every frame entering the local store goes through ``validate`` once: column
+names are normalized, dtypes coerced, duplicate keys dropped and
+out-of-range rows removed, and shots get their pitch ``x``/``y``
+coordinates. Everything is column-wise, so downstream code can trust the
+frames instead of re-checking and copying them on every view.
+"""
+import numpy as np
+import pandas as pd
+
+
+class ValidationError(ValueError):
+    """Raised when a frame is missing required columns (or any issue in strict mode)."""
+
+
+# Upstream / legacy column names -> names used everywhere else
+RENAMES = {
+    "time": "minutes",
+    "xG": "xg",
+    "X": "location_x",
+    "Y": "location_y",
+    "h_team": "home_team",
+    "a_team": "away_team",
+}
+
+# kind -> column -> expected dtype ("int", "float", "str", "datetime")
+SCHEMAS = {
+    "shots": {
+        "game_id": "int", "team_id": "int", "team": "str", "player_id": "int", "player": "str",
+        "xg": "float", "location_x": "float", "location_y": "float", "minute": "int", "result": "str",
+    },
+    "team_matches": {
+        "game_id": "int", "date": "datetime", "home_team": "str", "away_team": "str",
+        "home_team_code": "str", "away_team_code": "str",
+        "home_goals": "int", "away_goals": "int", "home_xg": "float", "away_xg": "float",
+    },
+    "player_matches": {
+        "game_id": "int", "team": "str", "player_id": "int", "player": "str", "position": "str",
+        "minutes": "int", "goals": "int", "shots": "int", "xg": "float", "xa": "float",
+    },
+}
+
+# Rows with duplicate keys are dropped (last one wins)
+KEYS = {
+    "shots": ["shot_id"],
+    "team_matches": ["game_id"],
+    "player_matches": ["game_id", "player_id"],
+}
+
+# column -> (min, max); rows outside are dropped
+RANGES = {
+    "shots": {"location_x": (0, 1), "location_y": (0, 1), "xg": (0, 1), "minute": (0, 130)},
+    "team_matches": {},
+    "player_matches": {"minutes": (0, 130), "xg": (0, None), "xa": (0, None)},
+}
+
+
+def normalize_columns(frame):
+    """Drop index leftovers, lower-case names and apply RENAMES."""
+    drop = [c for c in frame.columns if str(c).startswith("Unnamed: ") or c in ("index", "level_0")]
+    frame = frame.drop(columns=drop)
+    renamed = {c: RENAMES.get(c, str(c).lower()) for c in frame.columns}
+    return frame.rename(columns=renamed)
+
+
+def _coerce(series, dtype):
+    if dtype == "int":
+        if pd.api.types.is_integer_dtype(series):
+            return series
+        values = pd.to_numeric(series, errors="coerce")
+        return values.astype("Int64") if values.isna().any() else values.astype("int64")
+    if dtype == "float":
+        return series if pd.api.types.is_float_dtype(series) else pd.to_numeric(series, errors="coerce").astype("float64")
+    if dtype == "datetime":
+        return series if pd.api.types.is_datetime64_any_dtype(series) else pd.to_datetime(series, errors="coerce")
+    return series
+
+
+def validate(frame, kind, strict=False):
+    """Return ``(clean_frame, report)`` for a frame of ``kind`` (see sources.KINDS)."""
+    if kind not in SCHEMAS:
+        raise ValueError(f"Unknown data kind: {kind}")
+    report = {"rows_in": len(frame), "coerced": [], "duplicates": 0, "out_of_range": {}}
+    frame = normalize_columns(frame)
+
+    schema = SCHEMAS[kind]
+    missing = [c for c in schema if c not in frame.columns]
+    if missing:
+        raise ValidationError(f"{kind} is missing columns: {missing}")
+
+    for column, dtype in schema.items():
+        coerced = _coerce(frame[column], dtype)
+        if coerced is not frame[column]:
+            frame[column] = coerced
+            report["coerced"].append(column)
+
+    keys = [k for k in KEYS[kind] if k in frame.columns]
+    if keys:
+        dup = frame.duplicated(keys, keep="last").to_numpy()
+        report["duplicates"] = int(dup.sum())
+    else:
+        dup = np.zeros(len(frame), dtype=bool)
+
+    bad = dup.copy()
+    for column, (low, high) in RANGES[kind].items():
+        if column not in frame.columns:
+            continue
+        values = frame[column].to_numpy(dtype=np.float64, na_value=np.nan)
+        out = np.zeros(len(values), dtype=bool)
+        if low is not None:
+            out |= values < low
+        if high is not None:
+            out |= values > high
+        if out.any():
+            report["out_of_range"][column] = int(out.sum())
+        bad |= out
+
+    if strict and bad.any():
+        raise ValidationError(f"{kind} failed validation: {report}")
+    if bad.any():
+        frame = frame[~bad]
+    frame = frame.reset_index(drop=True)
+
+    if kind == "shots":
+        # Pitch coordinates (120 x 80, StatsBomb orientation) computed once here
+        frame["x"] = frame["location_x"] * 120
+        frame["y"] = (1 - frame["location_y"]) * 80
+
+    report["rows_out"] = len(frame)
+    return frame, report
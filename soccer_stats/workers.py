@@ -0,0 +1,112 @@
+"""Persistent process pool for heavy work requested by the Streamlit apps.
+
+Rendering and aggregation run in worker processes instead of the Streamlit
+script thread, so concurrent sessions use every core rather than queueing
+on one GIL. Jobs are named functions in ``JOBS`` taking plain parameters
+(season, team, ...); workers load frames from the local store themselves and
+keep them memoized, so nothing large is pickled per job. Rendered images
+come back through the render cache.
+"""
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from soccer_stats import aggregates
+from soccer_stats.render_cache import RenderCache, cache_key
+
+
+# ------------------------ Jobs (run inside workers) ------------------------
+def _select(season, team, player, match_id, outcomes):
+    from soccer_stats import data, pipeline
+
+    shots = pipeline.team_slice(data.read_shots(int(season)), team)
+    shots = pipeline.match_slice(pipeline.player_slice(shots, player), match_id)
+    return pipeline.outcome_filter(shots, list(outcomes)) if outcomes is not None else shots
+
+
+def job_render_shots(season, team, player, match_id, outcomes, plot_type="Heat Map",
+                     show_xg=False, show_names=False, theme="Grass", show_zones=False, version=0):
+    """Render a heat map / shot map to PNG; returns the render cache key.
+
+    ``version`` is the season's data version, so renders of older data never match.
+    """
+    import matplotlib
+    matplotlib.use("Agg")
+    from soccer_stats import data, pipeline, zones
+    from soccer_stats.render import figure_png, render_shots
+
+    params = dict(season=season, team=team, player=player, match_id=match_id, outcomes=outcomes,
+                  plot_type=plot_type, show_xg=show_xg, show_names=show_names, theme=theme,
+                  show_zones=show_zones, version=version)
+    key = cache_key("render_shots", params)
+    cache = RenderCache()
+    if cache.get(key) is None:
+        title = pipeline.match_title(pipeline.match_table(data.read_team_matches(int(season)), team), team, match_id)
+        zone_values = zones.load_season(int(season))["zones"] if show_zones else None
+        fig = render_shots(_select(season, team, player, match_id, outcomes), plot_type, title,
+                           show_xg, show_names, theme, zone_values)
+        cache.put(key, figure_png(fig))
+    return key
+
+
+JOBS = {
+    "render_shots": job_render_shots,
+}
+
+
+def _run_job(kind, params):
+    return JOBS[kind](**params)
+
+
+# ------------------------ Pool (used by the apps) ------------------------
+class ComputePool:
+    def __init__(self, workers=None, cache=None):
+        # forkserver/spawn: Streamlit's parent process is multi-threaded
+        method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+        self.workers = workers or os.cpu_count() or 1
+        self.executor = ProcessPoolExecutor(max_workers=self.workers, mp_context=multiprocessing.get_context(method))
+        self.cache = cache or RenderCache()
+
+    def submit(self, kind, **params):
+        """Queue a job; returns a concurrent.futures.Future of its raw result."""
+        if kind not in JOBS:
+            raise ValueError(f"Unknown job: {kind}")
+        return self.executor.submit(_run_job, kind, params)
+
+    @staticmethod
+    def render_params(**params):
+        """Complete, normalized parameters of a render_shots job."""
+        defaults = dict(outcomes=None, plot_type="Heat Map", show_xg=False, show_names=False,
+                        theme="Grass", show_zones=False)
+        params = defaults | params
+        # Plain Python types so the parent and the worker derive the same cache key
+        if params["outcomes"] is not None:
+            params["outcomes"] = [str(o) for o in params["outcomes"]]
+        if params["match_id"] != "all":
+            params["match_id"] = int(params["match_id"])
+        params["season"] = int(params["season"])
+        params["version"] = aggregates.version(params["season"])
+        return params
+
+    def render_shots(self, **params):
+        """PNG bytes for a render job, straight from the cache when already rendered."""
+        params = self.render_params(**params)
+        cached = self.cache.get(cache_key("render_shots", params))
+        if cached is not None:
+            return cached
+        key = self.submit("render_shots", **params).result()
+        return self.cache.get(key)
+
+    def shutdown(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+
+_pool = None
+
+
+def get_pool(workers=None):
+    """Process-wide pool shared by every session."""
+    global _pool
+    if _pool is None:
+        _pool = ComputePool(workers)
+    return _pool
@@ -0,0 +1,137 @@
+"""Zone-value model from shot locations.
+
+The pitch is cut into a ``ZONE_GRID`` of zones; every shot gets a flat zone
+id and per-zone volume, goals and xG come from ``np.bincount``. Teams and
+players are compared with the league baseline in the same pass by offsetting
+zone ids with a group code (``group * n_zones + zone``), so one bincount per
+measure covers every group at once.
+"""
+import os
+
+import numpy as np
+import pandas as pd
+
+from soccer_stats import aggregates, config
+
+ZONE_GRID = (12, 8)  # zones along the length and width of the 120 x 80 pitch
+
+
+def zone_ids(x, y, grid=ZONE_GRID):
+    ix = np.clip((np.asarray(x) / 120 * grid[0]).astype(np.int64), 0, grid[0] - 1)
+    iy = np.clip((np.asarray(y) / 80 * grid[1]).astype(np.int64), 0, grid[1] - 1)
+    return ix * grid[1] + iy
+
+
+def _shot_arrays(shots):
+    # Pitch coordinates as added by ``validate``
+    x = shots["x"].to_numpy(dtype=np.float64)
+    y = shots["y"].to_numpy(dtype=np.float64)
+    goals = (shots["result"] == "Goal").to_numpy(dtype=np.float64)
+    xg = shots["xg"].to_numpy(dtype=np.float64)
+    return zone_ids(x, y), goals, xg
+
+
+def league_zones(shots, grid=ZONE_GRID):
+    """Per-zone shots, goals, xG, conversion and xG per shot."""
+    zones, goals, xg = _shot_arrays(shots)
+    n = grid[0] * grid[1]
+    volume = np.bincount(zones, minlength=n).astype(np.float64)
+    scored = np.bincount(zones, weights=goals, minlength=n)
+    xg_sum = np.bincount(zones, weights=xg, minlength=n)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        table = pd.DataFrame({
+            "zone": np.arange(n),
+            "zone_x": np.arange(n) // grid[1],
+            "zone_y": np.arange(n) % grid[1],
+            "shots": volume,
+            "goals": scored,
+            "xg": xg_sum,
+            "conversion": np.where(volume > 0, scored / volume, 0.0),
+            "xg_per_shot": np.where(volume > 0, xg_sum / volume, 0.0),
+        })
+    return table
+
+
+def group_performance(shots, by, league=None, grid=ZONE_GRID):
+    """Goals and xG of each ``by`` group against the league zone baseline.
+
+    ``zone_expected_goals`` is what the group's shots would have scored at the
+    league's conversion rate for the zones they were taken from.
+    """
+    league = league_zones(shots, grid) if league is None else league
+    zones, goals, xg = _shot_arrays(shots)
+    codes, names = pd.factorize(shots[by])
+    # Shots without a ``by`` label (code -1) count for the league only
+    labelled = codes >= 0
+    zones, goals, xg, codes = zones[labelled], goals[labelled], xg[labelled], codes[labelled]
+    n_zones = grid[0] * grid[1]
+    n = len(names) * n_zones
+    flat = codes * n_zones + zones
+    volume = np.bincount(flat, minlength=n).reshape(len(names), n_zones)
+
+    conversion = league["conversion"].to_numpy()
+    xg_per_shot = league["xg_per_shot"].to_numpy()
+    out = pd.DataFrame({
+        by: names,
+        "shots": volume.sum(axis=1),
+        "goals": np.bincount(codes, weights=goals, minlength=len(names)),
+        "xg": np.bincount(codes, weights=xg, minlength=len(names)),
+        "zone_expected_goals": volume @ conversion,
+        "zone_expected_xg": volume @ xg_per_shot,
+    })
+    out["goals_vs_zone"] = out["goals"] - out["zone_expected_goals"]
+    out["xg_vs_zone"] = out["xg"] - out["zone_expected_xg"]
+    return out.sort_values("goals_vs_zone", ascending=False).reset_index(drop=True)
+
+
+# ------------------------ Season cache ------------------------
+PARTS = ("zones", "teams", "players")
+
+
+def _cache_path(season, part):
+    # Keyed on the data version, so ingest invalidates it
+    return aggregates.derived_path(config.STORE_DIR, f"zones_{part}", season)
+
+
+def compute_season(shots, season=None):
+    """League zones plus team and player performance; cached when ``season`` is given."""
+    league = league_zones(shots)
+    result = {
+        "zones": league,
+        "teams": group_performance(shots, "team", league),
+        "players": group_performance(shots, "player", league),
+    }
+    if season is not None:
+        config.STORE_DIR.mkdir(parents=True, exist_ok=True)
+        for part, frame in result.items():
+            path = _cache_path(season, part)
+            tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+            frame.to_parquet(tmp, index=False)
+            tmp.replace(path)
+            aggregates.prune_derived(path)
+    return result
+
+
+def load_season(season, shots=None):
+    """Cached zone values for a season, computing them (from ``shots`` if given) on first use."""
+    paths = {part: _cache_path(season, part) for part in PARTS}
+    if all(p.exists() for p in paths.values()):
+        return {part: pd.read_parquet(p) for part, p in paths.items()}
+    if shots is None:
+        from soccer_stats import data
+
+        shots = data.read_shots(season)
+    return compute_season(shots, season)
+
+
+def zone_grid(league, value="conversion", grid=ZONE_GRID):
+    """Zone values as a (width, length) array ready for ``imshow``."""
+    return league[value].to_numpy().reshape(grid).T
+
+
+def plot_zone_overlay(ax, league, value="conversion", cmap="viridis", alpha=0.35):
+    # Zones nobody shot from stay uncoloured
+    values = np.ma.masked_where(zone_grid(league, "shots") == 0, zone_grid(league, value))
+    image = ax.imshow(values, extent=(0, 120, 0, 80), origin="lower",
+                      cmap=cmap, alpha=alpha, aspect="auto", zorder=1)
+    return image
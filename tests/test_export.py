@@ -0,0 +1,32 @@
+import io
+import os
+
+import pandas as pd
+import pytest
+
+from soccer_stats.export import export_to_tempfile
+
+SHOTS = pd.DataFrame({"id": range(5), "player": list("abcde"), "xG": [0.1, 0.2, 0.3, 0.4, 0.5]})
+
+
+@pytest.mark.parametrize("fmt", ["CSV", "CSV (gzip)"])
+def test_export_is_a_file_streamlit_accepts(fmt):
+    with export_to_tempfile(SHOTS, fmt, chunk_rows=2) as fh:
+        # download_button takes str, bytes, TextIOWrapper, BytesIO, BufferedReader or RawIOBase
+        assert isinstance(fh, io.BufferedReader)
+        compression = "gzip" if fmt == "CSV (gzip)" else None
+        pd.testing.assert_frame_equal(pd.read_csv(fh, compression=compression), SHOTS)
+
+
+def test_export_file_is_removed():
+    fh = export_to_tempfile(SHOTS)
+    path = fh.name
+    fh.close()
+    assert not os.path.exists(path)
+
+
+def test_failed_export_leaves_no_file(tmp_path, monkeypatch):
+    monkeypatch.setattr("tempfile.tempdir", str(tmp_path))
+    with pytest.raises(ValueError):
+        export_to_tempfile(SHOTS, "XLSX")
+    assert list(tmp_path.iterdir()) == []
@@ -0,0 +1,85 @@
+import inspect
+import io
+import sys
+import types
+from pathlib import Path
+
+import pytest
+
+from soccer_stats import rawcache
+from soccer_stats.rawcache import RawCache
+
+
+class FakeUnderstat:
+    """Stand-in for soccerdata's Understat with the 1.8.7 signatures."""
+
+    def __init__(self, no_cache=False):
+        self.no_cache = no_cache
+        self.fetches = []
+
+    def get(self, url, filepath=None, max_age=None, no_cache=False, var=None):
+        raise AssertionError("CachedUnderstat must override get")
+
+    def _download_and_save(self, url, filepath=None, var=None):
+        self.fetches.append((url, filepath, var))
+        return io.BytesIO(b'{"statData": []}')
+
+
+@pytest.fixture
+def understat(monkeypatch):
+    module = types.ModuleType("soccerdata.understat")
+    module.Understat = FakeUnderstat
+    monkeypatch.setitem(sys.modules, "soccerdata", types.ModuleType("soccerdata"))
+    monkeypatch.setitem(sys.modules, "soccerdata.understat", module)
+    rawcache.cached_understat.cache_clear()
+    yield rawcache.cached_understat()
+    rawcache.cached_understat.cache_clear()
+
+
+def test_round_trip(tmp_path):
+    cache = RawCache(tmp_path, max_bytes=1 << 20, current_season=2024)
+    cache.put("match_1.json", b"payload", 2020)
+    assert cache.get("match_1.json") == b"payload"
+    assert RawCache(tmp_path, current_season=2024).get("match_1.json") == b"payload"
+    assert cache.stats()["entries"] == 1
+
+
+def test_cached_understat_serves_second_read_from_cache(tmp_path, understat):
+    reader = understat()
+    reader.raw_cache = RawCache(tmp_path, max_bytes=1 << 20, current_season=2024)
+    reader.cache_season = 2020
+    page = Path("data/match_1.json")
+
+    first = reader.get("https://understat.com/match/1", page, var="shotsData").read()
+    second = reader.get("https://understat.com/match/1", page, var="shotsData").read()
+
+    assert first == second == b'{"statData": []}'
+    # Fetched once, without soccerdata writing its own file
+    assert reader.fetches == [("https://understat.com/match/1", None, "shotsData")]
+    assert reader.raw_cache.get("match_1.json") == first
+
+
+def test_no_cache_refetches(tmp_path, understat):
+    reader = understat(no_cache=True)
+    reader.raw_cache = RawCache(tmp_path, max_bytes=1 << 20, current_season=2024)
+    for _ in range(2):
+        reader.get("https://understat.com", Path("leagues.json"), var="statData")
+    assert len(reader.fetches) == 2
+
+
+def test_signature_mismatch_is_rejected(monkeypatch, understat):
+    class Changed(FakeUnderstat):
+        def _download_and_save(self, url, filepath=None, var=None, headers=None):
+            pass
+
+    monkeypatch.setattr(sys.modules["soccerdata.understat"], "Understat", Changed)
+    rawcache.cached_understat.cache_clear()
+    with pytest.raises(RuntimeError, match=rawcache.SOCCERDATA_VERSION):
+        rawcache.cached_understat()
+
+
+def test_installed_soccerdata_matches_pin():
+    soccerdata = pytest.importorskip("soccerdata.understat")
+    assert sys.modules["soccerdata"].__version__ == rawcache.SOCCERDATA_VERSION
+    for name, expected in rawcache.OVERRIDDEN.items():
+        assert list(inspect.signature(getattr(soccerdata.Understat, name)).parameters) == expected